@@ -1,9 +1,30 @@
 """
 AI处理层
 负责调用DeepSeek API对抓取的内容进行智能分析和洞察生成
+
+各成员在首次访问时才导入
 """
 
-from .openai_client import DeepSeekClient
-from .orchestrator import AIOrchestrator
+import importlib
+
+# 导出名称 -> 所在子模块
+_EXPORTS = {
+    'DeepSeekClient': '.openai_client',
+    'AIOrchestrator': '.orchestrator'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['DeepSeekClient', 'AIOrchestrator']
+def __dir__():
+    return sorted(list(globals()) + __all__)
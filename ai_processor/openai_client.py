@@ -3,14 +3,19 @@ DeepSeek API客户端
 负责与DeepSeek API交互，生成AI洞察
 """
 
-import requests
 import os
 import json
 import logging
 from typing import Dict, Optional, List
 from dotenv import load_dotenv
 import time
-import random
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.http_transport import http_transport
+from fetcher.keyword_matcher import keyword_engine
 
 # 加载环境变量
 load_dotenv()
@@ -97,7 +102,8 @@ class DeepSeekClient:
                 'temperature': self.temperature
             }
             
-            response = requests.post(
+            # 复用共享连接池，避免每次调用重新建立TLS连接
+            response = http_transport.post(
                 self.base_url,
                 headers=headers,
                 json=data,
@@ -210,18 +216,7 @@ class DeepSeekClient:
     
     def _simple_category_detection(self, content: str, source_type: str) -> str:
         """简单的分类检测"""
-        content_lower = content.lower()
-        
-        if any(word in content_lower for word in ['paper', 'research', 'study', 'method']):
-            return "研究进展"
-        elif any(word in content_lower for word in ['release', 'launch', 'announce', 'product']):
-            return "产品发布"
-        elif any(word in content_lower for word in ['breakthrough', 'innovation', 'advance']):
-            return "技术突破"
-        elif any(word in content_lower for word in ['industry', 'market', 'business']):
-            return "行业动态"
-        else:
-            return "AI技术动态"
+        return keyword_engine.classifier('insight_categories').classify(content)
     
     def _generate_error_result(self, content: str, source_type: str, error_msg: str) -> Dict:
         """生成错误结果"""
@@ -264,10 +259,6 @@ class DeepSeekClient:
                     'original_content': content_info,
                     'insight': insight
                 })
-                
-                # 添加延迟避免API限制
-                if i < len(contents) - 1:
-                    time.sleep(random.uniform(1, 3))
                     
             except Exception as e:
                 logger.error(f"批量处理第 {i+1} 个内容失败: {e}")
@@ -308,7 +299,9 @@ class DeepSeekClient:
             content_type: 内容类型 (rss, twitter, arxiv)
             
         Returns:
-            包含筛选结果的字典
+            包含筛选结果的字典：selected_indices 为选中的索引，
+            scores（模型返回时）为按列表顺序的重要性评分；
+            调用或解析失败时 selected_indices 为空并带有 error 字段，与模型没有选中任何内容区分
         """
         try:
             # 构建筛选专用的提示词
@@ -326,13 +319,15 @@ class DeepSeekClient:
 
 请仅返回一个纯粹的JSON对象，格式如下：
 {{
-    "selected_indices": [0, 2, 5]
+    "selected_indices": [0, 2, 5],
+    "scores": [8, 3, 9]
 }}
 
-其中selected_indices是一个整数数组，包含符合标准的文章在列表中的索引位置（从0开始）。
+其中selected_indices是一个整数数组，包含符合标准的文章在列表中的索引位置（从0开始）；
+scores是与列表等长的整数数组，按列表顺序给出每条文章的重要性评分（0-10，越重要分数越高）。
 
 文章列表：
-{chr(10).join([f"{i}: {content[:100]}..." for i, content in enumerate(content_list)])}
+{chr(10).join([f"{i}: {content}" for i, content in enumerate(content_list)])}
 
 请确保返回的是有效的JSON格式，不要包含任何其他文本。"""
             
@@ -348,13 +343,15 @@ class DeepSeekClient:
 
 请仅返回一个纯粹的JSON对象，格式如下：
 {{
-    "selected_indices": [0, 1, 3]
+    "selected_indices": [0, 1, 3],
+    "scores": [8, 3, 9]
 }}
 
-其中selected_indices是一个整数数组，包含符合标准的论文在列表中的索引位置（从0开始）。
+其中selected_indices是一个整数数组，包含符合标准的论文在列表中的索引位置（从0开始）；
+scores是与列表等长的整数数组，按列表顺序给出每条论文的重要性评分（0-10，越重要分数越高）。
 
 论文列表：
-{chr(10).join([f"{i}: {content[:100]}..." for i, content in enumerate(content_list)])}
+{chr(10).join([f"{i}: {content}" for i, content in enumerate(content_list)])}
 
 请确保返回的是有效的JSON格式，不要包含任何其他文本。"""
             
@@ -370,13 +367,15 @@ class DeepSeekClient:
 
 请仅返回一个纯粹的JSON对象，格式如下：
 {{
-    "selected_indices": [0, 2, 4]
+    "selected_indices": [0, 2, 4],
+    "scores": [8, 3, 9]
 }}
 
-其中selected_indices是一个整数数组，包含符合标准的推文在列表中的索引位置（从0开始）。
+其中selected_indices是一个整数数组，包含符合标准的推文在列表中的索引位置（从0开始）；
+scores是与列表等长的整数数组，按列表顺序给出每条推文的重要性评分（0-10，越重要分数越高）。
 
 推文列表：
-{chr(10).join([f"{i}: {content[:100]}..." for i, content in enumerate(content_list)])}
+{chr(10).join([f"{i}: {content}" for i, content in enumerate(content_list)])}
 
 请确保返回的是有效的JSON格式，不要包含任何其他文本。"""
             
@@ -384,7 +383,7 @@ class DeepSeekClient:
             response = self._call_deepseek_api(prompt)
             
             if not response:
-                return {"selected_indices": []}
+                return {"selected_indices": [], "error": "API调用失败"}
             
             # 尝试解析JSON响应
             try:
@@ -393,15 +392,15 @@ class DeepSeekClient:
                     return result
                 else:
                     logger.warning("AI响应缺少selected_indices字段")
-                    return {"selected_indices": []}
+                    return {"selected_indices": [], "error": "响应缺少selected_indices字段"}
             except json.JSONDecodeError as e:
                 logger.error(f"筛选响应JSON解析失败: {e}")
                 logger.error(f"原始响应: {response}")
-                return {"selected_indices": []}
+                return {"selected_indices": [], "error": f"JSON解析失败: {e}"}
                 
         except Exception as e:
             logger.error(f"内容筛选失败: {e}")
-            return {"selected_indices": []}
+            return {"selected_indices": [], "error": str(e)}
 
 
 if __name__ == "__main__":
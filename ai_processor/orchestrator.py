@@ -3,7 +3,9 @@ AI处理协调器
 负责协调整个AI处理流程，包括内容获取、AI分析和结果存储
 """
 
+import importlib
 import logging
+import threading
 import time
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
@@ -13,40 +15,93 @@ import os
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models import SessionLocal, RawContent, Insight, SourceConfig
-from fetcher import (
-    RSSFetcher, TwitterFetcher, ArxivFetcher,
-    HuggingFaceFetcher, GitHubFetcher, WebScraper
-)
-from fetcher.content_filter import ContentFilter
-from .openai_client import DeepSeekClient
+from models import SessionLocal, RawContent, Insight, SourceConfig, ContentLink, get_engine
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class StoreResult:
+    """一次内容入库的结果"""
+
+    def __init__(self):
+        self.stored_ids = []  # 新建RawContent记录的ID
+        self.skipped = 0      # URL已存在而跳过的条数
+        self.failed = 0       # 入库失败（含事务回滚）的条数
+
+    @property
+    def stored(self) -> int:
+        return len(self.stored_ids)
+
+    @property
+    def complete(self) -> bool:
+        """全部内容都已入库或已存在"""
+        return self.failed == 0
+
+
+# 正文链接表在已有数据库上按需创建（每个进程检查一次）
+_content_link_table_ready = False
+_content_link_table_lock = threading.Lock()
+
+
+def _ensure_content_link_table():
+    """已有数据库没有 content_link 表时创建"""
+    global _content_link_table_ready
+    if _content_link_table_ready:
+        return
+    with _content_link_table_lock:
+        if not _content_link_table_ready:
+            ContentLink.__table__.create(bind=get_engine(), checkfirst=True)
+            _content_link_table_ready = True
+
+
+class _LazyComponent:
+    """
+    协调器组件的延迟构造描述符
+    首次访问时才导入所在模块并创建实例，status、digest等模式不会加载抓取依赖
+    """
+
+    def __init__(self, module_name: str, class_name: str):
+        self.module_name = module_name
+        self.class_name = class_name
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        with self._lock:
+            # 实例缓存在对象字典中，之后的访问不再经过描述符
+            if self.name not in obj.__dict__:
+                component_class = getattr(importlib.import_module(self.module_name), self.class_name)
+                obj.__dict__[self.name] = component_class()
+                logger.debug(f"初始化组件 {self.class_name}")
+            return obj.__dict__[self.name]
+
 
 class AIOrchestrator:
     """AI处理协调器"""
     
+    # 抓取结果的合并顺序
+    FETCH_GROUP_ORDER = ['rss', 'twitter', 'arxiv', 'huggingface', 'github', 'web_scrape', 'twitter_list']
+    
+    # 各个组件在首次使用时才创建
+    rss_fetcher = _LazyComponent('fetcher.rss_fetcher', 'RSSFetcher')
+    twitter_fetcher = _LazyComponent('fetcher.twitter_fetcher', 'TwitterFetcher')
+    arxiv_fetcher = _LazyComponent('fetcher.arxiv_fetcher', 'ArxivFetcher')
+    huggingface_fetcher = _LazyComponent('fetcher.huggingface_fetcher', 'HuggingFaceFetcher')
+    github_fetcher = _LazyComponent('fetcher.github_fetcher', 'GitHubFetcher')
+    web_scraper = _LazyComponent('fetcher.web_scraper', 'WebScraper')
+    ai_client = _LazyComponent('ai_processor.openai_client', 'DeepSeekClient')
+    content_filter = _LazyComponent('fetcher.content_filter', 'ContentFilter')
+    fetch_engine = _LazyComponent('fetcher.concurrent_fetch', 'ConcurrentFetchEngine')
+    
     def __init__(self):
         """初始化协调器"""
-        try:
-            # 初始化各个组件
-            self.rss_fetcher = RSSFetcher()
-            self.twitter_fetcher = TwitterFetcher()
-            self.arxiv_fetcher = ArxivFetcher()
-            self.huggingface_fetcher = HuggingFaceFetcher()
-            self.github_fetcher = GitHubFetcher()
-            self.web_scraper = WebScraper()
-            self.ai_client = DeepSeekClient()
-            self.content_filter = ContentFilter()
-            
-            logger.info("AI处理协调器初始化成功")
-            
-        except Exception as e:
-            logger.error(f"AI处理协调器初始化失败: {e}")
-            raise
+        logger.info("AI处理协调器初始化成功")
     
     def run_full_pipeline(self) -> Dict:
         """
@@ -66,9 +121,16 @@ class AIOrchestrator:
             
             # 2. 数据存储阶段
             logger.info("=== 第二阶段：数据存储 ===")
-            stored_count = self._store_raw_content(raw_contents)
+            store_result = self._store_raw_content(raw_contents)
+            stored_count = store_result.stored
             logger.info(f"数据存储完成，共存储 {stored_count} 条内容")
             
+            # 全部内容入库（或已存在）后再推进条件请求状态与水位线，有内容入库失败时下次重新抓取
+            if store_result.complete:
+                self.save_fetch_state()
+            else:
+                logger.warning(f"{store_result.failed} 条内容入库失败，本次不保存条件请求状态、水位线与列表页指纹")
+            
             # 3. AI处理阶段
             logger.info("=== 第三阶段：AI处理 ===")
             processed_count = self._process_unprocessed_content()
@@ -78,15 +140,30 @@ class AIOrchestrator:
             end_time = time.time()
             processing_time = end_time - start_time
             
+            from fetcher.http_transport import http_transport
+            from fetcher.fetch_state import fetch_state_store
+            from fetcher.watermark_store import watermark_store
+            
+            http_stats = http_transport.get_stats_summary()
+            conditional_stats = fetch_state_store.get_run_summary()
+            
             result = {
                 'total_fetched': len(raw_contents),
                 'total_stored': stored_count,
                 'total_processed': processed_count,
                 'processing_time_seconds': processing_time,
+                'http_stats': http_stats,
+                'conditional_fetch_stats': conditional_stats,
+                'watermark_stats': watermark_store.get_run_summary(),
                 'success': True,
                 'timestamp': datetime.now().isoformat()
             }
             
+            logger.info(
+                f"HTTP请求统计: {http_stats['total_requests']} 次请求，"
+                f"{http_stats['total_failures']} 次失败，"
+                f"接收 {http_stats['total_bytes'] / 1024:.1f} KB"
+            )
             logger.info(f"流水线执行完成，耗时 {processing_time:.2f} 秒")
             return result
             
@@ -98,114 +175,60 @@ class AIOrchestrator:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def run_streaming_pipeline(self) -> Dict:
+        """
+        以流式模式运行AI处理流水线
+        
+        各信源的内容抓取完成后立即进入筛选、存储与洞察生成，
+        无需等待最慢的信源
+        
+        Returns:
+            处理结果统计
+        """
+        try:
+            from .streaming_pipeline import StreamingPipeline
+            return StreamingPipeline(self).run()
+        except Exception as e:
+            logger.error(f"流式流水线执行失败: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+    
     def _fetch_all_content(self) -> List[Dict]:
         """获取所有信源的内容"""
         all_content = []
         
         try:
-            # 获取数据库中的信源配置
-            session = SessionLocal()
-            source_configs = session.query(SourceConfig).filter_by(is_active=True).all()
-            session.close()
-            
-            # 按类型分组信源
-            rss_sources = [s for s in source_configs if s.source_type == 'rss']
-            twitter_sources = [s for s in source_configs if s.source_type == 'twitter']
-            arxiv_sources = [s for s in source_configs if s.source_type == 'arxiv']
-            huggingface_sources = [s for s in source_configs if s.source_type == 'huggingface']
-            github_sources = [s for s in source_configs if s.source_type == 'github']
-            web_scrape_sources = [s for s in source_configs if s.source_type == 'web_scrape']
-            twitter_list_sources = [s for s in source_configs if s.source_type == 'twitter_list']
-            
-            # 1. 抓取RSS内容
-            if rss_sources:
-                logger.info(f"开始抓取 {len(rss_sources)} 个RSS源")
-                rss_configs = [{'source_url': s.source_url, 'source_name': s.source_name} for s in rss_sources]
-                rss_content = self.rss_fetcher.fetch_multiple_feeds(rss_configs)
-                logger.info(f"RSS抓取完成，获取 {len(rss_content)} 条内容")
-                
-                # 内容筛选
-                if rss_content:
-                    logger.info("开始RSS内容筛选...")
-                    filtered_rss = self.content_filter.filter_rss_content(rss_content)
-                    logger.info(f"RSS筛选完成，筛选前: {len(rss_content)}，筛选后: {len(filtered_rss)}")
-                    all_content.extend(filtered_rss)
-                else:
-                    logger.warning("RSS抓取结果为空")
-            
-            # 2. 抓取Twitter内容
-            if twitter_sources and self.twitter_fetcher.is_available():
-                logger.info("开始抓取Twitter内容")
-                twitter_content = self.twitter_fetcher.fetch_ai_influencers_tweets()
-                all_content.extend(twitter_content)
-                logger.info(f"Twitter抓取完成，获取 {len(twitter_content)} 条内容")
-            
-            # 3. 抓取arXiv内容
-            if arxiv_sources:
-                logger.info("开始抓取arXiv内容")
-                arxiv_content = self.arxiv_fetcher.fetch_ai_related_papers(max_results=50)
-                logger.info(f"arXiv抓取完成，获取 {len(arxiv_content)} 条内容")
+            # 延迟导入，不抓取的模式（status、digest）无需加载HTTP传输层
+            from fetcher.fetch_state import fetch_state_store
+            from fetcher.watermark_store import watermark_store
+            from fetcher.listing_fingerprint import listing_fingerprint_store
+            from fetcher.scrape_rules import scrape_rule_registry
+            from fetcher.content_normalizer import content_normalizer
+            
+            fetch_state_store.reset_run_stats()
+            watermark_store.reset_run_stats()
+            listing_fingerprint_store.reset_run_stats()
+            scrape_rule_registry.reset()
+            content_normalizer.reset_run_stats()
+            
+            tasks = self._build_fetch_tasks()
+            grouped_content = self.fetch_engine.run(tasks)
+            
+            self._log_conditional_fetch_stats()
+            
+            # 按固定的信源组顺序合并结果，保证去重结果稳定
+            for group in self.FETCH_GROUP_ORDER:
+                if group not in grouped_content:
+                    continue
                 
-                # 内容筛选
-                if arxiv_content:
-                    logger.info("开始arXiv内容筛选...")
-                    filtered_arxiv = self.content_filter.filter_arxiv_papers(arxiv_content)
-                    logger.info(f"arXiv筛选完成，筛选前: {len(arxiv_content)}，筛选后: {len(filtered_arxiv)}")
-                    all_content.extend(filtered_arxiv)
-                else:
-                    logger.warning("arXiv抓取结果为空")
-            
-            # 4. 抓取Hugging Face内容
-            if huggingface_sources:
-                logger.info("开始抓取Hugging Face内容")
-                hf_content = self.huggingface_fetcher.fetch_ai_related_models(limit=30)
-                all_content.extend(hf_content)
-                logger.info(f"Hugging Face抓取完成，获取 {len(hf_content)} 条内容")
-            
-            # 5. 抓取GitHub Trending内容
-            if github_sources:
-                logger.info("开始抓取GitHub Trending内容")
-                github_content = self.github_fetcher.fetch_ai_ml_trending(limit=20)
-                all_content.extend(github_content)
-                logger.info(f"GitHub Trending抓取完成，获取 {len(github_content)} 条内容")
-            
-            # 6. 抓取Web爬虫内容
-            if web_scrape_sources:
-                logger.info(f"开始抓取 {len(web_scrape_sources)} 个Web爬虫信源")
-                try:
-                    # 将SourceConfig对象转换为字典格式
-                    web_source_configs = []
-                    for source in web_scrape_sources:
-                        web_source_configs.append({
-                            'source_type': source.source_type,
-                            'source_name': source.source_name,
-                            'source_url': source.source_url
-                        })
-                    
-                    web_content = self.web_scraper.scrape_multiple_sources(web_source_configs)
-                    all_content.extend(web_content)
-                    logger.info(f"Web爬虫抓取完成，获取 {len(web_content)} 条内容")
-                except Exception as e:
-                    logger.error(f"Web爬虫抓取失败: {e}")
-                    logger.info("继续处理其他信源内容")
-            
-            # 7. 抓取Twitter List内容（需要配置List ID）
-            if twitter_list_sources:
-                logger.info("开始抓取Twitter List内容")
-                for source in twitter_list_sources:
-                    if source.source_url != "your_twitter_list_id_here":
-                        try:
-                            logger.info(f"抓取Twitter List: {source.source_name}")
-                            list_tweets = self.twitter_fetcher.fetch_list_tweets(
-                                list_id=source.source_url,
-                                count=20
-                            )
-                            all_content.extend(list_tweets)
-                            logger.info(f"成功获取List {source.source_name} 的 {len(list_tweets)} 条推文")
-                        except Exception as e:
-                            logger.error(f"抓取Twitter List失败 {source.source_name}: {e}")
-                    else:
-                        logger.warning(f"Twitter List {source.source_name} 未配置List ID，跳过")
+                group_content = self._normalize_group_content(grouped_content[group])
+                logger.info(f"{group} 抓取完成，获取 {len(group_content)} 条内容")
+                all_content.extend(self._filter_group_content(group, group_content))
+            
+            self._log_normalization_stats()
             
             # 去重处理（基于URL或内容哈希）
             unique_content = self._deduplicate_content(all_content)
@@ -217,6 +240,151 @@ class AIOrchestrator:
             logger.error(f"内容获取失败: {e}")
             return []
     
+    def _build_fetch_tasks(self) -> List['FetchTask']:
+        """根据数据库中的信源配置构建抓取任务"""
+        from fetcher.concurrent_fetch import FetchTask
+        
+        # 获取数据库中的信源配置
+        session = SessionLocal()
+        source_configs = session.query(SourceConfig).filter_by(is_active=True).all()
+        session.close()
+        
+        # 按类型分组信源
+        rss_sources = [s for s in source_configs if s.source_type == 'rss']
+        twitter_sources = [s for s in source_configs if s.source_type == 'twitter']
+        arxiv_sources = [s for s in source_configs if s.source_type == 'arxiv']
+        huggingface_sources = [s for s in source_configs if s.source_type == 'huggingface']
+        github_sources = [s for s in source_configs if s.source_type == 'github']
+        web_scrape_sources = [s for s in source_configs if s.source_type == 'web_scrape']
+        twitter_list_sources = [s for s in source_configs if s.source_type == 'twitter_list']
+        
+        # 构建抓取任务，组内相互独立的信源拆分为单独任务
+        tasks = []
+        
+        # 1. RSS：每个源一个任务
+        if rss_sources:
+            logger.info(f"准备抓取 {len(rss_sources)} 个RSS源")
+            for source in rss_sources:
+                tasks.append(FetchTask(
+                    'rss', f"RSS {source.source_name}",
+                    self.rss_fetcher.fetch_rss_feed, source.source_url, source.source_name
+                ))
+        
+        # 2. Twitter影响者推文
+        if twitter_sources and self.twitter_fetcher.is_available():
+            tasks.append(FetchTask('twitter', 'Twitter影响者', self.twitter_fetcher.fetch_ai_influencers_tweets))
+        
+        # 3. arXiv论文
+        if arxiv_sources:
+            tasks.append(FetchTask('arxiv', 'arXiv', self.arxiv_fetcher.fetch_ai_related_papers))
+        
+        # 4. Hugging Face模型
+        if huggingface_sources:
+            tasks.append(FetchTask('huggingface', 'Hugging Face', self.huggingface_fetcher.fetch_ai_related_models, limit=30))
+        
+        # 5. GitHub Trending
+        if github_sources:
+            tasks.append(FetchTask('github', 'GitHub Trending', self.github_fetcher.fetch_ai_ml_trending, limit=20))
+        
+        # 6. Web爬虫：每个信源一个任务
+        if web_scrape_sources:
+            logger.info(f"准备抓取 {len(web_scrape_sources)} 个Web爬虫信源")
+            for source in web_scrape_sources:
+                # 将SourceConfig对象转换为字典格式
+                web_source_config = {
+                    'source_type': source.source_type,
+                    'source_name': source.source_name,
+                    'source_url': source.source_url
+                }
+                tasks.append(FetchTask(
+                    'web_scrape', f"Web {source.source_name}",
+                    self.web_scraper.scrape_multiple_sources, [web_source_config]
+                ))
+        
+        # 7. Twitter List：每个List一个任务（需要配置List ID）
+        if twitter_list_sources:
+            for source in twitter_list_sources:
+                if source.source_url != "your_twitter_list_id_here":
+                    tasks.append(FetchTask(
+                        'twitter_list', f"Twitter List {source.source_name}",
+                        self.twitter_fetcher.fetch_list_tweets, list_id=source.source_url
+                    ))
+                else:
+                    logger.warning(f"Twitter List {source.source_name} 未配置List ID，跳过")
+        
+        return tasks
+    
+    def _normalize_group_content(self, group_content: List[Dict]) -> List[Dict]:
+        """把抓取结果中的HTML转换为纯文本，正文链接单独保存在links字段（入库时写入content_link表）"""
+        from fetcher.content_normalizer import content_normalizer
+        
+        return content_normalizer.normalize_items(group_content)
+    
+    def _log_normalization_stats(self):
+        """输出内容规范化统计"""
+        from fetcher.content_normalizer import content_normalizer
+        
+        stats = content_normalizer.get_run_summary()
+        if stats['items']:
+            logger.info(
+                f"内容规范化: {stats['items']} 条，正文 {stats['chars_before']} → {stats['chars_after']} 字符"
+            )
+    
+    def _filter_group_content(self, group: str, group_content: List[Dict]) -> List[Dict]:
+        """对需要筛选的信源组（RSS、arXiv）执行内容筛选"""
+        if group == 'rss':
+            if group_content:
+                logger.info("开始RSS内容筛选...")
+                filtered = self.content_filter.filter_rss_content(group_content)
+                logger.info(f"RSS筛选完成，筛选前: {len(group_content)}，筛选后: {len(filtered)}")
+                return filtered
+            logger.warning("RSS抓取结果为空")
+        elif group == 'arxiv':
+            if group_content:
+                logger.info("开始arXiv内容筛选...")
+                filtered = self.content_filter.filter_arxiv_papers(group_content)
+                logger.info(f"arXiv筛选完成，筛选前: {len(group_content)}，筛选后: {len(filtered)}")
+                return filtered
+            logger.warning("arXiv抓取结果为空")
+        
+        return group_content
+    
+    def _log_conditional_fetch_stats(self):
+        """输出条件请求统计"""
+        from fetcher.fetch_state import fetch_state_store
+        from fetcher.watermark_store import watermark_store
+        from fetcher.listing_fingerprint import listing_fingerprint_store
+        
+        conditional_stats = fetch_state_store.get_run_summary()
+        if conditional_stats['skipped_sources']:
+            logger.info(
+                f"条件请求: 跳过 {len(conditional_stats['skipped_sources'])} 个未变化信源"
+                f"（304: {conditional_stats['not_modified']}，哈希命中: {conditional_stats['hash_match']}），"
+                f"节省约 {conditional_stats['bytes_saved'] / 1024:.1f} KB"
+            )
+        
+        watermark_stats = watermark_store.get_run_summary()
+        if watermark_stats['skipped_items']:
+            logger.info(
+                f"水位线: 跳过 {watermark_stats['skipped_items']} 条已见过的内容，"
+                f"涉及 {len(watermark_stats['sources'])} 个信源"
+            )
+        
+        listing_stats = listing_fingerprint_store.get_run_summary()
+        if listing_stats['unchanged_listings'] or listing_stats['known_articles']:
+            logger.info(
+                f"列表页指纹: {listing_stats['unchanged_listings']} 个列表未变化直接跳过，"
+                f"变化的列表中 {listing_stats['known_articles']} 篇已处理、{listing_stats['new_articles']} 篇新文章"
+            )
+    
+    def save_fetch_state(self) -> int:
+        """保存信源条件请求状态（ETag/Last-Modified/内容哈希）、增量抓取水位线与列表页指纹"""
+        from fetcher.fetch_state import fetch_state_store
+        from fetcher.watermark_store import watermark_store
+        from fetcher.listing_fingerprint import listing_fingerprint_store
+        
+        return fetch_state_store.save() + watermark_store.save() + listing_fingerprint_store.save()
+    
     def _deduplicate_content(self, content_list: List[Dict]) -> List[Dict]:
         """对内容进行去重处理"""
         seen_urls = set()
@@ -225,8 +393,8 @@ class AIOrchestrator:
         
         for content in content_list:
             # 使用URL作为主要去重依据
-            url = content.get('url', '')
-            title = content.get('title', '')
+            url = content.url
+            title = content.title
             
             if url and url not in seen_urls:
                 seen_urls.add(url)
@@ -244,10 +412,10 @@ class AIOrchestrator:
     def _is_similar_content(self, content: Dict, existing_content: List[Dict]) -> bool:
         """检查内容是否与现有内容相似"""
         # 简单的相似性检查：标题和内容的前100个字符
-        content_preview = content.get('title', '') + content.get('content', '')[:100]
+        content_preview = (content.title or '') + (content.content or '')[:100]
         
         for existing in existing_content:
-            existing_preview = existing.get('title', '') + existing.get('content', '')[:100]
+            existing_preview = (existing.title or '') + (existing.content or '')[:100]
             
             # 计算简单的相似度（这里使用简单的包含关系）
             if (content_preview in existing_preview or 
@@ -256,10 +424,10 @@ class AIOrchestrator:
         
         return False
     
-    def _store_raw_content(self, content_list: List[Dict]) -> int:
+    def _store_raw_content(self, content_list: List[Dict]) -> 'StoreResult':
         """将原始内容存储到数据库"""
         if not content_list:
-            return 0
+            return StoreResult()
         
         # 添加调试日志
         logger.info(f"准备存储 {len(content_list)} 条内容")
@@ -271,65 +439,110 @@ class AIOrchestrator:
             logger.info(f"示例source_type: {sample_content.get('source_type', 'NO_TYPE')}")
             logger.info(f"示例source_name: {sample_content.get('source_name', 'NO_NAME')}")
         
+        return self._store_content_rows(content_list)
+    
+    def _store_content_rows(self, content_list: List[Dict]) -> StoreResult:
+        """将内容存储到数据库，返回入库结果（新建RawContent记录的ID与失败条数）"""
+        # 延迟导入，与抓取层一起加载
+        from fetcher.content_item import ContentItem
+        
+        content_list = [ContentItem.from_dict(content) for content in content_list]
+        result = StoreResult()
         session = SessionLocal()
-        stored_count = 0
-        skipped_count = 0
+        pending_rows = []
         
         try:
+            _ensure_content_link_table()
+            
+            # 一次性批量查询已存在的URL，避免逐条查询
+            existing_urls = self._find_existing_urls(session, [c.url for c in content_list if c.url])
+            
             for i, content in enumerate(content_list):
                 try:
-                    logger.debug(f"处理第 {i+1} 条内容: {content.get('title', 'NO_TITLE')[:30]}...")
+                    logger.debug(f"处理第 {i+1} 条内容: {(content.title or 'NO_TITLE')[:30]}...")
                     
                     # 检查是否已存在（基于URL）
-                    if content.get('url'):
-                        existing = session.query(RawContent).filter_by(url=content['url']).first()
-                        if existing:
-                            logger.debug(f"内容已存在，跳过: {content['url']}")
-                            skipped_count += 1
+                    if content.url:
+                        if content.url in existing_urls:
+                            logger.debug(f"内容已存在，跳过: {content.url}")
+                            result.skipped += 1
                             continue
+                        existing_urls.add(content.url)
                     else:
-                        logger.warning(f"第 {i+1} 条内容没有URL: {content.get('title', 'NO_TITLE')[:30]}...")
+                        logger.warning(f"第 {i+1} 条内容没有URL: {(content.title or 'NO_TITLE')[:30]}...")
                     
                     # 创建新的RawContent记录
                     raw_content = RawContent(
-                        source_type=content.get('source_type', 'unknown'),
-                        source_name=content.get('source_name', 'Unknown'),
-                        title=content.get('title', ''),
-                        content=content.get('content', ''),
-                        url=content.get('url', ''),
-                        published_at=content.get('published_at'),
+                        source_type=content.source_type or 'unknown',
+                        source_name=content.source_name or 'Unknown',
+                        title=content.title or '',
+                        content=content.content or '',
+                        url=content.url or '',
+                        published_at=content.published_at,
                         is_processed=False
                     )
+                    # 规范化时提取的正文链接存入 content_link 表，与内容同一事务写入
+                    raw_content.links = [
+                        ContentLink(position=position, url=link['url'][:1000], text=(link.get('text') or '')[:500])
+                        for position, link in enumerate(content.links or ())
+                        if link.get('url')
+                    ]
                     
                     session.add(raw_content)
-                    stored_count += 1
-                    
-                    # 每存储10条内容提交一次，避免事务过大
-                    if stored_count % 10 == 0:
-                        session.commit()
-                        logger.info(f"已存储 {stored_count} 条内容")
+                    pending_rows.append(raw_content)
                     
                 except Exception as e:
                     logger.error(f"存储第 {i+1} 条内容失败: {e}")
                     logger.error(f"内容数据: {content}")
+                    result.failed += 1
                     continue
+                
+                # 每存储10条内容提交一次，避免事务过大；提交失败由外层按未入库处理
+                if len(pending_rows) >= 10:
+                    row_ids = self._flush_row_ids(session, pending_rows)
+                    session.commit()
+                    result.stored_ids.extend(row_ids)
+                    pending_rows = []
+                    logger.info(f"已存储 {len(result.stored_ids)} 条内容")
             
             # 最终提交
-            if stored_count > 0:
+            if pending_rows:
+                row_ids = self._flush_row_ids(session, pending_rows)
                 session.commit()
-                logger.info(f"成功存储 {stored_count} 条内容到数据库")
+                result.stored_ids.extend(row_ids)
+            
+            if result.stored_ids:
+                logger.info(f"成功存储 {len(result.stored_ids)} 条内容到数据库")
             else:
                 logger.warning("没有内容被存储")
             
-            logger.info(f"存储统计: 成功 {stored_count} 条，跳过 {skipped_count} 条")
-            
         except Exception as e:
             logger.error(f"批量存储失败: {e}")
             session.rollback()
+            # 未提交的记录已回滚：除已提交、已跳过和已计为失败的条目外都未入库
+            result.failed = len(content_list) - len(result.stored_ids) - result.skipped
         finally:
             session.close()
         
-        return stored_count
+        logger.info(f"存储统计: 成功 {len(result.stored_ids)} 条，跳过 {result.skipped} 条，失败 {result.failed} 条")
+        return result
+    
+    def _find_existing_urls(self, session, urls: List[str], chunk_size: int = 500) -> set:
+        """分块查询数据库中已存在的URL"""
+        existing = set()
+        unique_urls = list(set(urls))
+        
+        for start in range(0, len(unique_urls), chunk_size):
+            chunk = unique_urls[start:start + chunk_size]
+            rows = session.query(RawContent.url).filter(RawContent.url.in_(chunk)).all()
+            existing.update(row.url for row in rows)
+        
+        return existing
+    
+    def _flush_row_ids(self, session, rows: List[RawContent]) -> List[int]:
+        """刷新会话并取回新记录的ID（需在提交前调用，提交后属性会过期）"""
+        session.flush()
+        return [row.id for row in rows]
     
     def _process_unprocessed_content(self) -> int:
         """处理所有未处理的内容"""
@@ -350,27 +563,7 @@ class AIOrchestrator:
                 try:
                     logger.info(f"处理第 {i+1}/{len(unprocessed_contents)} 条内容")
                     
-                    # 调用AI生成洞察
-                    insight_data = self.ai_client.generate_insight(
-                        content.content, 
-                        content.source_type
-                    )
-                    
-                    # 创建Insight记录
-                    insight = Insight(
-                        raw_content_id=content.id,
-                        summary=insight_data.get('summary', ''),
-                        analysis=insight_data.get('analysis', ''),
-                        category=insight_data.get('category', ''),
-                        importance_score=insight_data.get('importance_score', 0.5)
-                    )
-                    
-                    session.add(insight)
-                    
-                    # 标记为已处理
-                    content.is_processed = True
-                    content.processing_error = None
-                    
+                    self._generate_insight_for(session, content)
                     processed_count += 1
                     
                     # 每处理10条内容提交一次，避免事务过大
@@ -395,6 +588,61 @@ class AIOrchestrator:
         
         return processed_count
     
+    def _generate_insight_for(self, session, content: RawContent):
+        """为单条原始内容生成洞察并标记为已处理（不提交事务）"""
+        # 调用AI生成洞察
+        insight_data = self.ai_client.generate_insight(
+            content.content, 
+            content.source_type
+        )
+        
+        # 创建Insight记录
+        insight = Insight(
+            raw_content_id=content.id,
+            summary=insight_data.get('summary', ''),
+            analysis=insight_data.get('analysis', ''),
+            category=insight_data.get('category', ''),
+            importance_score=insight_data.get('importance_score', 0.5)
+        )
+        
+        session.add(insight)
+        
+        # 标记为已处理
+        content.is_processed = True
+        content.processing_error = None
+    
+    def _process_content_ids(self, content_ids: List[int]) -> int:
+        """为指定ID的原始内容生成洞察"""
+        if not content_ids:
+            return 0
+        
+        session = SessionLocal()
+        processed_count = 0
+        
+        try:
+            contents = session.query(RawContent).filter(
+                RawContent.id.in_(content_ids),
+                RawContent.is_processed == False
+            ).all()
+            
+            for content in contents:
+                try:
+                    self._generate_insight_for(session, content)
+                    processed_count += 1
+                except Exception as e:
+                    logger.error(f"处理内容 {content.id} 失败: {e}")
+                    content.processing_error = str(e)
+            
+            session.commit()
+            
+        except Exception as e:
+            logger.error(f"处理内容批次失败: {e}")
+            session.rollback()
+        finally:
+            session.close()
+        
+        return processed_count
+    
     def get_processing_stats(self) -> Dict:
         """获取处理统计信息"""
         session = SessionLocal()
@@ -0,0 +1,308 @@
+"""
+流式处理流水线
+抓取→筛选→去重→存储→洞察生成各阶段通过有界队列衔接，内容到达即处理
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.config_manager import config_manager
+from fetcher.http_transport import http_transport
+from fetcher.fetch_state import fetch_state_store
+from fetcher.watermark_store import watermark_store
+from fetcher.listing_fingerprint import listing_fingerprint_store
+from fetcher.scrape_rules import scrape_rule_registry
+from fetcher.content_item import ContentItem
+from fetcher.content_normalizer import content_normalizer
+
+logger = logging.getLogger(__name__)
+
+# 默认流式配置
+DEFAULT_STREAMING_CONFIG = {
+    'queue_size': 32,        # 各阶段队列容量，满时上游阻塞形成背压
+    'store_batch_size': 10,  # 存储阶段每批写入条数
+    'store_flush_interval': 0.5,  # 存储阶段攒批的最长等待秒数
+    'insight_workers': 2     # 洞察生成并发数
+}
+
+# 队列结束标记
+_END = object()
+
+# 放入队列时等待的秒数，超时后检查流水线是否已取消
+_PUT_TIMEOUT = 0.2
+
+
+class StreamingPipeline:
+    """流式处理流水线"""
+
+    def __init__(self, orchestrator, streaming_config: Optional[Dict] = None):
+        """
+        初始化流式流水线
+
+        Args:
+            orchestrator: AIOrchestrator实例，复用其抓取器、筛选与存储逻辑
+            streaming_config: 流式配置，默认读取 performance.streaming
+        """
+        self.orchestrator = orchestrator
+        self.config = DEFAULT_STREAMING_CONFIG.copy()
+        self.config.update(streaming_config or config_manager.get_performance_config().get('streaming', {}) or {})
+
+        queue_size = self.config['queue_size']
+        self.filter_queue = queue.Queue(maxsize=queue_size)   # (group, items) 每个抓取任务的结果
+        self.store_queue = queue.Queue(maxsize=queue_size)    # 去重后的单条内容
+        self.insight_queue = queue.Queue(maxsize=queue_size)  # 已入库的RawContent ID
+
+        self._lock = threading.Lock()
+        self._errors = []
+        # 任一阶段失败时置位：上游停止产出，各阶段只消费输入直到结束标记
+        self._cancel = threading.Event()
+        self._seen_urls = set()
+        self._seen_titles = set()
+        self._kept_previews = []
+        self.stats = {
+            'total_fetched': 0,
+            'total_filtered': 0,
+            'total_unique': 0,
+            'total_stored': 0,
+            'total_processed': 0,
+            'first_fetch_at': None,
+            'first_insight_at': None
+        }
+
+    def run(self) -> Dict:
+        """
+        运行流式流水线
+
+        Returns:
+            处理结果统计
+        """
+        start_time = time.time()
+        logger.info("开始运行流式AI处理流水线")
+        fetch_state_store.reset_run_stats()
+        watermark_store.reset_run_stats()
+        listing_fingerprint_store.reset_run_stats()
+        scrape_rule_registry.reset()
+        content_normalizer.reset_run_stats()
+
+        stages = [
+            threading.Thread(target=self._guard, args=(self._fetch_stage, None), name='stream-fetch'),
+            threading.Thread(target=self._guard, args=(self._filter_stage, self.filter_queue), name='stream-filter'),
+            threading.Thread(target=self._guard, args=(self._store_stage, self.store_queue), name='stream-store')
+        ]
+        insight_workers = [
+            threading.Thread(target=self._guard, args=(self._insight_stage, self.insight_queue),
+                             name=f'stream-insight-{i}')
+            for i in range(max(1, self.config['insight_workers']))
+        ]
+
+        for thread in stages + insight_workers:
+            thread.start()
+
+        for thread in stages:
+            thread.join()
+
+        # 存储阶段结束后通知所有洞察工作线程退出
+        for _ in insight_workers:
+            self.insight_queue.put(_END)
+        for thread in insight_workers:
+            thread.join()
+
+        # 内容已全部入库才推进条件请求状态与水位线；有阶段失败时不保存，下次运行重新抓取未入库的内容
+        if self._errors:
+            logger.warning("流式流水线有阶段失败，本次不保存条件请求状态、水位线与列表页指纹")
+        else:
+            self.orchestrator.save_fetch_state()
+        self.orchestrator._log_normalization_stats()
+
+        # 处理历史遗留的未处理内容
+        leftover = self.orchestrator._process_unprocessed_content()
+        self.stats['total_processed'] += leftover
+
+        processing_time = time.time() - start_time
+        first_insight_latency = None
+        if self.stats['first_fetch_at'] and self.stats['first_insight_at']:
+            first_insight_latency = self.stats['first_insight_at'] - self.stats['first_fetch_at']
+
+        result = {
+            'total_fetched': self.stats['total_unique'],
+            'total_stored': self.stats['total_stored'],
+            'total_processed': self.stats['total_processed'],
+            'processing_time_seconds': processing_time,
+            'first_insight_latency_seconds': first_insight_latency,
+            'http_stats': http_transport.get_stats_summary(),
+            'conditional_fetch_stats': fetch_state_store.get_run_summary(),
+            'watermark_stats': watermark_store.get_run_summary(),
+            'success': not self._errors,
+            'timestamp': datetime.now().isoformat()
+        }
+        if self._errors:
+            result['error'] = '; '.join(self._errors)
+
+        if first_insight_latency is not None:
+            logger.info(f"首条内容抓取到首条洞察生成耗时 {first_insight_latency:.2f} 秒")
+        logger.info(f"流式流水线执行完成，耗时 {processing_time:.2f} 秒")
+        return result
+
+    def _guard(self, stage, input_queue: Optional[queue.Queue]):
+        """
+        执行阶段函数并记录异常
+
+        阶段失败时取消流水线，并继续取出输入队列中的内容直到结束标记，
+        避免上游阶段阻塞在已满的队列上
+        """
+        try:
+            stage()
+        except Exception as e:
+            logger.error(f"流式流水线阶段 {stage.__name__} 失败: {e}")
+            with self._lock:
+                self._errors.append(f"{stage.__name__}: {e}")
+            self._cancel.set()
+            if input_queue is not None:
+                while input_queue.get() is not _END:
+                    pass
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        """
+        把内容放入下游队列，队列满时等待；流水线取消后放弃
+
+        Returns:
+            是否已放入
+        """
+        while not self._cancel.is_set():
+            try:
+                target.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch_stage(self):
+        """抓取阶段：按任务完成顺序把结果送入筛选队列"""
+        try:
+            tasks = self.orchestrator._build_fetch_tasks()
+            for task, items in self.orchestrator.fetch_engine.iter_results(tasks):
+                if not items:
+                    continue
+
+                with self._lock:
+                    if self.stats['first_fetch_at'] is None:
+                        self.stats['first_fetch_at'] = time.time()
+                    self.stats['total_fetched'] += len(items)
+
+                if not self._put(self.filter_queue, (task.group, items)):
+                    logger.warning("流式流水线已取消，停止抓取")
+                    break
+        finally:
+            # 下游阶段总会消费到结束标记（失败的阶段也会继续取出输入），这里可以阻塞放入
+            self.filter_queue.put(_END)
+
+    def _filter_stage(self):
+        """筛选与去重阶段：逐批筛选，逐条去重后送入存储队列"""
+        try:
+            while True:
+                batch = self.filter_queue.get()
+                if batch is _END:
+                    break
+
+                if self._cancel.is_set():
+                    continue
+
+                group, items = batch
+                items = self.orchestrator._normalize_group_content(items)
+                # 流式模式下按抓取任务分批筛选，保留率作用于每一批
+                filtered = self.orchestrator._filter_group_content(group, items)
+                self.stats['total_filtered'] += len(filtered)
+
+                for content in filtered:
+                    if self._is_duplicate(content):
+                        continue
+                    self.stats['total_unique'] += 1
+                    if not self._put(self.store_queue, content):
+                        break
+        finally:
+            self.store_queue.put(_END)
+
+    def _is_duplicate(self, content: Dict) -> bool:
+        """与批量模式一致的去重规则：URL优先，其次标题，最后内容相似性"""
+        url = content.url
+        title = content.title
+
+        if url and url not in self._seen_urls:
+            self._seen_urls.add(url)
+        elif title and title not in self._seen_titles:
+            self._seen_titles.add(title)
+        elif self.orchestrator._is_similar_content(content, self._kept_previews):
+            return True
+
+        # 只保留相似性比较所需的字段，避免持有完整内容
+        self._kept_previews.append(ContentItem(title=title, content=(content.content or '')[:100]))
+        return False
+
+    def _store_stage(self):
+        """存储阶段：攒批写入数据库，并把新记录ID送入洞察队列"""
+        batch = []
+        last_flush = time.time()
+        finished = False
+
+        while not finished:
+            timeout = max(0.0, self.config['store_flush_interval'] - (time.time() - last_flush))
+            try:
+                content = self.store_queue.get(timeout=timeout)
+                if content is _END:
+                    finished = True
+                else:
+                    batch.append(content)
+            except queue.Empty:
+                pass
+
+            should_flush = (
+                finished
+                or len(batch) >= self.config['store_batch_size']
+                or time.time() - last_flush >= self.config['store_flush_interval']
+            )
+            if self._cancel.is_set():
+                batch = []
+            if batch and should_flush:
+                self._flush_store_batch(batch)
+                batch = []
+            if should_flush:
+                last_flush = time.time()
+
+    def _flush_store_batch(self, batch: List[ContentItem]):
+        """写入一批内容"""
+        result = self.orchestrator._store_content_rows(batch)
+        self.stats['total_stored'] += result.stored
+
+        for content_id in result.stored_ids:
+            if not self._put(self.insight_queue, content_id):
+                break
+
+        # 有内容未入库时存储阶段失败：流水线取消，本次不保存抓取状态
+        if not result.complete:
+            raise RuntimeError(f"{result.failed} 条内容入库失败")
+
+    def _insight_stage(self):
+        """洞察生成阶段：对已入库的内容逐条生成洞察"""
+        while True:
+            content_id = self.insight_queue.get()
+            if content_id is _END:
+                break
+            if self._cancel.is_set():
+                continue
+
+            processed = self.orchestrator._process_content_ids([content_id])
+            if processed:
+                with self._lock:
+                    self.stats['total_processed'] += processed
+                    if self.stats['first_insight_at'] is None:
+                        self.stats['first_insight_at'] = time.time()
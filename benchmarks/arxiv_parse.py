@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+arXiv Atom解析基准
+对比原有的 ElementTree 整树解析（ET.fromstring + 每个条目多次 .// 查找）
+与 lxml iterparse 流式解析的耗时和峰值内存
+
+响应体可以来自 main.py --record 录制的录像文件（取其中的 export.arxiv.org/api/query 响应），
+也可以按条目数合成
+
+用法:
+    python benchmarks/arxiv_parse.py [--entries 2000]
+    python benchmarks/arxiv_parse.py --cassette cassettes/run.jsonl.gz
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.arxiv_fetcher import ArxivFetcher
+
+ENTRY_TEMPLATE = """
+  <entry>
+    <id>http://arxiv.org/abs/2401.{index:05d}v1</id>
+    <updated>2024-01-05T18:00:00Z</updated>
+    <published>2024-01-05T18:00:00Z</published>
+    <title>Scaling Sparse Mixture-of-Experts Language Models, Part {index}</title>
+    <summary>{summary}</summary>
+    <author><name>Alice Example</name></author>
+    <author><name>Bob Example</name></author>
+    <author><name>Carol Example</name></author>
+    <arxiv:comment xmlns:arxiv="http://arxiv.org/schemas/atom">12 pages, 4 figures</arxiv:comment>
+    <link href="http://arxiv.org/abs/2401.{index:05d}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{index:05d}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.AI" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>"""
+
+SUMMARY = ("We study the training dynamics of large language models with sparse mixture-of-experts "
+           "layers and show that routing stability improves downstream performance. ") * 6
+
+
+def build_response(entries: int) -> bytes:
+    """合成一个包含指定条目数的Atom响应"""
+    body = ''.join(ENTRY_TEMPLATE.format(index=i, summary=SUMMARY) for i in range(entries))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        '  <title type="html">ArXiv Query</title>\n'
+        f'  <opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{entries}</opensearch:totalResults>'
+        f'{body}\n</feed>\n'
+    ).encode('utf-8')
+
+
+def load_cassette_responses(path: str) -> list:
+    """从录像文件中取出arXiv API的响应体"""
+    responses = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            interaction = json.loads(line)
+            if 'export.arxiv.org/api/query' in interaction['url'] and interaction['status_code'] == 200:
+                responses.append(base64.b64decode(interaction['body']))
+    return responses
+
+
+def legacy_parse(xml_content: str) -> list:
+    """基线：原有的 ElementTree 整树解析"""
+    root = ET.fromstring(xml_content)
+    namespaces = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
+
+    papers = []
+    for entry in root.findall('.//atom:entry', namespaces):
+        title = entry.find('.//atom:title', namespaces)
+        summary = entry.find('.//atom:summary', namespaces)
+        published = entry.find('.//atom:published', namespaces)
+        published_date = None
+        if published is not None and published.text:
+            published_date = datetime.fromisoformat(published.text.replace('Z', '+00:00'))
+        entry_id = entry.find('atom:id', namespaces)
+        authors = [a.text.strip() for a in entry.findall('.//atom:author/atom:name', namespaces) if a.text]
+        categories = [c.get('term') for c in entry.findall('.//arxiv:primary_category', namespaces) if c.get('term')]
+        papers.append({
+            'title': title.text.strip() if title is not None and title.text else "无标题",
+            'summary': summary.text.strip() if summary is not None and summary.text else "",
+            'published_at': published_date,
+            'arxiv_id': re.sub(r'v\d+$', '', entry_id.text.strip().split('/abs/')[-1]),
+            'authors': authors,
+            'categories': categories
+        })
+    return papers
+
+
+def _peak_memory_worker(parse, responses: list, queue):
+    """在子进程中解析一遍，返回解析过程中进程峰值内存的增长（KB）"""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for response in responses:
+        for _ in parse(response):
+            pass
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline)
+
+
+def measure(name: str, parse, responses: list, repeat: int):
+    """测量解析耗时中位数与峰值内存增长（lxml在C层分配内存，tracemalloc统计不到，这里取子进程的最大RSS）"""
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for response in responses for _ in parse(response))
+        timings.append(time.perf_counter() - start)
+
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    worker = context.Process(target=_peak_memory_worker, args=(parse, responses, queue))
+    worker.start()
+    peak_growth = queue.get()
+    worker.join()
+
+    timings.sort()
+    print(f"{name:<26} {timings[len(timings) // 2] * 1000:8.1f} 毫秒  "
+          f"峰值内存增长 {peak_growth / 1024:6.1f} MB  论文 {count} 篇")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='arXiv Atom解析基准')
+    parser.add_argument('--entries', type=int, default=2000, help='合成响应的条目数')
+    parser.add_argument('--cassette', help='从录像文件读取arXiv响应')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数')
+    args = parser.parse_args()
+
+    if args.cassette:
+        responses = load_cassette_responses(args.cassette)
+        if not responses:
+            print(f"录像中没有arXiv API响应: {args.cassette}")
+            return 1
+    else:
+        responses = [build_response(args.entries)]
+
+    print(f"{len(responses)} 个响应，共 {sum(len(r) for r in responses) / 1024 / 1024:.1f} MB")
+
+    fetcher = ArxivFetcher()
+    measure('ElementTree 整树解析', legacy_parse, responses, args.repeat)
+    measure('lxml iterparse 流式解析', fetcher.iter_arxiv_entries, responses, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+内容条目内存基准
+用 tracemalloc 对比原有抓取器字典（content 与 full_content/summary 重复保存正文，抓取器字段平铺在字典中）
+与 ContentItem（__slots__ 核心字段 + extras，正文经内容规范化后按 max_body_chars 截断）的内存占用：
+短正文下在 1万、10万条时比较每条开销，长正文（超过 max_body_chars）下比较截断效果。
+正文已是纯文本，这里直接调用规范化器的截断（cap_body），不重复测量HTML转换
+
+用法:
+    python benchmarks/content_item_memory.py [--counts 10000 100000] [--body-chars 500] [--long-body-chars 60000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.content_item import ContentItem
+from fetcher.content_normalizer import content_normalizer
+
+BODY_SENTENCE = 'We study large language models and transformer training at scale. '
+
+
+def build_legacy_item(index: int, body: str) -> dict:
+    """原有arXiv抓取器产出的字典：摘要同时保存在 content 与 summary 中"""
+    return {
+        'title': f"Paper {index}: sparse mixture-of-experts at scale",
+        'content': f"标题: Paper {index}\n作者: Alice, Bob\n分类: cs.CL, cs.LG\n摘要: {body}",
+        'summary': body,
+        'url': f"https://arxiv.org/abs/2501.{index:05d}",
+        'published_at': datetime(2025, 1, 1),
+        'source_name': 'arXiv',
+        'source_type': 'arxiv',
+        'arxiv_id': f"2501.{index:05d}",
+        'authors': ['Alice', 'Bob'],
+        'categories': ['cs.CL', 'cs.LG']
+    }
+
+
+def build_content_item(index: int, body: str) -> ContentItem:
+    """ContentItem：正文只保存一份（规范化后截断），arXiv特有字段放入 extras"""
+    return ContentItem(
+        title=f"Paper {index}: sparse mixture-of-experts at scale",
+        content=content_normalizer.cap_body(f"标题: Paper {index}\n作者: Alice, Bob\n分类: cs.CL, cs.LG\n摘要: {body}"),
+        url=f"https://arxiv.org/abs/2501.{index:05d}",
+        published_at=datetime(2025, 1, 1),
+        source_name='arXiv',
+        source_type='arxiv',
+        extras={'arxiv_id': f"2501.{index:05d}", 'authors': ['Alice', 'Bob'], 'categories': ['cs.CL', 'cs.LG']}
+    )
+
+
+def measure(name: str, builder, count: int, body_chars: int) -> int:
+    """测量构建 count 条内容后的内存增量（每条正文都是独立字符串，与抓取结果一致）"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    items = []
+    for i in range(count):
+        body = (f"[{i}] " + BODY_SENTENCE * (body_chars // len(BODY_SENTENCE) + 1))[:body_chars]
+        items.append(builder(i, body))
+
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del items
+    gc.collect()
+
+    print(f"{name:<12} {count:>7} 条  共 {used / 1024 / 1024:9.1f} MB  每条 {used / count:10.0f} 字节")
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description='内容条目内存基准')
+    parser.add_argument('--counts', type=int, nargs='+', default=[10000, 100000], help='内容条数')
+    parser.add_argument('--body-chars', type=int, default=500, help='短正文的字符数')
+    parser.add_argument('--long-body-chars', type=int, default=60000,
+                        help='长正文的字符数（超过 max_body_chars 时体现截断效果，只按最小条数测量）')
+    args = parser.parse_args()
+
+    print(f"max_body_chars = {content_normalizer.max_body_chars}")
+    runs = [(args.body_chars, count) for count in args.counts]
+    runs.append((args.long_body_chars, min(args.counts)))
+
+    for body_chars, count in runs:
+        print(f"\n正文 {body_chars} 字符")
+        legacy = measure('dict', build_legacy_item, count, body_chars)
+        item = measure('ContentItem', build_content_item, count, body_chars)
+        print(f"{'':<12} 节省 {(1 - item / legacy) * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
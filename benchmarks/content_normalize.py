@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+内容规范化基准
+对比基于lxml的 html_to_text 与原有基于BeautifulSoup(html.parser)的 RSSFetcher.clean_content
+在合成文章正文上的耗时与输出长度
+
+用法:
+    python benchmarks/content_normalize.py [--items 500] [--paragraphs 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.content_normalizer import html_to_text
+from fetcher.rss_fetcher import RSSFetcher
+
+ARTICLE_TEMPLATE = (
+    '<div class="post"><nav><a href="/">Home</a> | <a href="/blog">Blog</a></nav>'
+    '<h2>Article {index}: sparse mixture-of-experts at scale</h2>{body}'
+    '<footer>Share on <a href="https://twitter.com/share">Twitter</a> &copy; 2025</footer></div>'
+)
+
+BODY_PARAGRAPH = (
+    '<p>We study <b>large language models</b> and <a href="/paper/{index}">transformer</a> training '
+    'at scale, with <i>reinforcement learning</i>&nbsp;from human feedback.</p>\n'
+    '<script>track({index})</script><style>.ad {{ display: none }}</style>'
+    '<div class="ad"><img src="banner.png"/></div>\n'
+)
+
+
+def build_articles(items: int, paragraphs: int) -> list:
+    """生成合成文章正文"""
+    return [
+        ARTICLE_TEMPLATE.format(index=i, body=BODY_PARAGRAPH.format(index=i) * paragraphs)
+        for i in range(items)
+    ]
+
+
+def measure(name: str, func, articles: list, repeat: int):
+    """测量清洗全部文章的耗时，输出中位数与输出总长度"""
+    timings = []
+    outputs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(article) for article in articles]
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    median = timings[len(timings) // 2]
+    total_chars = sum(len(text) for text in outputs)
+    print(f"{name:<28} {median * 1000:8.1f} 毫秒  "
+          f"每篇 {median / len(articles) * 1e6:7.1f} 微秒  输出 {total_chars} 字符")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='内容规范化基准')
+    parser.add_argument('--items', type=int, default=500, help='文章数量')
+    parser.add_argument('--paragraphs', type=int, default=20, help='每篇文章的段落数')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数')
+    args = parser.parse_args()
+
+    articles = build_articles(args.items, args.paragraphs)
+    print(f"{args.items} 篇文章，原始HTML共 {sum(len(a) for a in articles)} 字符")
+
+    fetcher = RSSFetcher()
+    measure('BeautifulSoup clean_content', fetcher.clean_content, articles, args.repeat)
+    measure('lxml html_to_text', lambda a: html_to_text(a, 'https://example.com/post')[0], articles, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
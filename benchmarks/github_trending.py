@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+GitHub Trending解析与抓取基准
+1. 对比原有的 BeautifulSoup 逐行 find 解析与预编译XPath的 lxml 解析
+2. 用模拟网络延迟的传输层，对比逐个语言串行抓取、并发抓取与当天缓存命中的墙钟耗时
+
+用法:
+    python benchmarks/github_trending.py [--rows 25] [--latency 0.5]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from fetcher.github_fetcher import GitHubFetcher, DEFAULT_GITHUB_CONFIG
+
+ROW_TEMPLATE = """
+<article class="Box-row">
+  <div class="float-right d-flex"><a class="btn-sm btn" href="/login">Star</a></div>
+  <h2 class="h3 lh-condensed">
+    <a data-view-component="true" href="/owner{index}/llm-toolkit-{index}" class="Link">
+      <span class="text-normal">owner{index} /</span> llm-toolkit-{index}
+    </a>
+  </h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">
+    An open-source toolkit for training and serving large language models with LoRA and RAG, part {index}.
+  </p>
+  <div class="f6 color-fg-muted mt-2">
+    <span class="d-inline-block ml-0 mr-3">
+      <span class="repo-language-color" style="background-color: #3572A5"></span>
+      <span itemprop="programmingLanguage">Python</span>
+    </span>
+    <a href="/owner{index}/llm-toolkit-{index}/stargazers" class="Link d-inline-block mr-3">
+      <svg class="octicon octicon-star"></svg> 12,{index:03d}
+    </a>
+    <a href="/owner{index}/llm-toolkit-{index}/forks" class="Link d-inline-block mr-3">
+      <svg class="octicon octicon-repo-forked"></svg> 1,{index:03d}
+    </a>
+    <span class="d-inline-block mr-3">Built by
+      <a href="/contributor{index}" class="d-inline-block"><img class="avatar mb-1" src="avatar.png"/></a>
+    </span>
+    <span class="d-inline-block float-sm-right">
+      <svg class="octicon octicon-star"></svg> {index} stars today
+    </span>
+  </div>
+</article>"""
+
+PAGE_TEMPLATE = (
+    '<!DOCTYPE html><html><head><title>Trending repositories on GitHub today</title>'
+    '<script>{script}</script></head><body><header><nav>{nav}</nav></header>'
+    '<main><div class="Box">{rows}</div></main><footer>{nav}</footer></body></html>'
+)
+
+
+def build_page(rows: int) -> bytes:
+    """合成一个Trending页面（包含页面模板与脚本，接近真实页面体积）"""
+    return PAGE_TEMPLATE.format(
+        script='window.__data = ' + '{"k": "v"},' * 2000,
+        nav=''.join(f'<a href="/topics/t{i}">Topic {i}</a>' for i in range(200)),
+        rows=''.join(ROW_TEMPLATE.format(index=i) for i in range(rows))
+    ).encode('utf-8')
+
+
+def legacy_parse(fetcher: GitHubFetcher, html: bytes) -> list:
+    """基线：原有的 BeautifulSoup(html.parser) 逐行 find 解析"""
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for article in soup.find_all('article', class_='Box-row'):
+        repo_link = article.find('h2', class_='h3').find('a')
+        owner, name = repo_link.get('href', '').strip('/').split('/', 1)
+        description_elem = article.find('p')
+        language_elem = article.find('span', {'itemprop': 'programmingLanguage'})
+        stars_elem = article.find('a', href=re.compile(r'/stargazers'))
+        forks_elem = article.find('a', href=re.compile(r'/forks'))
+        today_stars_elem = article.find('span', class_='d-inline-block float-sm-right')
+        rows.append({
+            'owner': owner,
+            'name': name,
+            'description': description_elem.get_text().strip() if description_elem else "",
+            'language': language_elem.get_text().strip() if language_elem else "未知",
+            'stars': fetcher._parse_number(stars_elem.get_text().strip()) if stars_elem else 0,
+            'forks': fetcher._parse_number(forks_elem.get_text().strip()) if forks_elem else 0,
+            'today_stars': fetcher._parse_number(today_stars_elem.get_text().strip()) if today_stars_elem else 0
+        })
+    return rows
+
+
+def measure_parse(name: str, parse, html: bytes, repeat: int):
+    """测量单页解析耗时中位数"""
+    timings = []
+    rows = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = parse(html)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{name:<28} {timings[len(timings) // 2] * 1000:8.2f} 毫秒/页  仓库 {len(rows)} 个")
+
+
+class DelayedResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+
+class DelayedTransport:
+    """模拟网络延迟的传输层"""
+
+    def __init__(self, page: bytes, latency: float):
+        self.page = page
+        self.latency = latency
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        time.sleep(self.latency)
+        return DelayedResponse(self.page)
+
+
+def measure_fetch(name: str, fetcher: GitHubFetcher):
+    """测量一次完整的Trending抓取"""
+    start = time.perf_counter()
+    repos = fetcher.fetch_ai_ml_trending(limit=1000)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:8.2f} 秒  请求 {fetcher.transport.requests} 次  仓库 {len(repos)} 个")
+    fetcher.transport.requests = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GitHub Trending解析与抓取基准')
+    parser.add_argument('--rows', type=int, default=25, help='每页仓库数')
+    parser.add_argument('--latency', type=float, default=0.5, help='模拟的单次请求延迟（秒）')
+    parser.add_argument('--repeat', type=int, default=20, help='解析重复次数')
+    args = parser.parse_args()
+
+    page = build_page(args.rows)
+    print(f"单页 {len(page) / 1024:.0f} KB，{args.rows} 个仓库")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        fetcher = GitHubFetcher({'cache_directory': cache_dir})
+        measure_parse('BeautifulSoup 逐行 find', lambda html: legacy_parse(fetcher, html), page, args.repeat)
+        measure_parse('lxml 预编译XPath', fetcher._parse_trending_rows, page, args.repeat)
+
+        languages = len(DEFAULT_GITHUB_CONFIG['languages'])
+        print(f"\n抓取 {languages} 种语言，单次请求延迟 {args.latency} 秒")
+        for name, concurrency in (('串行抓取', 1), ('并发抓取', DEFAULT_GITHUB_CONFIG['concurrency'])):
+            with tempfile.TemporaryDirectory() as run_cache_dir:
+                fetcher = GitHubFetcher({'cache_directory': run_cache_dir, 'concurrency': concurrency})
+                fetcher.transport = DelayedTransport(page, args.latency)
+                measure_fetch(name, fetcher)
+                measure_fetch('当天再次运行（缓存命中）', fetcher)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+关键词匹配基准
+对比原有的逐关键词 `keyword in text` 循环与编译后的关键词引擎（Aho-Corasick 自动机）在合成的中英文混合内容上的耗时与命中数。
+引擎默认按子串匹配，命中数与原有循环一致；集合开启 word_boundary 时在同一次扫描中检查英文词边界，
+命中数可能少于子串匹配（如 "gan" 不再命中 "organ"）。
+最后一组用扩充到数百个关键词的集合测量自动机耗时不随关键词数增长的情况
+
+用法:
+    python benchmarks/keyword_match.py [--items 10000] [--large-keywords 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.keyword_matcher import DEFAULT_KEYWORD_SETS, KeywordMatcher, KeywordClassifier
+
+SENTENCES = [
+    "We propose a sparse mixture-of-experts transformer for large language models.",
+    "OpenAI announced the release of a new GPT model with improved reasoning.",
+    "The startup raised $50M to build chatbots for customer service.",
+    "A diffusion-based method for high resolution image synthesis with attention.",
+    "Benchmarking reinforcement learning agents on robotic manipulation tasks.",
+    "The market for AI chips keeps growing as industry demand accelerates.",
+    "研究团队发布了新的大模型，在多项基准测试中取得突破。",
+    "生成式AI正在改变内容产业，多家公司推出相关产品。",
+    "深度学习与神经网络在医疗影像中的应用研究。",
+    "This web framework makes it easy to build REST APIs in Go.",
+    "A fast terminal emulator written in Rust with GPU rendering.",
+    "Said the organ player: nothing about machine learning here.",
+]
+
+
+def build_items(count: int, sentences_per_item: int) -> list:
+    """生成合成内容"""
+    rng = random.Random(42)
+    return [' '.join(rng.choice(SENTENCES) for _ in range(sentences_per_item)) for _ in range(count)]
+
+
+def build_large_keywords(count: int) -> list:
+    """默认关键词集合加上随机生成的英文词，扩充到指定数量"""
+    rng = random.Random(7)
+    keywords = list(dict.fromkeys(
+        keyword for definition in DEFAULT_KEYWORD_SETS.values() for keyword in definition.get('keywords', [])
+    ))
+    while len(keywords) < count:
+        keywords.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10))))
+    return keywords
+
+
+def legacy_contains_any(keywords: list):
+    def run(text):
+        text = text.lower()
+        return any(keyword in text for keyword in keywords)
+    return run
+
+
+def legacy_score(keywords: list, weight: float):
+    def run(text):
+        text = text.lower()
+        return sum(weight for keyword in keywords if keyword in text)
+    return run
+
+
+def legacy_classify(categories: dict, default: str):
+    def run(text):
+        text = text.lower()
+        for category, keywords in categories.items():
+            if any(keyword.lower() in text for keyword in keywords):
+                return category
+        return default
+    return run
+
+
+def legacy_topics(keywords: list):
+    def run(text):
+        return [keyword for keyword in keywords if keyword in text]
+    return run
+
+
+def measure(name: str, func, items: list, repeat: int) -> list:
+    """测量处理全部内容的耗时中位数"""
+    timings = []
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(item) for item in items]
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    hits = sum(1 for result in results if result)
+    print(f"  {name:<12} {timings[len(timings) // 2] * 1000:8.1f} 毫秒  命中 {hits}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='关键词匹配基准')
+    parser.add_argument('--items', type=int, default=10000, help='内容条数')
+    parser.add_argument('--sentences', type=int, default=8, help='每条内容的句子数')
+    parser.add_argument('--large-keywords', type=int, default=300, help='大关键词集合的关键词数')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数')
+    args = parser.parse_args()
+
+    items = build_items(args.items, args.sentences)
+    print(f"{args.items} 条内容，共 {sum(len(i) for i in items) / 1024 / 1024:.1f} MB")
+
+    github = DEFAULT_KEYWORD_SETS['github_ai_repos']['keywords']
+    print(f"\nGitHub仓库过滤（{len(github)} 个关键词，任一命中）")
+    measure('原有循环', legacy_contains_any(github), items, args.repeat)
+    measure('子串匹配', KeywordMatcher(github).search, items, args.repeat)
+    measure('词边界匹配', KeywordMatcher(github, word_boundary=True).search, items, args.repeat)
+
+    arxiv = DEFAULT_KEYWORD_SETS['arxiv_boost']
+    print(f"\narXiv标题加分（{len(arxiv['keywords'])} 个关键词，权重求和）")
+    measure('原有循环', legacy_score(arxiv['keywords'], arxiv['weight']), items, args.repeat)
+    measure('子串匹配', KeywordMatcher(arxiv['keywords'], arxiv['weight']).score, items, args.repeat)
+    measure('词边界匹配', KeywordMatcher(arxiv['keywords'], arxiv['weight'], word_boundary=True).score,
+            items, args.repeat)
+
+    categories = DEFAULT_KEYWORD_SETS['insight_categories']
+    print("\n洞察简单分类（按优先级取第一个命中的类别）")
+    measure('原有循环', legacy_classify(categories['categories'], categories['default']), items, args.repeat)
+    measure('子串匹配', KeywordClassifier(categories['categories'], categories['default']).classify,
+            items, args.repeat)
+    measure('词边界匹配', KeywordClassifier(categories['categories'], categories['default'], True).classify,
+            items, args.repeat)
+
+    topics = DEFAULT_KEYWORD_SETS['digest_topics']['keywords']
+    print(f"\n日报话题统计（{len(topics)} 个中英文关键词，区分大小写，返回全部命中）")
+    measure('原有循环', legacy_topics(topics), items, args.repeat)
+    measure('子串匹配', KeywordMatcher(topics, case_sensitive=True).found, items, args.repeat)
+    measure('词边界匹配', KeywordMatcher(topics, word_boundary=True, case_sensitive=True).found, items, args.repeat)
+
+    large = build_large_keywords(args.large_keywords)
+    start = time.perf_counter()
+    KeywordMatcher(large)
+    print(f"\n大关键词集合（{len(large)} 个关键词，返回全部命中，自动机构建耗时 "
+          f"{(time.perf_counter() - start) * 1000:.2f} 毫秒）")
+    measure('原有循环', legacy_topics([keyword.lower() for keyword in large]), [item.lower() for item in items],
+            args.repeat)
+    measure('子串匹配', KeywordMatcher(large).found, items, args.repeat)
+    measure('词边界匹配', KeywordMatcher(large, word_boundary=True).found, items, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
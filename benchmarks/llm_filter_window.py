@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+LLM预筛选窗口基准
+用固定延迟的模拟客户端（不发起网络请求）对比原有只发送前20条的单次调用
+与窗口化筛选（全部候选切分为窗口并发评分、合并后最多取入选的全局前N条）的耗时与覆盖情况。
+每条文章带有隐含的重要性，模拟客户端按它评分，用于统计选出的条目中真正前N条的比例
+
+用法:
+    python benchmarks/llm_filter_window.py [--items 300] [--latency 2.0] [--retention 0.25]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.content_filter import ContentFilter
+
+_IMPORTANCE_PATTERN = re.compile(r'\(importance (\d+)\)')
+
+
+class SimulatedClient:
+    """模拟DeepSeekClient.filter_content：固定延迟，按标题中的隐含重要性评分"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def filter_content(self, content_list, content_type='rss'):
+        self.calls += 1
+        time.sleep(self.latency)
+        scores = [int(_IMPORTANCE_PATTERN.search(line).group(1)) for line in content_list]
+        return {
+            'selected_indices': [i for i, score in enumerate(scores) if score >= 8],
+            'scores': scores
+        }
+
+
+def build_articles(items: int) -> list:
+    """生成带隐含重要性的合成RSS文章"""
+    rng = random.Random(42)
+    return [
+        {
+            'title': f"Article {i}: model release notes (importance {rng.randint(0, 10)})",
+            'url': f"https://example.com/post/{i}",
+            'content': '',
+            'source_name': 'Example',
+            'source_type': 'rss'
+        }
+        for i in range(items)
+    ]
+
+
+def legacy_filter(client: SimulatedClient, articles: list, target_count: int) -> list:
+    """原有实现：只把前20条发送给模型，选中数量超过目标时整体作废"""
+    lines = [f"[{a['title']}] - [{a['url']}]" for a in articles[:20]]
+    selected = client.filter_content(lines, 'rss')['selected_indices']
+    if len(selected) > target_count:
+        return []
+    return [articles[i] for i in selected][:target_count]
+
+
+def report(name: str, selected: list, articles: list, target_count: int, elapsed: float, calls: int, evaluated: int):
+    importance = lambda article: int(_IMPORTANCE_PATTERN.search(article['title']).group(1))
+    threshold = sorted((importance(a) for a in articles), reverse=True)[target_count - 1]
+    hits = sum(1 for a in selected if importance(a) >= threshold)
+    print(f"{name:<10} 耗时 {elapsed:6.2f} 秒  调用 {calls:>2} 次  评估 {evaluated:>4}/{len(articles)} 条  "
+          f"选出 {len(selected):>3} 条，其中属于全局前{target_count}条的 {hits} 条")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM预筛选窗口基准')
+    parser.add_argument('--items', type=int, default=300, help='候选文章数')
+    parser.add_argument('--latency', type=float, default=2.0, help='模拟的单次调用延迟（秒）')
+    parser.add_argument('--retention', type=float, default=0.25, help='保留率')
+    args = parser.parse_args()
+
+    articles = build_articles(args.items)
+    target_count = max(1, int(len(articles) * args.retention))
+
+    client = SimulatedClient(args.latency)
+    start = time.perf_counter()
+    selected = legacy_filter(client, articles, target_count)
+    report('前20条', selected, articles, target_count, time.perf_counter() - start, client.calls, min(20, len(articles)))
+
+    content_filter = ContentFilter()
+    client = SimulatedClient(args.latency)
+    content_filter._get_ai_client = lambda: client
+    start = time.perf_counter()
+    selected = content_filter._llm_filter_rss(articles, target_count)
+    report('窗口化', selected, articles, target_count, time.perf_counter() - start, client.calls, len(articles))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+RSS解析基准
+生成一批合成RSS源，在抓取线程池中模拟下载延迟后解析，
+对比在抓取线程中直接解析（inline）与交给解析进程池（process）的墙钟耗时
+
+用法:
+    python benchmarks/rss_parse.py [--feeds 60] [--entries 20] [--latency 0.2]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher.feed_parser import FeedParsePool
+
+ENTRY_TEMPLATE = """
+<item>
+  <title>Feed {feed} article {entry}: scaling laws for sparse mixture-of-experts models</title>
+  <link>https://example.com/feed{feed}/article{entry}</link>
+  <pubDate>Mon, 06 Jan 2025 {hour:02d}:00:00 +0000</pubDate>
+  <description><![CDATA[{body}]]></description>
+</item>
+"""
+
+BODY_PARAGRAPH = (
+    '<p>We study <b>large language models</b> and <a href="/paper">transformer</a> training '
+    'at scale, with <i>reinforcement learning</i> from human feedback.</p>'
+    '<script>track()</script><div class="ad"><img src="banner.png"/></div>'
+)
+
+
+def build_feed(feed: int, entries: int, paragraphs: int) -> bytes:
+    """生成一个合成RSS源"""
+    items = ''.join(
+        ENTRY_TEMPLATE.format(feed=feed, entry=entry, hour=entry % 24, body=BODY_PARAGRAPH * paragraphs)
+        for entry in range(entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f'<title>Feed {feed}</title><link>https://example.com/feed{feed}</link>{items}'
+        '</channel></rss>'
+    ).encode('utf-8')
+
+
+def run(pool: FeedParsePool, feeds: list, latency: float, concurrency: int) -> float:
+    """在抓取线程池中模拟下载并解析全部RSS源，返回墙钟耗时（秒）"""
+    def fetch(index):
+        time.sleep(latency)  # 模拟网络I/O
+        return pool.parse(feeds[index], f"https://example.com/feed{index}", 'application/rss+xml')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, range(len(feeds))))
+    elapsed = time.perf_counter() - start
+
+    assert all(len(r['entries']) == len(results[0]['entries']) for r in results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RSS解析基准')
+    parser.add_argument('--feeds', type=int, default=60, help='RSS源数量')
+    parser.add_argument('--entries', type=int, default=20, help='每个源的条目数')
+    parser.add_argument('--paragraphs', type=int, default=20, help='每个条目正文的段落数')
+    parser.add_argument('--latency', type=float, default=0.2, help='模拟的单次下载延迟（秒）')
+    parser.add_argument('--concurrency', type=int, default=8, help='抓取线程数')
+    parser.add_argument('--workers', type=int, default=4, help='解析进程数')
+    args = parser.parse_args()
+
+    feeds = [build_feed(i, args.entries, args.paragraphs) for i in range(args.feeds)]
+    print(f"{args.feeds} 个RSS源，共 {sum(len(f) for f in feeds) / 1024 / 1024:.1f} MB")
+
+    for mode in ('inline', 'process'):
+        pool = FeedParsePool({'mode': mode, 'max_workers': args.workers})
+        if mode == 'process':
+            # 预热：启动子进程并导入feedparser，不计入统计
+            pool.parse(feeds[0])
+        try:
+            elapsed = run(pool, feeds, args.latency, args.concurrency)
+        finally:
+            pool.shutdown()
+        print(f"{mode:<8} 耗时 {elapsed:.2f} 秒，"
+              f"进程解析 {pool.stats['process_parsed']}，线程内解析 {pool.stats['inline_parsed']}")
+
+
+if __name__ == '__main__':
+    main()
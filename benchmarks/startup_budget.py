@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+CLI启动耗时基准
+多次以子进程运行 main.py 的轻量模式，统计墙钟时间中位数，
+并检查这些模式是否加载了抓取相关的重型依赖（tweepy、feedparser、bs4）
+
+用法:
+    python benchmarks/startup_budget.py [--runs 5] [--budget 0.6]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 轻量模式不应加载的模块
+HEAVY_MODULES = ['tweepy', 'feedparser', 'bs4']
+
+# 导入main并执行对应模式后，输出已加载的重型模块
+PROBE = """
+import sys
+sys.argv = ['main.py', '--mode', {mode!r}]
+import main
+main.main()
+print('LOADED=' + ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def run_mode(mode: str, env: dict) -> float:
+    """运行一次 main.py --mode <mode>，返回墙钟耗时（秒）"""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, 'main.py', '--mode', mode],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - start
+
+
+def loaded_heavy_modules(mode: str, env: dict) -> list:
+    """返回执行该模式时加载的重型模块"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(mode=mode, heavy=HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith('LOADED='):
+            return [m for m in line[len('LOADED='):].split(',') if m]
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description='main.py 启动耗时基准')
+    parser.add_argument('--runs', type=int, default=5, help='每个模式运行次数')
+    parser.add_argument('--modes', nargs='+', default=['status', 'digest'], help='要测量的模式')
+    parser.add_argument('--budget', type=float, default=None, help='墙钟时间中位数上限（秒），超出时返回非零')
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(ROOT, 'logs'), exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 使用临时数据库，避免影响本地数据
+        env = dict(os.environ)
+        env['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        env.setdefault('DEEPSEEK_API_KEY', 'benchmark')
+        subprocess.run(
+            [sys.executable, '-c', 'from models import init_db; init_db()'],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, check=True
+        )
+
+        over_budget = False
+        for mode in args.modes:
+            # 第一次运行用于预热字节码缓存，不计入统计
+            run_mode(mode, env)
+            timings = [run_mode(mode, env) for _ in range(args.runs)]
+            median = statistics.median(timings)
+            heavy = loaded_heavy_modules(mode, env)
+
+            status = ''
+            if args.budget is not None:
+                over = median > args.budget
+                over_budget = over_budget or over
+                status = '  超出预算' if over else '  预算内'
+
+            print(f"--mode {mode:<8} 中位数 {median:.3f} 秒（最小 {min(timings):.3f}，最大 {max(timings):.3f}）"
+                  f"  重型依赖: {', '.join(heavy) or '无'}{status}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
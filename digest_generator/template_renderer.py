@@ -14,6 +14,8 @@ from notification.email_sender import EmailSender
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from fetcher.keyword_matcher import keyword_engine
+
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -175,17 +177,9 @@ class DigestTemplateRenderer:
             'other_news': []
         }
         
+        sections = keyword_engine.classifier('digest_sections')
         for insight in insights:
-            category = insight.get('category', '').lower()
-            
-            if any(keyword in category for keyword in ['突破', '创新', '技术', '研究', '论文', '学术']):
-                organized['tech_breakthroughs'].append(insight)
-            elif any(keyword in category for keyword in ['发布', '产品', 'launch']):
-                organized['product_releases'].append(insight)
-            elif any(keyword in category for keyword in ['行业', '市场', '投资']):
-                organized['industry_news'].append(insight)
-            else:
-                organized['other_news'].append(insight)
+            organized[sections.classify(insight.get('category', ''))].append(insight)
         
         return organized
     
@@ -218,16 +212,15 @@ class DigestTemplateRenderer:
         
         # 分析热门话题和趋势
         topics = {}
+        keywords = keyword_engine.matcher('digest_topics')
         for insight in insights:
             summary = insight.get('summary', '')
             analysis = insight.get('analysis', '')
             content = f"{summary} {analysis}"
             
-            # 关键词提取
-            keywords = ['AI', 'GPT', 'LLM', '机器学习', '深度学习', '神经网络', '大模型', '生成式AI']
-            for keyword in keywords:
-                if keyword in content:
-                    topics[keyword] = topics.get(keyword, 0) + 1
+            # 关键词提取（每条洞察中的每个话题只计一次）
+            for keyword in keywords.found(content):
+                topics[keyword] = topics.get(keyword, 0) + 1
         
         trends_text = ""
         
@@ -259,13 +252,12 @@ class DigestTemplateRenderer:
         
         # 分析热门话题
         topics = {}
+        keywords = keyword_engine.matcher('digest_trend_topics')
         for insight in insights:
             summary = insight.get('summary', '')
             # 简单的关键词提取
-            keywords = ['AI', 'GPT', 'LLM', '机器学习', '深度学习', '神经网络']
-            for keyword in keywords:
-                if keyword in summary:
-                    topics[keyword] = topics.get(keyword, 0) + 1
+            for keyword in keywords.found(summary):
+                topics[keyword] = topics.get(keyword, 0) + 1
         
         # 生成趋势分析
         trend_text = "基于今日数据分析，主要趋势包括：\n\n"
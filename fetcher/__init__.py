@@ -1,24 +1,57 @@
 """
 数据获取层
 负责从各种信源抓取AI相关内容和信息
+
+各成员在首次访问时才导入，避免仅使用其中一部分（如状态查看）时
+加载tweepy、feedparser、bs4等重型依赖
 """
 
-from .rss_fetcher import RSSFetcher
-from .twitter_fetcher import TwitterFetcher
-from .arxiv_fetcher import ArxivFetcher
-from .huggingface_fetcher import HuggingFaceFetcher
-from .github_fetcher import GitHubFetcher
-from .web_scraper import WebScraper
-from .config_manager import config_manager
-from .content_filter import content_filter
-
-__all__ = [
-    'RSSFetcher',
-    'TwitterFetcher',
-    'ArxivFetcher',
-    'HuggingFaceFetcher',
-    'GitHubFetcher',
-    'WebScraper',
-    'config_manager',
-    'content_filter'
-]
+import importlib
+import sys
+import types
+
+# 导出名称 -> 所在子模块
+_EXPORTS = {
+    'RSSFetcher': '.rss_fetcher',
+    'TwitterFetcher': '.twitter_fetcher',
+    'ArxivFetcher': '.arxiv_fetcher',
+    'HuggingFaceFetcher': '.huggingface_fetcher',
+    'GitHubFetcher': '.github_fetcher',
+    'WebScraper': '.web_scraper',
+    'config_manager': '.config_manager',
+    'content_filter': '.content_filter',
+    'ConcurrentFetchEngine': '.concurrent_fetch',
+    'FetchTask': '.concurrent_fetch',
+    'http_transport': '.http_transport',
+    'rate_limiter': '.rate_limiter'
+}
+
+__all__ = list(_EXPORTS)
+
+# 与子模块同名的导出实例
+_SHADOWED = {'config_manager', 'content_filter'}
+
+
+class _PackageModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # 导入子模块时导入系统会把子模块绑定到包上，同名的导出名称仍指向模块内的实例
+        if name in _SHADOWED and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _PackageModule
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
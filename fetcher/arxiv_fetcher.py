@@ -3,32 +3,99 @@ arXiv论文抓取器
 负责抓取arXiv上最新的AI/ML相关论文
 """
 
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+import io
 import logging
-import time
-import random
 import re
+import time
+
+import requests
+from lxml import etree
+
+from .cassette import now_timestamp
+from .config_manager import config_manager
+from .content_item import ContentItem
+from .http_transport import http_transport
+from .watermark_store import watermark_store
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 默认arXiv抓取配置
+DEFAULT_ARXIV_CONFIG = {
+    'mode': 'combined',       # combined: 合并类别分页查询；per_category: 每个类别单独查询；oai_pmh: OAI-PMH增量收割
+    'max_results': 200,       # combined/per_category 模式每次运行最多获取的论文数
+    'page_size': 200,         # combined 模式每页论文数（arXiv API单次上限2000）
+    'categories': [
+        "cs.AI",      # Artificial Intelligence
+        "cs.LG",      # Machine Learning
+        "cs.CL",      # Computation and Language
+        "cs.CV",      # Computer Vision
+        "cs.NE",      # Neural and Evolutionary Computing
+        "cs.RO",      # Robotics
+        "stat.ML"     # Machine Learning (Statistics)
+    ],
+    'oai_set': 'cs',
+    'oai_categories': ["cs.AI", "cs.LG", "cs.CL", "cs.CV"],
+    'oai_new_only': True,     # 只保留新提交的论文，忽略已有论文的新版本
+    'oai_lookback_days': 1,   # 首次收割时回溯的天数
+    'oai_max_pages': 20       # 单次收割最多跟随的resumptionToken页数
+}
+
+OAI_NAMESPACES = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'arXiv': 'http://arxiv.org/OAI/arXiv/'
+}
+
+# Atom响应中用到的元素（Clark记法）
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ARXIV_NS = 'http://arxiv.org/schemas/atom'
+ATOM_ENTRY_TAG = f'{{{ATOM_NS}}}entry'
+ATOM_ID_TAG = f'{{{ATOM_NS}}}id'
+ATOM_TITLE_TAG = f'{{{ATOM_NS}}}title'
+ATOM_SUMMARY_TAG = f'{{{ATOM_NS}}}summary'
+ATOM_PUBLISHED_TAG = f'{{{ATOM_NS}}}published'
+ATOM_AUTHOR_TAG = f'{{{ATOM_NS}}}author'
+ATOM_NAME_TAG = f'{{{ATOM_NS}}}name'
+ARXIV_PRIMARY_CATEGORY_TAG = f'{{{ARXIV_NS}}}primary_category'
+OPENSEARCH_TOTAL_RESULTS_TAG = '{http://a9.com/-/spec/opensearch/1.1/}totalResults'
+
+# OAI-PMH流量控制：503响应按Retry-After等待后重试
+OAI_MAX_RETRIES = 3
+OAI_MAX_RETRY_AFTER = 30
+
+
+def _open_response_body(response: requests.Response):
+    """返回响应体的文件对象：流式响应直接读取底层连接，录像回放等已读入内存的响应读取缓存的响应体"""
+    if response.raw is None or response._content_consumed:
+        return io.BytesIO(response.content)
+    response.raw.decode_content = True
+    return response.raw
+
+
 class ArxivFetcher:
     """arXiv论文抓取器"""
     
-    def __init__(self):
-        """初始化arXiv抓取器"""
+    def __init__(self, arxiv_config: Optional[Dict] = None):
+        """
+        初始化arXiv抓取器
+        
+        Args:
+            arxiv_config: 抓取配置，默认读取 performance.arxiv
+        """
         self.base_url = "http://export.arxiv.org/api/query"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.oai_url = "http://export.arxiv.org/oai2"
+        self.transport = http_transport
+        self.watermarks = watermark_store
+        
+        self.config = DEFAULT_ARXIV_CONFIG.copy()
+        self.config.update(arxiv_config or config_manager.get_performance_config().get('arxiv', {}) or {})
     
-    def fetch_recent_papers(self, category: str = "cs.AI", max_results: int = 50) -> List[Dict]:
+    def fetch_recent_papers(self, category: str = "cs.AI", max_results: int = 50) -> List[ContentItem]:
         """
         抓取指定类别的最新论文
         
@@ -42,50 +109,77 @@ class ArxivFetcher:
         try:
             logger.info(f"开始抓取arXiv {category} 类别的最新论文")
             
+            # 有水位线时只查询水位线之后提交的论文（submittedDate精确到分钟，边界由本地再过滤）
+            watermark_key = f"arxiv:{category}"
+            search_query = f'cat:{category}'
+            last_published_at = self.watermarks.get_published_at(watermark_key)
+            if last_published_at:
+                search_query += f" AND submittedDate:[{last_published_at.strftime('%Y%m%d%H%M')} TO 999912312359]"
+            
             # 构建查询参数
             params = {
-                'search_query': f'cat:{category}',
+                'search_query': search_query,
                 'start': 0,
                 'max_results': max_results,
                 'sortBy': 'submittedDate',
                 'sortOrder': 'descending'
             }
             
-            # 发送请求
-            response = self.session.get(self.base_url, params=params)
+            # 发送请求，响应体边下载边解析
+            response = self.transport.get(self.base_url, params=params, stream=True)
             response.raise_for_status()
             
-            # 解析XML响应
-            papers = self._parse_arxiv_xml(response.text)
+            new_papers = []
+            skipped = 0
+            for paper in self._iter_response_papers(response):
+                if self.watermarks.is_new(watermark_key, paper['published_at'], paper['arxiv_id']):
+                    new_papers.append(paper)
+                else:
+                    skipped += 1
+            self.watermarks.record_skipped(watermark_key, skipped)
             
-            logger.info(f"成功抓取 {len(papers)} 篇论文来自 {category}")
-            return papers
+            dated_papers = [paper for paper in new_papers if paper['published_at']]
+            if dated_papers:
+                newest = max(dated_papers, key=lambda paper: paper['published_at'])
+                self.watermarks.advance(watermark_key, newest['published_at'], newest['arxiv_id'])
+            
+            logger.info(f"成功抓取 {len(new_papers)} 篇新论文来自 {category}（水位线跳过 {skipped} 篇）")
+            return new_papers
             
         except Exception as e:
             logger.error(f"抓取arXiv论文失败 {category}: {e}")
             return []
     
-    def fetch_ai_related_papers(self, max_results: int = 100) -> List[Dict]:
+    def fetch_ai_related_papers(self, max_results: Optional[int] = None) -> List[ContentItem]:
         """
-        抓取AI相关的多个类别论文
+        抓取AI相关类别的最新论文，按配置的模式执行
         
         Args:
-            max_results: 每个类别的最大结果数量
+            max_results: 最大结果数量，默认读取配置
             
         Returns:
             所有论文的合并列表
         """
-        # AI相关的主要类别
-        ai_categories = [
-            "cs.AI",      # Artificial Intelligence
-            "cs.LG",      # Machine Learning
-            "cs.CL",      # Computation and Language
-            "cs.CV",      # Computer Vision
-            "cs.NE",      # Neural and Evolutionary Computing
-            "cs.RO",      # Robotics
-            "stat.ML"     # Machine Learning (Statistics)
-        ]
+        max_results = max_results or self.config['max_results']
+        mode = self.config['mode']
         
+        if mode == 'oai_pmh':
+            return self.harvest_oai_records()
+        if mode == 'per_category':
+            return self.fetch_papers_per_category(max_results)
+        return self.fetch_combined_papers(self.config['categories'], max_results)
+    
+    def fetch_papers_per_category(self, max_results: int = 100) -> List[ContentItem]:
+        """
+        逐个类别抓取论文（每个类别一次请求）
+        
+        Args:
+            max_results: 所有类别合计的最大结果数量
+            
+        Returns:
+            所有论文的合并列表
+        """
+        ai_categories = self.config['categories']
         all_papers = []
         
         for category in ai_categories:
@@ -93,9 +187,6 @@ class ArxivFetcher:
                 papers = self.fetch_recent_papers(category, max_results // len(ai_categories))
                 all_papers.extend(papers)
                 
-                # 添加延迟避免请求过快
-                time.sleep(random.uniform(1, 3))
-                
             except Exception as e:
                 logger.error(f"抓取类别 {category} 失败: {e}")
                 continue
@@ -111,92 +202,380 @@ class ArxivFetcher:
         
         return unique_papers_list
     
-    def _parse_arxiv_xml(self, xml_content: str) -> List[Dict]:
-        """解析arXiv XML响应"""
+    def fetch_combined_papers(self, categories: List[str], max_results: int = 200) -> List[ContentItem]:
+        """
+        用一个 cat:A OR cat:B 查询分页抓取多个类别的最新论文
+        
+        跨类别的论文只返回一次，无需在本地去重；有水位线时只查询水位线之后提交的论文
+        
+        Args:
+            categories: arXiv类别列表
+            max_results: 最大结果数量
+            
+        Returns:
+            论文信息列表
+        """
         try:
-            root = ET.fromstring(xml_content)
+            logger.info(f"开始抓取arXiv合并查询: {', '.join(categories)}")
             
-            # 定义命名空间
-            namespaces = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
+            watermark_key = "arxiv:combined"
+            search_query = '(' + ' OR '.join(f'cat:{category}' for category in categories) + ')'
+            last_published_at = self.watermarks.get_published_at(watermark_key)
+            if last_published_at:
+                search_query += f" AND submittedDate:[{last_published_at.strftime('%Y%m%d%H%M')} TO 999912312359]"
+            
+            page_size = max(1, min(self.config['page_size'], max_results))
+            new_papers = []
+            skipped = 0
+            start = 0
+            
+            while start < max_results:
+                params = {
+                    'search_query': search_query,
+                    'start': start,
+                    'max_results': min(page_size, max_results - start),
+                    'sortBy': 'submittedDate',
+                    'sortOrder': 'descending'
+                }
+                
+                response = self.transport.get(self.base_url, params=params, stream=True)
+                response.raise_for_status()
+                
+                feed_info = {}
+                page_count = 0
+                for paper in self._iter_response_papers(response, feed_info):
+                    page_count += 1
+                    if self.watermarks.is_new(watermark_key, paper['published_at'], paper['arxiv_id']):
+                        new_papers.append(paper)
+                    else:
+                        skipped += 1
+                start += params['max_results']
+                
+                total_results = feed_info.get('total_results')
+                logger.info(f"arXiv合并查询第 {start // page_size} 页: {page_count} 篇（共 {total_results} 篇匹配）")
+                
+                if page_count < params['max_results'] or (total_results is not None and start >= total_results):
+                    break
+            
+            self.watermarks.record_skipped(watermark_key, skipped)
+            
+            dated_papers = [paper for paper in new_papers if paper['published_at']]
+            if dated_papers:
+                newest = max(dated_papers, key=lambda paper: paper['published_at'])
+                self.watermarks.advance(watermark_key, newest['published_at'], newest['arxiv_id'])
+            
+            logger.info(f"arXiv合并查询成功抓取 {len(new_papers)} 篇新论文（水位线跳过 {skipped} 篇）")
+            return new_papers
+            
+        except Exception as e:
+            logger.error(f"arXiv合并查询失败: {e}")
+            return []
+    
+    def harvest_oai_records(self, from_date: Optional[datetime] = None) -> List[ContentItem]:
+        """
+        通过OAI-PMH按日增量收割论文元数据
+        
+        从上次收割到的日期的下一天开始逐天收割，每天跟随resumptionToken取完整个列表，
+        只保留配置的类别；达到页数上限时水位线停在最后一个完整收割的日期
+        
+        Args:
+            from_date: 收割起始日期，默认取水位线的下一天（首次按oai_lookback_days回溯）
+            
+        Returns:
+            论文信息列表
+        """
+        oai_set = self.config['oai_set']
+        watermark_key = f"arxiv:oai:{oai_set}"
+        wanted_categories = set(self.config['oai_categories'])
+        
+        try:
+            if from_date is None:
+                last_datestamp = self.watermarks.get_published_at(watermark_key)
+                if last_datestamp:
+                    from_date = last_datestamp + timedelta(days=1)
+                else:
+                    from_date = datetime.utcfromtimestamp(now_timestamp()) - timedelta(days=self.config['oai_lookback_days'])
+            
+            logger.info(f"开始OAI-PMH收割arXiv {oai_set}，起始日期 {from_date.strftime('%Y-%m-%d')}")
             
             papers = []
+            total_records = 0
+            latest_datestamp = None
+            pages_left = self.config['oai_max_pages']
+            today = datetime.utcfromtimestamp(now_timestamp()).date()
+            day = from_date.date()
             
-            # 查找所有entry元素
-            for entry in root.findall('.//atom:entry', namespaces):
-                try:
-                    paper = self._parse_paper_entry(entry, namespaces)
-                    if paper:
-                        papers.append(paper)
-                except Exception as e:
-                    logger.error(f"解析论文条目时出错: {e}")
-                    continue
+            # 按天分段收割（from与until取同一天），一天的resumptionToken链走完才算收割完整；
+            # 达到页数上限时水位线只推进到已完整收割的日期，下次从未完成的那天重新开始，
+            # 不依赖会过期的resumptionToken
+            while day <= today and pages_left > 0:
+                params = {
+                    'verb': 'ListRecords',
+                    'metadataPrefix': 'arXiv',
+                    'set': oai_set,
+                    'from': day.strftime('%Y-%m-%d'),
+                    'until': day.strftime('%Y-%m-%d')
+                }
+                day_complete = False
+                day_latest = None
+                page_number = 0
+                
+                while pages_left > 0:
+                    pages_left -= 1
+                    page_number += 1
+                    response = self._get_oai_page(params)
+                    if response is None:
+                        day_complete = True
+                        break
+                    
+                    records, token, latest = self._parse_oai_records(response.text)
+                    total_records += len(records)
+                    if latest and (day_latest is None or latest > day_latest):
+                        day_latest = latest
+                    
+                    for paper in records:
+                        is_revision = paper.pop('is_revision')
+                        if self.config['oai_new_only'] and is_revision:
+                            continue
+                        if wanted_categories.intersection(paper['categories']):
+                            papers.append(paper)
+                    
+                    logger.info(f"OAI-PMH {day} 第 {page_number} 页: {len(records)} 条记录，累计保留 {len(papers)} 篇")
+                    
+                    if not token:
+                        day_complete = True
+                        break
+                    # 后续页只携带resumptionToken
+                    params = {'verb': 'ListRecords', 'resumptionToken': token}
+                
+                if not day_complete:
+                    logger.warning(f"OAI-PMH收割达到 {self.config['oai_max_pages']} 页上限，"
+                                   f"{day} 未收割完整，下次从该日期重新开始")
+                    break
+                if day_latest:
+                    latest_datestamp = day_latest
+                day += timedelta(days=1)
             
+            # 只推进到完整收割的日期中最新的记录日期（没有记录的当天不推进，避免跳过当天稍后发布的记录）
+            if latest_datestamp:
+                self.watermarks.advance(watermark_key, latest_datestamp)
+            
+            logger.info(f"OAI-PMH收割完成: {total_records} 条记录，保留 {len(papers)} 篇论文")
             return papers
             
         except Exception as e:
-            logger.error(f"解析arXiv XML失败: {e}")
+            logger.error(f"OAI-PMH收割arXiv失败: {e}")
             return []
     
-    def _parse_paper_entry(self, entry, namespaces) -> Optional[Dict]:
-        """解析单个论文条目"""
-        try:
-            # 提取基本信息
-            title = entry.find('.//atom:title', namespaces)
-            title_text = title.text.strip() if title is not None and title.text else "无标题"
-            
-            # 提取摘要
-            summary = entry.find('.//atom:summary', namespaces)
-            summary_text = summary.text.strip() if summary is not None and summary.text else ""
-            
-            # 提取发布时间
-            published = entry.find('.//atom:published', namespaces)
-            published_date = None
-            if published is not None and published.text:
-                try:
-                    published_date = datetime.fromisoformat(published.text.replace('Z', '+00:00'))
-                except:
-                    published_date = datetime.now()
-            
-            # 提取arXiv ID
-            arxiv_id = entry.find('.//arxiv:id', namespaces)
-            arxiv_id_text = arxiv_id.text if arxiv_id is not None else ""
-            
-            # 提取作者信息
-            authors = []
-            for author in entry.findall('.//atom:author/atom:name', namespaces):
-                if author.text:
-                    authors.append(author.text.strip())
-            
-            # 提取分类
-            categories = []
-            for category in entry.findall('.//arxiv:primary_category', namespaces):
-                if category.get('term'):
-                    categories.append(category.get('term'))
-            
-            # 构建论文信息
-            paper = {
-                'title': title_text,
-                'content': f"摘要: {summary_text}\n\n作者: {', '.join(authors)}\n分类: {', '.join(categories)}",
-                'url': f"https://arxiv.org/abs/{arxiv_id_text}",
-                'published_at': published_date,
-                'source_name': f"arXiv {', '.join(categories)}",
-                'source_type': 'arxiv',
-                'arxiv_id': arxiv_id_text,
+    def _get_oai_page(self, params: Dict) -> Optional[requests.Response]:
+        """请求一页OAI-PMH结果，503流量控制时按Retry-After等待重试"""
+        for attempt in range(OAI_MAX_RETRIES + 1):
+            response = self.transport.get(self.oai_url, params=params)
+            if response.status_code == 503 and attempt < OAI_MAX_RETRIES:
+                retry_after = response.headers.get('Retry-After', '')
+                delay = min(int(retry_after), OAI_MAX_RETRY_AFTER) if retry_after.isdigit() else 10
+                logger.info(f"OAI-PMH流量控制，{delay} 秒后重试")
+                time.sleep(delay)
+                continue
+            
+            response.raise_for_status()
+            if '<error code="noRecordsMatch"' in response.text:
+                logger.info("OAI-PMH没有新的记录")
+                return None
+            return response
+        
+        return None
+    
+    def _parse_oai_records(self, xml_content: str) -> Tuple[List[ContentItem], Optional[str], Optional[datetime]]:
+        """
+        解析OAI-PMH ListRecords响应
+        
+        Returns:
+            (论文列表, resumptionToken, 本页最新的记录日期)
+        """
+        root = ET.fromstring(xml_content)
+        
+        papers = []
+        latest_datestamp = None
+        
+        for record in root.iter(f"{{{OAI_NAMESPACES['oai']}}}record"):
+            header = record.find('oai:header', OAI_NAMESPACES)
+            if header is None:
+                continue
+            
+            datestamp_text = header.findtext('oai:datestamp', '', OAI_NAMESPACES)
+            try:
+                datestamp = datetime.strptime(datestamp_text, '%Y-%m-%d')
+                if latest_datestamp is None or datestamp > latest_datestamp:
+                    latest_datestamp = datestamp
+            except ValueError:
+                pass
+            
+            if header.get('status') == 'deleted':
+                continue
+            
+            metadata = record.find('oai:metadata/arXiv:arXiv', OAI_NAMESPACES)
+            if metadata is None:
+                continue
+            
+            try:
+                papers.append(self._parse_oai_metadata(metadata))
+            except Exception as e:
+                logger.error(f"解析OAI-PMH记录时出错: {e}")
+                continue
+        
+        token_element = root.find('.//oai:resumptionToken', OAI_NAMESPACES)
+        token = token_element.text.strip() if token_element is not None and token_element.text else None
+        
+        return papers, token, latest_datestamp
+    
+    def _parse_oai_metadata(self, metadata) -> Dict:
+        """把OAI-PMH的arXiv元数据转换为与Atom接口一致的论文信息"""
+        arxiv_id = metadata.findtext('arXiv:id', '', OAI_NAMESPACES).strip()
+        title = ' '.join(metadata.findtext('arXiv:title', '', OAI_NAMESPACES).split()) or "无标题"
+        summary = ' '.join(metadata.findtext('arXiv:abstract', '', OAI_NAMESPACES).split())
+        categories = metadata.findtext('arXiv:categories', '', OAI_NAMESPACES).split()
+        
+        authors = []
+        for author in metadata.findall('arXiv:authors/arXiv:author', OAI_NAMESPACES):
+            name = ' '.join(filter(None, [
+                author.findtext('arXiv:forenames', '', OAI_NAMESPACES).strip(),
+                author.findtext('arXiv:keyname', '', OAI_NAMESPACES).strip()
+            ]))
+            if name:
+                authors.append(name)
+        
+        published_date = None
+        created = metadata.findtext('arXiv:created', '', OAI_NAMESPACES)
+        if created:
+            try:
+                published_date = datetime.strptime(created, '%Y-%m-%d')
+            except ValueError:
+                pass
+        
+        primary_category = categories[:1]
+        return ContentItem(
+            title=title,
+            content=f"摘要: {summary}\n\n作者: {', '.join(authors)}\n分类: {', '.join(primary_category)}",
+            url=f"https://arxiv.org/abs/{arxiv_id}",
+            published_at=published_date,
+            source_name=f"arXiv {', '.join(primary_category)}",
+            source_type='arxiv',
+            extras={
+                'arxiv_id': arxiv_id,
                 'authors': authors,
                 'categories': categories,
-                'summary': summary_text
+                'is_revision': metadata.find('arXiv:updated', OAI_NAMESPACES) is not None
             }
+        )
+    
+    def _iter_response_papers(self, response: requests.Response, feed_info: Optional[Dict] = None) -> Iterator[ContentItem]:
+        """逐篇产出流式响应中的论文，文档中途损坏或连接中断时保留已产出的论文，结束后关闭响应"""
+        parsed = 0
+        try:
+            for paper in self.iter_arxiv_entries(response, feed_info):
+                parsed += 1
+                yield paper
+        except Exception as e:
+            logger.error(f"解析arXiv XML失败（已解析 {parsed} 篇）: {e}")
+        finally:
+            response.close()
+    
+    def iter_arxiv_entries(self, source, feed_info: Optional[Dict] = None) -> Iterator[ContentItem]:
+        """
+        流式解析arXiv Atom响应，每个entry结束时产出一篇论文
+        
+        传入以 stream=True 发出的响应时直接从连接读取（按Content-Encoding解压），
+        不先把整个响应体读入内存；已处理的entry随即清除，内存占用不随条目数增长
+        
+        Args:
+            source: 响应对象、文件对象或响应体（bytes或str）
+            feed_info: 可选字典，解析时写入 total_results（opensearch:totalResults）
             
-            return paper
+        Yields:
+            论文信息
+        """
+        if isinstance(source, requests.Response):
+            source = _open_response_body(source)
+        elif isinstance(source, str):
+            source = io.BytesIO(source.encode('utf-8'))
+        elif isinstance(source, bytes):
+            source = io.BytesIO(source)
+        
+        context = etree.iterparse(
+            source, events=('end',), tag=(ATOM_ENTRY_TAG, OPENSEARCH_TOTAL_RESULTS_TAG),
+            resolve_entities=False, no_network=True, huge_tree=True
+        )
+        for _, entry in context:
+            if entry.tag == OPENSEARCH_TOTAL_RESULTS_TAG:
+                if feed_info is not None and entry.text and entry.text.strip().isdigit():
+                    feed_info['total_results'] = int(entry.text.strip())
+                continue
             
-        except Exception as e:
-            logger.error(f"解析论文条目时出错: {e}")
-            return None
+            try:
+                paper = self._parse_paper_entry(entry)
+            except Exception as e:
+                logger.error(f"解析论文条目时出错: {e}")
+                paper = None
+            
+            # 清除已处理的entry及之前的兄弟节点
+            entry.clear(keep_tail=True)
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+            
+            if paper:
+                yield paper
     
-    def search_papers(self, query: str, max_results: int = 50) -> List[Dict]:
+    def _parse_paper_entry(self, entry) -> Optional[Dict]:
+        """解析单个论文条目（只遍历一次直接子元素）"""
+        title_text = "无标题"
+        summary_text = ""
+        published_date = None
+        arxiv_id_text = ""
+        authors = []
+        categories = []
+        
+        for child in entry:
+            tag = child.tag
+            if tag == ATOM_TITLE_TAG:
+                if child.text and child.text.strip():
+                    title_text = child.text.strip()
+            elif tag == ATOM_SUMMARY_TAG:
+                summary_text = (child.text or '').strip()
+            elif tag == ATOM_PUBLISHED_TAG:
+                if child.text:
+                    try:
+                        published_date = datetime.fromisoformat(child.text.strip().replace('Z', '+00:00'))
+                    except ValueError:
+                        published_date = datetime.now()
+            elif tag == ATOM_ID_TAG:
+                # Atom的id形如 http://arxiv.org/abs/2401.01234v2，去掉版本号
+                if child.text:
+                    arxiv_id_text = re.sub(r'v\d+$', '', child.text.strip().split('/abs/')[-1])
+            elif tag == ATOM_AUTHOR_TAG:
+                name = child.findtext(ATOM_NAME_TAG)
+                if name and name.strip():
+                    authors.append(name.strip())
+            elif tag == ARXIV_PRIMARY_CATEGORY_TAG:
+                if child.get('term'):
+                    categories.append(child.get('term'))
+        
+        # 构建论文信息
+        return ContentItem(
+            title=title_text,
+            content=f"摘要: {summary_text}\n\n作者: {', '.join(authors)}\n分类: {', '.join(categories)}",
+            url=f"https://arxiv.org/abs/{arxiv_id_text}",
+            published_at=published_date,
+            source_name=f"arXiv {', '.join(categories)}",
+            source_type='arxiv',
+            extras={
+                'arxiv_id': arxiv_id_text,
+                'authors': authors,
+                'categories': categories
+            }
+        )
+    
+    def search_papers(self, query: str, max_results: int = 50) -> List[ContentItem]:
         """
         搜索论文
         
@@ -219,12 +598,11 @@ class ArxivFetcher:
                 'sortOrder': 'descending'
             }
             
-            # 发送请求
-            response = self.session.get(self.base_url, params=params)
+            # 发送请求，响应体边下载边解析
+            response = self.transport.get(self.base_url, params=params, stream=True)
             response.raise_for_status()
             
-            # 解析XML响应
-            papers = self._parse_arxiv_xml(response.text)
+            papers = list(self._iter_response_papers(response))
             
             logger.info(f"搜索 '{query}' 成功找到 {len(papers)} 篇论文")
             return papers
@@ -233,7 +611,7 @@ class ArxivFetcher:
             logger.error(f"搜索论文失败 '{query}': {e}")
             return []
     
-    def fetch_trending_ai_papers(self) -> List[Dict]:
+    def fetch_trending_ai_papers(self) -> List[ContentItem]:
         """
         抓取AI领域热门论文
         
@@ -261,9 +639,6 @@ class ArxivFetcher:
                 papers = self.search_papers(keyword, max_results=10)
                 all_papers.extend(papers)
                 
-                # 添加延迟
-                time.sleep(random.uniform(2, 4))
-                
             except Exception as e:
                 logger.error(f"搜索关键词 '{keyword}' 失败: {e}")
                 continue
@@ -305,7 +680,7 @@ if __name__ == "__main__":
     
     for paper in papers[:3]:
         print(f"标题: {paper['title']}")
-        print(f"摘要长度: {len(paper['summary'])}")
+        print(f"内容长度: {len(paper.content)}")
         print(f"发布时间: {paper['published_at']}")
         print(f"分类: {paper['categories']}")
         print("---")
@@ -0,0 +1,321 @@
+"""
+HTTP录制与回放
+录制模式把每次HTTP交互写入压缩的录像文件，回放模式从录像文件返回响应，
+用于在离线环境下可重复地运行和测量整条流水线
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# 录像中不保留与传输编码相关的响应头（响应体已解码）
+STRIPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """回放时录像中没有匹配的请求"""
+
+
+# 取值来自水位线或当前日期的查询参数，匹配时忽略其取值：
+# 在之后的日期、或水位线已推进的数据库上回放同一录像仍能命中
+VOLATILE_QUERY_PARAMS = {'from', 'until', 'since_id', 'start_time', 'end_time'}
+
+# arXiv查询中由水位线生成的提交日期范围
+_SUBMITTED_DATE_PATTERN = re.compile(r'submittedDate:\[[^\]]*\]')
+
+
+def normalize_url(url: str) -> str:
+    """把URL中取值随日期或水位线变化的查询参数替换为占位符"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+
+    query = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if name in VOLATILE_QUERY_PARAMS:
+            value = '*'
+        elif name == 'search_query':
+            value = _SUBMITTED_DATE_PATTERN.sub('submittedDate:[*]', value)
+        query.append((name, value))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _make_key(method: str, url: str, body_hash: str) -> str:
+    return f"{method} {normalize_url(url)} {body_hash}"
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """
+    根据请求方法、URL和请求体生成匹配键
+
+    不含请求头（条件请求头每次可能不同），URL中随日期或水位线变化的参数见 VOLATILE_QUERY_PARAMS
+    """
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    body_hash = hashlib.sha256(body).hexdigest() if body else ''
+    return _make_key(request.method, request.url, body_hash)
+
+
+class Cassette:
+    """HTTP交互录像（gzip压缩的JSON Lines文件）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._interactions = defaultdict(list)
+        self._replay_positions = defaultdict(int)
+        self.stats = {'recorded': 0, 'replayed': 0, 'misses': 0}
+
+    def load(self) -> int:
+        """加载录像文件，返回交互数量"""
+        count = 0
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                # 按当前的规则重新生成匹配键，兼容规则调整前录制的录像
+                body_hash = interaction['key'].rsplit(' ', 1)[-1] if interaction['key'].count(' ') >= 2 else ''
+                interaction['key'] = _make_key(interaction['method'], interaction['url'], body_hash)
+                self._interactions[interaction['key']].append(interaction)
+                count += 1
+
+        logger.info(f"加载HTTP录像 {self.path}: {count} 次交互")
+        return count
+
+    @property
+    def recorded_started_at(self) -> Optional[float]:
+        """录制开始的时间戳（第一次交互的录制时间），录像为空时返回None"""
+        with self._lock:
+            timestamps = [i['recorded_at'] for items in self._interactions.values() for i in items if i.get('recorded_at')]
+        return min(timestamps) if timestamps else None
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        """录制一次交互"""
+        interaction = {
+            'key': request_key(request),
+            'method': request.method,
+            'url': request.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in STRIPPED_HEADERS},
+            'body': base64.b64encode(response.content or b'').decode('ascii'),
+            'elapsed': elapsed,
+            'recorded_at': time.time()
+        }
+
+        with self._lock:
+            self._interactions[interaction['key']].append(interaction)
+            self.stats['recorded'] += 1
+
+    def match(self, request: requests.PreparedRequest) -> Optional[Dict[str, Any]]:
+        """
+        查找与请求匹配的交互
+
+        同一请求被录制多次时按录制顺序依次返回，用完后重复返回最后一次
+        """
+        key = request_key(request)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                self.stats['misses'] += 1
+                return None
+
+            position = self._replay_positions[key]
+            self._replay_positions[key] = position + 1
+            self.stats['replayed'] += 1
+            return interactions[min(position, len(interactions) - 1)]
+
+    def save(self) -> int:
+        """写入录像文件，返回交互数量"""
+        with self._lock:
+            interactions = [i for items in self._interactions.values() for i in items]
+
+        interactions.sort(key=lambda i: i['recorded_at'])
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            for interaction in interactions:
+                f.write(json.dumps(interaction, ensure_ascii=False) + '\n')
+
+        logger.info(f"保存HTTP录像 {self.path}: {len(interactions)} 次交互")
+        return len(interactions)
+
+
+class RecordingAdapter(BaseAdapter):
+    """录制适配器：包装原有适配器，在返回响应前录制交互"""
+
+    def __init__(self, inner: BaseAdapter, cassette: Cassette):
+        super().__init__()
+        self.inner = inner
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        # requests在适配器返回后才设置response.elapsed，这里自行计时
+        start = time.monotonic()
+        response = self.inner.send(request, **kwargs)
+        elapsed = time.monotonic() - start
+        try:
+            self.cassette.record(request, response, elapsed)
+        except Exception as e:
+            logger.warning(f"录制HTTP交互失败 {request.url}: {e}")
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """回放适配器：从录像返回响应，不访问网络"""
+
+    def __init__(self, cassette: Cassette, latency_factor: float = 0.0):
+        """
+        Args:
+            cassette: 已加载的录像
+            latency_factor: 按录制时的耗时乘以该系数模拟网络延迟，0表示不模拟
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.latency_factor = latency_factor
+
+    def send(self, request, **kwargs):
+        interaction = self.cassette.match(request)
+        if interaction is None:
+            raise CassetteMissError(f"录像中没有匹配的请求: {request.method} {request.url}", request=request)
+
+        elapsed = interaction.get('elapsed', 0.0)
+        if self.latency_factor > 0 and elapsed > 0:
+            time.sleep(elapsed * self.latency_factor)
+
+        response = requests.Response()
+        response.status_code = interaction['status_code']
+        response.reason = interaction.get('reason') or ''
+        response.url = interaction['url']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=elapsed)
+        response._content = base64.b64decode(interaction['body'])
+        response._content_consumed = True
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class CassetteSession:
+    """录制/回放会话，负责把适配器安装到各个requests会话上"""
+
+    def __init__(self, mode: str, path: str, latency_factor: float = 0.0):
+        """
+        Args:
+            mode: record 或 replay
+            path: 录像文件路径
+            latency_factor: 回放时的延迟模拟系数
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"未知的录制模式: {mode}")
+
+        self.mode = mode
+        self.cassette = Cassette(path)
+        self.latency_factor = latency_factor
+        self._sessions = []
+        self.clock_offset = 0.0
+
+        if mode == 'replay':
+            self.cassette.load()
+            # 回放时把时钟拨回录制开始时，按当前日期计算的回溯时限与录制时一致
+            recorded_started_at = self.cassette.recorded_started_at
+            if recorded_started_at is not None:
+                self.clock_offset = recorded_started_at - time.time()
+
+    def attach(self, session: requests.Session):
+        """在会话上安装录制或回放适配器（替换所有已挂载的前缀，包括按主机单独设置的连接池）"""
+        if any(s is session for s in self._sessions):
+            return
+
+        for prefix, adapter in list(session.adapters.items()):
+            if self.mode == 'record':
+                session.mount(prefix, RecordingAdapter(adapter, self.cassette))
+            else:
+                session.mount(prefix, ReplayAdapter(self.cassette, self.latency_factor))
+
+        self._sessions.append(session)
+
+    def save(self) -> int:
+        """录制模式下写入录像文件"""
+        if self.mode != 'record':
+            return 0
+        return self.cassette.save()
+
+
+# 当前生效的录制/回放会话
+_active_session = None
+
+
+def activate(mode: str, path: str, latency_factor: float = 0.0) -> CassetteSession:
+    """
+    开启录制或回放
+
+    共享HTTP传输层立即安装适配器；录制与回放期间关闭HTTP缓存，
+    回放期间关闭限流（不访问任何远程主机），now_timestamp() 返回录制时的时间
+
+    Args:
+        mode: record 或 replay
+        path: 录像文件路径
+        latency_factor: 回放时的延迟模拟系数
+
+    Returns:
+        录制/回放会话
+    """
+    global _active_session
+
+    from .http_transport import http_transport
+
+    _active_session = CassetteSession(mode, path, latency_factor)
+    _active_session.attach(http_transport.session)
+    http_transport.cache.enabled = False
+    if mode == 'replay':
+        http_transport.rate_limiter.enabled = False
+
+    logger.info(f"HTTP{'录制' if mode == 'record' else '回放'}模式已开启: {path}")
+    return _active_session
+
+
+def get_active_session() -> Optional[CassetteSession]:
+    """获取当前生效的录制/回放会话"""
+    return _active_session
+
+
+def now_timestamp() -> float:
+    """
+    当前时间戳，回放期间为录制开始时间加上回放已进行的时间
+
+    按当前日期计算查询起点或回溯时限的抓取器使用它，使回放结果不随回放日期变化
+    """
+    offset = _active_session.clock_offset if _active_session is not None else 0.0
+    return time.time() + offset
+
+
+def attach_session(session: requests.Session):
+    """若录制或回放已开启，在额外的requests会话上安装适配器（如tweepy客户端的会话）"""
+    if _active_session is not None and session is not None:
+        _active_session.attach(session)
@@ -0,0 +1,229 @@
+"""
+信源熔断器
+按抓取任务统计连续失败次数，持续失败的信源在冷却期内直接跳过，状态持久化到数据库
+"""
+
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .config_manager import config_manager
+
+logger = logging.getLogger(__name__)
+
+# 熔断器状态
+STATE_CLOSED = 'closed'        # 正常抓取
+STATE_OPEN = 'open'            # 冷却中，直接跳过
+STATE_HALF_OPEN = 'half_open'  # 冷却结束，允许一次试探抓取
+
+# 默认熔断配置
+DEFAULT_CIRCUIT_BREAKER_CONFIG = {
+    'enabled': True,
+    'failure_threshold': 3,     # 连续失败多少次后打开熔断
+    'cooldown_seconds': 21600   # 熔断打开后的冷却时间
+}
+
+
+class CircuitBreaker:
+    """信源熔断器"""
+
+    def __init__(self, breaker_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化熔断器
+
+        Args:
+            breaker_config: 熔断配置，默认读取 performance.circuit_breaker
+        """
+        self.config = DEFAULT_CIRCUIT_BREAKER_CONFIG.copy()
+        self.config.update(breaker_config or config_manager.get_performance_config().get('circuit_breaker', {}) or {})
+
+        self.enabled = self.config['enabled']
+        self.failure_threshold = max(1, int(self.config['failure_threshold']))
+        self.cooldown = timedelta(seconds=self.config['cooldown_seconds'])
+
+        self._health = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """首次使用时从数据库加载全部信源健康状态"""
+        if self._health is not None:
+            return
+
+        # 延迟导入，避免仅导入fetcher包时就连接数据库
+        from models import SessionLocal, SourceHealth, get_engine
+
+        health = {}
+        try:
+            SourceHealth.__table__.create(bind=get_engine(), checkfirst=True)
+
+            session = SessionLocal()
+            try:
+                for row in session.query(SourceHealth).all():
+                    health[row.source_key] = {
+                        'state': row.state or STATE_CLOSED,
+                        'consecutive_failures': row.consecutive_failures or 0,
+                        'last_error': row.last_error,
+                        'last_failure_at': row.last_failure_at,
+                        'last_success_at': row.last_success_at,
+                        'opened_at': row.opened_at
+                    }
+            finally:
+                session.close()
+
+        except Exception as e:
+            logger.error(f"加载信源健康状态失败: {e}")
+
+        self._health = health
+
+    def _get(self, source_key: str) -> Dict[str, Any]:
+        """获取信源健康状态（调用方需持有锁）"""
+        return self._health.setdefault(source_key, {
+            'state': STATE_CLOSED,
+            'consecutive_failures': 0,
+            'last_error': None,
+            'last_failure_at': None,
+            'last_success_at': None,
+            'opened_at': None
+        })
+
+    def allow(self, source_key: str) -> bool:
+        """
+        判断信源本次是否允许抓取
+
+        熔断打开且仍在冷却期内时返回False；冷却期结束后转为半开，允许一次试探
+
+        Args:
+            source_key: 抓取任务名称
+
+        Returns:
+            是否允许抓取
+        """
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            self._ensure_loaded()
+            health = self._health.get(source_key)
+            if not health or health['state'] != STATE_OPEN:
+                return True
+
+            if health['opened_at'] and datetime.now() - health['opened_at'] < self.cooldown:
+                return False
+
+            health['state'] = STATE_HALF_OPEN
+            self._dirty.add(source_key)
+            logger.info(f"信源熔断冷却结束，试探抓取: {source_key}")
+            return True
+
+    def record_success(self, source_key: str):
+        """记录一次成功抓取，关闭熔断"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._ensure_loaded()
+            health = self._get(source_key)
+            if health['state'] != STATE_CLOSED:
+                logger.info(f"信源恢复正常，关闭熔断: {source_key}")
+
+            health['state'] = STATE_CLOSED
+            health['consecutive_failures'] = 0
+            health['opened_at'] = None
+            health['last_success_at'] = datetime.now()
+            self._dirty.add(source_key)
+
+    def record_failure(self, source_key: str, error: Optional[str] = None):
+        """记录一次失败抓取，连续失败达到阈值或半开试探失败时打开熔断"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._ensure_loaded()
+            health = self._get(source_key)
+            now = datetime.now()
+
+            health['consecutive_failures'] += 1
+            health['last_error'] = (error or '')[:1000]
+            health['last_failure_at'] = now
+
+            if health['state'] == STATE_HALF_OPEN or health['consecutive_failures'] >= self.failure_threshold:
+                health['state'] = STATE_OPEN
+                health['opened_at'] = now
+                logger.warning(
+                    f"信源连续失败 {health['consecutive_failures']} 次，打开熔断 "
+                    f"{self.cooldown.total_seconds() / 3600:.1f} 小时: {source_key}"
+                )
+
+            self._dirty.add(source_key)
+
+    def get_open_circuits(self) -> List[Dict[str, Any]]:
+        """获取熔断打开或半开的信源列表"""
+        with self._lock:
+            self._ensure_loaded()
+            circuits = []
+            for source_key, health in self._health.items():
+                if health['state'] == STATE_CLOSED:
+                    continue
+                circuit = dict(health)
+                circuit['source_key'] = source_key
+                circuit['retry_at'] = health['opened_at'] + self.cooldown if health['opened_at'] else None
+                circuits.append(circuit)
+
+        return sorted(circuits, key=lambda c: c['source_key'])
+
+    def save(self) -> int:
+        """
+        将本次运行中变化的信源健康状态写入数据库
+
+        Returns:
+            写入的状态数量
+        """
+        with self._lock:
+            if not self._dirty or self._health is None:
+                return 0
+            dirty = {key: dict(self._health[key]) for key in self._dirty}
+            self._dirty = set()
+
+        from models import SessionLocal, SourceHealth
+
+        session = SessionLocal()
+        try:
+            existing = {
+                row.source_key: row
+                for row in session.query(SourceHealth).filter(
+                    SourceHealth.source_key.in_(list(dirty.keys()))
+                ).all()
+            }
+
+            for source_key, health in dirty.items():
+                row = existing.get(source_key)
+                if row is None:
+                    row = SourceHealth(source_key=source_key)
+                    session.add(row)
+                row.state = health['state']
+                row.consecutive_failures = health['consecutive_failures']
+                row.last_error = health['last_error']
+                row.last_failure_at = health['last_failure_at']
+                row.last_success_at = health['last_success_at']
+                row.opened_at = health['opened_at']
+
+            session.commit()
+            return len(dirty)
+
+        except Exception as e:
+            logger.error(f"保存信源健康状态失败: {e}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
+
+# 全局信源熔断器实例
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,213 @@
+"""
+并发抓取引擎
+负责在有界线程池中并发执行各信源的抓取任务，并按完成顺序合并结果
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config_manager import config_manager
+from .circuit_breaker import circuit_breaker
+from .task_scope import task_scope
+
+logger = logging.getLogger(__name__)
+
+# 默认全局并发数、抓取阶段时限与单任务时限（秒）
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_FETCH_STAGE_TIMEOUT = 600
+DEFAULT_FETCH_TASK_TIMEOUT = 180
+
+# 等待任务完成时检查单任务超时的最长间隔（秒）
+TIMEOUT_CHECK_INTERVAL = 1.0
+
+
+class FetchTask:
+    """单个抓取任务"""
+
+    def __init__(self, group: str, name: str, func: Callable[..., List[Dict]], *args, **kwargs):
+        """
+        Args:
+            group: 任务所属信源组 (rss, twitter, arxiv等)，结果按组合并
+            name: 任务名称，用于日志
+            func: 实际执行抓取的函数，返回内容字典列表
+        """
+        self.group = group
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self) -> List[Dict]:
+        """执行抓取任务"""
+        return self.func(*self.args, **self.kwargs) or []
+
+
+class ConcurrentFetchEngine:
+    """并发抓取引擎"""
+
+    def __init__(self, max_workers: Optional[int] = None, stage_timeout: Optional[float] = None):
+        """
+        初始化并发抓取引擎
+
+        Args:
+            max_workers: 全局并发数，默认读取 performance.fetch_concurrency
+            stage_timeout: 抓取阶段总时限（秒），默认读取 performance.fetch_stage_timeout
+        """
+        performance_config = config_manager.get_performance_config()
+        self.max_workers = max_workers or performance_config.get('fetch_concurrency', DEFAULT_FETCH_CONCURRENCY)
+        self.stage_timeout = stage_timeout or performance_config.get('fetch_stage_timeout', DEFAULT_FETCH_STAGE_TIMEOUT)
+        self.task_timeouts = performance_config.get('fetch_task_timeouts', {}) or {}
+        self.circuit_breaker = circuit_breaker
+        self.last_run_stats = {}
+
+    def get_task_timeout(self, task: FetchTask) -> float:
+        """获取任务时限，按信源组配置，未配置时使用default"""
+        return self.task_timeouts.get(task.group, self.task_timeouts.get('default', DEFAULT_FETCH_TASK_TIMEOUT))
+
+    def run(self, tasks: List[FetchTask]) -> Dict[str, List[Dict]]:
+        """
+        并发执行抓取任务
+
+        Args:
+            tasks: 抓取任务列表
+
+        Returns:
+            按信源组合并的结果 {group: [content, ...]}
+        """
+        results = {task.group: [] for task in tasks}
+
+        for task, items in self.iter_results(tasks):
+            results[task.group].extend(items)
+
+        return results
+
+    def iter_results(self, tasks: List[FetchTask]) -> Iterator[Tuple[FetchTask, List[Dict]]]:
+        """
+        并发执行抓取任务，按完成顺序逐个产出结果
+
+        熔断中的信源直接跳过；超过单任务时限的任务被放弃并计为失败，
+        其对水位线等增量状态的修改不会生效
+
+        Python线程无法被强制终止：被放弃的任务在当前请求返回前仍占用线程池的一个位置，
+        进程退出时解释器也会等待它结束。为此每个任务带有时限（单任务时限与阶段时限中较早者），
+        经共享传输层发出的请求按任务剩余时间设置超时、到时限后不再发出，被放弃的线程很快即可退出。
+        不经过共享传输层的调用（如tweepy内部的重试等待）不受此限制
+
+        Args:
+            tasks: 抓取任务列表
+
+        Yields:
+            (任务, 内容列表)，失败、超时或被熔断的任务不会产出
+        """
+        task_durations = {}
+        task_started = {}
+        failed_tasks = []
+        timed_out_tasks = []
+        skipped_tasks = [task.name for task in tasks if not self.circuit_breaker.allow(task.name)]
+
+        if skipped_tasks:
+            logger.warning(f"以下信源熔断中，本次跳过: {', '.join(skipped_tasks)}")
+            tasks = [task for task in tasks if task.name not in skipped_tasks]
+
+        if not tasks:
+            self.circuit_breaker.save()
+            return
+
+        start_time = time.time()
+        workers = max(1, min(self.max_workers, len(tasks)))
+        logger.info(f"并发抓取开始: {len(tasks)} 个任务，并发数 {workers}，阶段时限 {self.stage_timeout} 秒")
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch')
+        stage_deadline = start_time + self.stage_timeout
+        future_to_task = {
+            executor.submit(self._run_task, task, task_durations, task_started, stage_deadline): task
+            for task in tasks
+        }
+        pending = set(future_to_task)
+
+        try:
+            while pending:
+                now = time.time()
+                if now >= stage_deadline:
+                    timed_out_tasks.extend(future_to_task[future].name for future in pending)
+                    logger.warning(f"抓取阶段超时 ({self.stage_timeout} 秒)，放弃未完成任务: {', '.join(timed_out_tasks)}")
+                    break
+
+                done, pending = wait(
+                    pending,
+                    timeout=min(stage_deadline - now, TIMEOUT_CHECK_INTERVAL),
+                    return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    task = future_to_task[future]
+                    try:
+                        items, scope = future.result()
+                    except Exception as e:
+                        logger.error(f"抓取任务失败 {task.name}: {e}")
+                        failed_tasks.append(task.name)
+                        self.circuit_breaker.record_failure(task.name, str(e))
+                        continue
+
+                    # 抓取器内部会吞掉异常返回空列表，以任务内的请求全部失败作为失败判据
+                    if scope.all_requests_failed:
+                        logger.error(f"抓取任务的 {scope.requests} 次请求全部失败 {task.name}: {scope.last_error}")
+                        failed_tasks.append(task.name)
+                        self.circuit_breaker.record_failure(task.name, scope.last_error)
+                        continue
+
+                    scope.commit()
+                    self.circuit_breaker.record_success(task.name)
+
+                    logger.info(
+                        f"抓取任务完成 {task.name}: {len(items)} 条内容，"
+                        f"耗时 {task_durations.get(task.name, 0):.2f} 秒"
+                    )
+                    yield task, items
+
+                # 放弃超过单任务时限的任务
+                now = time.time()
+                for future in list(pending):
+                    task = future_to_task[future]
+                    started = task_started.get(task.name)
+                    task_timeout = self.get_task_timeout(task)
+                    if started is not None and now - started > task_timeout:
+                        pending.discard(future)
+                        timed_out_tasks.append(task.name)
+                        logger.warning(f"抓取任务超时 ({task_timeout} 秒)，放弃: {task.name}")
+                        self.circuit_breaker.record_failure(task.name, f"任务超时 ({task_timeout} 秒)")
+
+        finally:
+            # 不等待超时任务，已排队但未开始的任务直接取消；超时任务的请求受任务时限约束，会很快结束
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.circuit_breaker.save()
+
+            elapsed = time.time() - start_time
+            self.last_run_stats = {
+                'total_tasks': len(tasks),
+                'failed_tasks': failed_tasks,
+                'timed_out_tasks': timed_out_tasks,
+                'skipped_tasks': skipped_tasks,
+                'task_durations': dict(task_durations),
+                'elapsed_seconds': elapsed,
+                'serial_seconds': sum(task_durations.values())
+            }
+
+            logger.info(
+                f"并发抓取结束，耗时 {elapsed:.2f} 秒"
+                f"（各任务累计 {self.last_run_stats['serial_seconds']:.2f} 秒）"
+            )
+
+    def _run_task(self, task: FetchTask, task_durations: Dict[str, float], task_started: Dict[str, float],
+                  stage_deadline: float):
+        """在任务作用域中执行单个任务并记录耗时，返回 (内容列表, 任务作用域)"""
+        task_start = time.time()
+        task_started[task.name] = task_start
+        deadline = min(task_start + self.get_task_timeout(task), stage_deadline)
+        try:
+            with task_scope(task.name, deadline) as scope:
+                return task.run(), scope
+        finally:
+            task_durations[task.name] = time.time() - task_start
@@ -119,6 +119,7 @@ class FilterConfigManager:
             # 应用其他配置
             self.active_config['merged']['fallback_rules'] = self.system_config.get('fallback_rules', {})
             self.active_config['merged']['performance'] = self.system_config.get('performance', {})
+            self.active_config['merged']['keyword_sets'] = self.system_config.get('keyword_sets', {})
             
             logger.info("配置合并完成")
             
@@ -147,6 +148,10 @@ class FilterConfigManager:
         """获取性能配置"""
         return self.active_config.get('merged', {}).get('performance', {})
     
+    def get_keyword_sets(self) -> Dict[str, Any]:
+        """获取关键词集合配置"""
+        return self.active_config.get('merged', {}).get('keyword_sets', {})
+    
     def reload_config(self):
         """重新加载配置"""
         logger.info("重新加载配置...")
@@ -5,13 +5,24 @@
 
 import json
 import logging
+import math
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from .config_manager import config_manager
+from .keyword_matcher import keyword_engine
 import os
 
 logger = logging.getLogger(__name__)
 
+# 默认LLM筛选配置：全部候选切分为提示词大小的窗口并发评分，合并后最多保留前N条入选内容
+DEFAULT_LLM_FILTER_CONFIG = {
+    'chunk_size': 50,       # 每次调用最多包含的条目数
+    'max_workers': 8,       # 同时进行的筛选调用数，实际速率仍受 api.deepseek.com 限流约束
+    'max_line_chars': 300,  # 每条目在提示词中的最大字符数
+    'min_score': 7          # 模型未选中的条目评分达到该值时也视为入选（评分0-10）
+}
+
 
 class ContentFilter:
     """内容筛选器"""
@@ -20,6 +31,9 @@ class ContentFilter:
         self.config = config_manager
         self.performance_config = self.config.get_performance_config()
         
+        self.llm_filter_config = DEFAULT_LLM_FILTER_CONFIG.copy()
+        self.llm_filter_config.update(self.performance_config.get('llm_filter', {}) or {})
+        
         logger.info("内容筛选器初始化成功")
     
     def _get_ai_client(self):
@@ -46,7 +60,7 @@ class ContentFilter:
             # 尝试LLM筛选
             filtered_articles = self._llm_filter_rss(articles, target_count)
             
-            if filtered_articles:
+            if filtered_articles is not None:
                 logger.info(f"LLM筛选成功，筛选后数量: {len(filtered_articles)}")
                 return filtered_articles
             else:
@@ -71,7 +85,7 @@ class ContentFilter:
             # 尝试LLM筛选
             filtered_papers = self._llm_filter_arxiv(papers, target_count)
             
-            if filtered_papers:
+            if filtered_papers is not None:
                 logger.info(f"LLM筛选成功，筛选后数量: {len(filtered_papers)}")
                 return filtered_papers
             else:
@@ -96,7 +110,7 @@ class ContentFilter:
             # 尝试LLM筛选
             filtered_tweets = self._llm_filter_twitter(tweets, target_count)
             
-            if filtered_tweets:
+            if filtered_tweets is not None:
                 logger.info(f"LLM筛选成功，筛选后数量: {len(filtered_tweets)}")
                 return filtered_tweets
             else:
@@ -107,113 +121,142 @@ class ContentFilter:
             logger.error(f"Twitter内容筛选失败: {e}，使用规则基础筛选")
             return self._rule_based_filter_twitter(tweets, target_count)
     
-    def _llm_filter_rss(self, articles: List[Dict], target_count: int) -> List[Dict]:
+    def _llm_filter_rss(self, articles: List[Dict], target_count: int) -> Optional[List[Dict]]:
         """使用LLM筛选RSS内容"""
-        try:
-            ai_client = self._get_ai_client()
-            if not ai_client:
-                return []
-                
-            # 准备输入数据
-            input_data = []
-            for article in articles[:20]:  # 限制数量
-                input_data.append(f"[{article.get('title', '')}] - [{article.get('url', '')}]")
-            
-            # 使用专门的筛选方法
-            response = ai_client.filter_content(input_data, "rss")
-            
-            if response and 'selected_indices' in response:
-                selected_indices = response['selected_indices']
-                if isinstance(selected_indices, list) and len(selected_indices) <= target_count:
-                    selected_articles = [articles[i] for i in selected_indices if i < len(articles)]
-                    return selected_articles[:target_count]
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"LLM筛选RSS失败: {e}")
-            return []
+        return self._llm_filter_windowed(
+            articles, target_count, "rss",
+            lambda article: f"[{article.get('title', '')}] - [{article.get('url', '')}]"
+        )
     
-    def _llm_filter_arxiv(self, papers: List[Dict], target_count: int) -> List[Dict]:
+    def _llm_filter_arxiv(self, papers: List[Dict], target_count: int) -> Optional[List[Dict]]:
         """使用LLM筛选arXiv论文"""
-        try:
-            ai_client = self._get_ai_client()
-            if not ai_client:
-                return []
-                
-            # 准备输入数据
-            input_data = []
-            for paper in papers[:20]:  # 限制数量
-                input_data.append(f"[{paper.get('title', '')}] - [{paper.get('content', '')[:200]}] - [{paper.get('url', '')}]")
-            
-            # 使用专门的筛选方法
-            response = ai_client.filter_content(input_data, "arxiv")
-            
-            if response and 'selected_indices' in response:
-                selected_indices = response['selected_indices']
-                if isinstance(selected_indices, list) and len(selected_indices) <= target_count:
-                    selected_papers = [papers[i] for i in selected_indices if i < len(papers)]
-                    return selected_papers[:target_count]
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"LLM筛选arXiv失败: {e}")
-            return []
+        return self._llm_filter_windowed(
+            papers, target_count, "arxiv",
+            lambda paper: f"[{paper.get('title', '')}] - [{paper.get('content', '')[:200]}] - [{paper.get('url', '')}]"
+        )
     
-    def _llm_filter_twitter(self, tweets: List[Dict], target_count: int) -> List[Dict]:
+    def _llm_filter_twitter(self, tweets: List[Dict], target_count: int) -> Optional[List[Dict]]:
         """使用LLM筛选Twitter内容"""
+        return self._llm_filter_windowed(
+            tweets, target_count, "twitter",
+            lambda tweet: f"[@{tweet.get('source_name', 'Unknown')}]: [{tweet.get('content', '')}] - [{tweet.get('url', '')}]"
+        )
+    
+    def _llm_filter_windowed(self, items: List[Dict], target_count: int, content_type: str,
+                             format_line: Callable[[Dict], str]) -> Optional[List[Dict]]:
+        """
+        窗口化LLM筛选：全部候选按提示词大小切分为窗口，并发评分后合并排名
+        
+        只返回入选的条目（模型选中，或评分达到 min_score），最多 target_count 条；
+        调用失败的窗口中的条目不参与排名
+        
+        Args:
+            items: 全部候选内容
+            target_count: 按保留率计算的目标数量
+            content_type: 内容类型 (rss, twitter, arxiv)
+            format_line: 把一条内容格式化为提示词中的一行
+            
+        Returns:
+            按重要性排序的筛选结果（模型认为都不重要时为空列表）；
+            全部窗口调用失败时返回None（由调用方改用规则筛选）
+        """
         try:
             ai_client = self._get_ai_client()
             if not ai_client:
-                return []
-                
-            # 准备输入数据
-            input_data = []
-            for tweet in tweets[:20]:  # 限制数量
-                input_data.append(f"[@{tweet.get('source_name', 'Unknown')}]: [{tweet.get('content', '')[:100]}] - [{tweet.get('url', '')}]")
-            
-            # 使用专门的筛选方法
-            response = ai_client.filter_content(input_data, "twitter")
-            
-            if response and 'selected_indices' in response:
-                selected_indices = response['selected_indices']
-                if isinstance(selected_indices, list) and len(selected_indices) <= target_count:
-                    selected_tweets = [tweets[i] for i in selected_indices if i < len(tweets)]
-                    return selected_tweets[:target_count]
-            
-            return []
+                return None
+            
+            max_line_chars = int(self.llm_filter_config['max_line_chars'])
+            lines = [format_line(item)[:max_line_chars] for item in items]
+            
+            # 窗口大小均分，避免最后一个窗口只剩几条
+            chunk_size = max(1, int(self.llm_filter_config['chunk_size']))
+            chunk_count = math.ceil(len(lines) / chunk_size)
+            chunk_size = math.ceil(len(lines) / chunk_count)
+            chunks = [(start, lines[start:start + chunk_size]) for start in range(0, len(lines), chunk_size)]
+            
+            def score_chunk(chunk: Tuple[int, List[str]]) -> Optional[List[Tuple[float, bool]]]:
+                start, chunk_lines = chunk
+                try:
+                    return self._parse_chunk_scores(ai_client.filter_content(chunk_lines, content_type), len(chunk_lines))
+                except Exception as e:
+                    logger.error(f"LLM筛选窗口 {start}-{start + len(chunk_lines) - 1} 失败: {e}")
+                    return None
+            
+            started = time.time()
+            workers = max(1, min(int(self.llm_filter_config['max_workers']), len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='llm-filter') as executor:
+                chunk_scores = list(executor.map(score_chunk, chunks))
+            
+            failed = sum(1 for scores in chunk_scores if scores is None)
+            logger.info(f"LLM筛选 {content_type}: {len(items)} 条分为 {len(chunks)} 个窗口，"
+                        f"失败 {failed} 个，耗时 {time.time() - started:.1f} 秒")
+            if failed == len(chunks):
+                return None
+            
+            # 合并入选条目的全局排名：评分优先，同分时模型选中的在前，再按原有顺序
+            min_score = float(self.llm_filter_config['min_score'])
+            ranked = []
+            for (start, chunk_lines), scores in zip(chunks, chunk_scores):
+                if scores is None:
+                    continue
+                for offset, (score, selected) in enumerate(scores):
+                    if selected or score >= min_score:
+                        ranked.append((-score, not selected, start + offset))
+            ranked.sort()
+            
+            return [items[index] for _, _, index in ranked[:target_count]]
             
         except Exception as e:
-            logger.error(f"LLM筛选Twitter失败: {e}")
-            return []
+            logger.error(f"LLM筛选{content_type}失败: {e}")
+            return None
+    
+    def _parse_chunk_scores(self, response: Optional[Dict], size: int) -> Optional[List[Tuple[float, bool]]]:
+        """
+        解析一个窗口的筛选结果
+        
+        Returns:
+            按窗口内顺序的 [(评分, 是否选中), ...]；调用失败（响应带 error）或响应无效时返回None。
+            模型没有返回等长的 scores 时，选中的条目记1分，其余记0分（没有选中任何条目是有效结果）
+        """
+        if not response or response.get('error') or not isinstance(response.get('selected_indices'), list):
+            return None
+        
+        selected = {index for index in response['selected_indices'] if isinstance(index, int) and 0 <= index < size}
+        
+        scores = response.get('scores')
+        if not isinstance(scores, list) or len(scores) != size:
+            return [(1.0 if index in selected else 0.0, index in selected) for index in range(size)]
+        
+        parsed = []
+        for index, score in enumerate(scores):
+            try:
+                score = float(score)
+            except (TypeError, ValueError):
+                score = 0.0
+            parsed.append((score, index in selected))
+        return parsed
     
     def _rule_based_filter_rss(self, articles: List[Dict], target_count: int) -> List[Dict]:
         """规则基础筛选RSS内容"""
-        fallback_rules = self.config.get_fallback_rules()
-        keyword_boost = fallback_rules.get('keyword_boost', [])
-        source_priority = fallback_rules.get('source_priority', {})
+        keyword_boost = keyword_engine.rss_boost_matcher()
+        source_priority = keyword_engine.source_priority_classifier()
         
         # 计算重要性分数
         scored_articles = []
         for article in articles:
             score = 0.0
-            title = article.get('title', '').lower()
-            source = article.get('source_name', '').lower()
+            title = article.get('title', '')
+            source = article.get('source_name', '')
             
             # 关键词加分
-            for keyword in keyword_boost:
-                if keyword.lower() in title:
-                    score += 0.3
+            score += keyword_boost.score(title)
             
             # 信源优先级加分
-            for priority, sources in source_priority.items():
-                if any(src.lower() in source for src in sources):
-                    if priority == 'high':
-                        score += 0.4
-                    elif priority == 'medium':
-                        score += 0.2
-                    break
+            priority = source_priority.classify(source)
+            if priority == 'high':
+                score += 0.4
+            elif priority == 'medium':
+                score += 0.2
             
             # 标题长度加分（避免过短标题）
             if len(title) > 20:
@@ -231,17 +274,15 @@ class ContentFilter:
     def _rule_based_filter_arxiv(self, papers: List[Dict], target_count: int) -> List[Dict]:
         """规则基础筛选arXiv论文"""
         # 简单的规则筛选：优先选择标题包含关键词的论文
-        keywords = ['gpt', 'llm', 'transformer', 'attention', 'diffusion', 'gan', 'bert']
+        keywords = keyword_engine.matcher('arxiv_boost')
         
         scored_papers = []
         for paper in papers:
             score = 0.0
-            title = paper.get('title', '').lower()
+            title = paper.get('title', '')
             
             # 关键词加分
-            for keyword in keywords:
-                if keyword in title:
-                    score += 0.5
+            score += keywords.score(title)
             
             # 摘要长度加分
             content = paper.get('content', '')
@@ -0,0 +1,112 @@
+"""
+内容条目
+各抓取器产出、规范化/筛选/去重/存储各阶段共用的内容记录。
+入库字段保存在 __slots__ 中，抓取器特有的字段（arxiv_id、authors、stars等）放在按需创建的 extras 里；
+同时提供与字典相同的按键读写接口，按键访问的旧代码与测试无需修改
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+_MISSING = object()
+
+
+class ContentItem:
+    """内容条目"""
+
+    __slots__ = ('title', 'content', 'url', 'published_at', 'source_name', 'source_type', 'links', 'extras')
+
+    # 核心字段（extras 之外的槽位），按键访问时直接读写对应属性
+    CORE_FIELDS = frozenset(__slots__[:-1])
+
+    def __init__(self, title: str = '', content: str = '', url: str = '', published_at: Optional[datetime] = None,
+                 source_name: str = '', source_type: str = '', links: Optional[List[Dict[str, str]]] = None,
+                 extras: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            title: 标题
+            content: 正文（内容规范化后按 max_body_chars 截断）
+            url: 原文链接
+            published_at: 发布时间
+            source_name: 信源名称
+            source_type: 信源类型（rss、arxiv、twitter等）
+            links: 正文中的链接，由内容规范化写入
+            extras: 抓取器特有的字段，不入库
+        """
+        self.title = title
+        self.content = content
+        self.url = url
+        self.published_at = published_at
+        self.source_name = source_name
+        self.source_type = source_type
+        self.links = links
+        self.extras = extras or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ContentItem':
+        """由内容字典构建，核心字段之外的键放入 extras"""
+        if isinstance(data, cls):
+            return data
+        core = {key: value for key, value in data.items() if key in cls.CORE_FIELDS}
+        extras = {key: value for key, value in data.items() if key not in cls.CORE_FIELDS}
+        return cls(extras=extras, **core)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典"""
+        return dict(self.items())
+
+    # 字典兼容接口：核心字段始终存在，extras 中的字段按需存在
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.CORE_FIELDS:
+            return getattr(self, key)
+        if self.extras is not None:
+            return self.extras.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self.CORE_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        if key in self.CORE_FIELDS:
+            setattr(self, key, None)
+        else:
+            del self.extras[key]
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self) -> List[str]:
+        keys = list(self.__slots__[:-1])
+        if self.extras:
+            keys.extend(self.extras)
+        return keys
+
+    def items(self) -> Iterator:
+        return ((key, self[key]) for key in self.keys())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __repr__(self) -> str:
+        return f"ContentItem(source_type={self.source_type!r}, title={(self.title or '')[:40]!r}, url={self.url!r})"
@@ -0,0 +1,180 @@
+"""
+内容规范化
+在筛选和入库前把各信源抓取到的HTML转换为纯文本：去除标签、脚本和页面模板元素，
+合并空白字符，正文中的链接单独保留，纯文本按 max_body_chars 截断，减少内存、数据库体积和发送给LLM的Token数
+"""
+
+import html
+import logging
+import re
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+from .config_manager import config_manager
+from .content_item import ContentItem
+
+logger = logging.getLogger(__name__)
+
+# 默认规范化配置
+DEFAULT_CONTENT_NORMALIZATION_CONFIG = {
+    'enabled': True,
+    'max_links': 50,          # 每条内容最多保留的链接数
+    'max_body_chars': 20000   # 规范化后保留的正文上限（字符），洞察分析只使用正文前4000字符
+}
+
+# 连同内容一起删除的元素：脚本、样式与导航、页脚等页面模板
+REMOVED_TAGS = (
+    'script', 'style', 'noscript', 'template', 'iframe', 'object', 'embed', 'svg', 'canvas',
+    'form', 'button', 'select', 'nav', 'header', 'footer', 'aside'
+)
+
+# 块级元素，结束后换行，避免相邻段落的文字粘连
+BLOCK_TAGS = (
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'dl', 'dt', 'dd', 'tr', 'table', 'blockquote', 'pre',
+    'section', 'article', 'main', 'figure', 'figcaption', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr'
+)
+
+# 不作为正文链接保留的链接
+IGNORED_LINK_PREFIXES = ('#', 'javascript:', 'mailto:', 'data:')
+
+_MARKUP_PATTERN = re.compile(r'<[a-zA-Z!/]')
+_INLINE_SPACE_PATTERN = re.compile(r'[^\S\n]+')
+_LINE_BREAK_PATTERN = re.compile(r'\s*\n\s*')
+
+
+def collapse_whitespace(text: str) -> str:
+    """合并连续空白字符，段落之间保留单个换行"""
+    text = _INLINE_SPACE_PATTERN.sub(' ', text)
+    return _LINE_BREAK_PATTERN.sub('\n', text).strip()
+
+
+def html_to_text(content: str, base_url: Optional[str] = None) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    把HTML转换为纯文本，并提取正文中的链接
+
+    Args:
+        content: HTML或纯文本
+        base_url: 用于解析相对链接的页面URL
+
+    Returns:
+        (纯文本, [{'url': 链接地址, 'text': 链接文字}, ...])
+    """
+    if not content:
+        return '', []
+
+    # 纯文本无需解析，只还原HTML实体并合并空白
+    if not _MARKUP_PATTERN.search(content):
+        return collapse_whitespace(html.unescape(content)), []
+
+    try:
+        root = lxml.html.fragment_fromstring(content, create_parent='div')
+    except (etree.ParserError, ValueError):
+        return collapse_whitespace(html.unescape(content)), []
+
+    etree.strip_elements(root, *REMOVED_TAGS, with_tail=False)
+    etree.strip_elements(root, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+
+    links = []
+    seen = set()
+    for anchor in root.iter('a'):
+        href = (anchor.get('href') or '').strip()
+        if not href or href.lower().startswith(IGNORED_LINK_PREFIXES):
+            continue
+        url = urljoin(base_url, href) if base_url else href
+        if url in seen:
+            continue
+        seen.add(url)
+        links.append({'url': url, 'text': collapse_whitespace(anchor.text_content())})
+
+    for element in root.iter(*BLOCK_TAGS):
+        element.tail = '\n' + (element.tail or '')
+
+    return collapse_whitespace(root.text_content()), links
+
+
+class ContentNormalizer:
+    """内容规范化器"""
+
+    def __init__(self, normalization_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化内容规范化器
+
+        Args:
+            normalization_config: 规范化配置，默认读取 performance.content_normalization
+        """
+        self.config = DEFAULT_CONTENT_NORMALIZATION_CONFIG.copy()
+        self.config.update(
+            normalization_config or config_manager.get_performance_config().get('content_normalization', {}) or {}
+        )
+
+        self.enabled = self.config['enabled']
+        self.max_links = self.config['max_links']
+        self.max_body_chars = int(self.config['max_body_chars'])
+
+        self._lock = threading.Lock()
+        self.reset_run_stats()
+
+    def reset_run_stats(self):
+        """重置本次运行的统计"""
+        self.stats = {'items': 0, 'chars_before': 0, 'chars_after': 0}
+
+    def cap_body(self, text: Optional[str]) -> str:
+        """把纯文本正文截断到 max_body_chars 字符，0表示不截断"""
+        if not text:
+            return ''
+        if self.max_body_chars and len(text) > self.max_body_chars:
+            return text[:self.max_body_chars]
+        return text
+
+    def normalize(self, item: Union[ContentItem, Dict[str, Any]]) -> ContentItem:
+        """
+        规范化单条内容：content转为纯文本并截断，正文链接写入links字段
+
+        在去除标签之后截断，截断位置按纯文本计算，不会切断HTML标签
+
+        Args:
+            item: 抓取器返回的内容条目（原地修改），内容字典会先转换为 ContentItem
+
+        Returns:
+            规范化后的内容条目
+        """
+        item = ContentItem.from_dict(item)
+        if not self.enabled:
+            return item
+
+        content = item.content or ''
+        try:
+            text, links = html_to_text(content, item.url or None)
+        except Exception as e:
+            logger.warning(f"内容规范化失败 {item.url}: {e}")
+            return item
+
+        item.content = self.cap_body(text)
+        if item.title:
+            item.title, _ = html_to_text(item.title)
+        if links:
+            item.links = links[:self.max_links]
+
+        with self._lock:
+            self.stats['items'] += 1
+            self.stats['chars_before'] += len(content)
+            self.stats['chars_after'] += len(text)
+
+        return item
+
+    def normalize_items(self, items: List[Union[ContentItem, Dict[str, Any]]]) -> List[ContentItem]:
+        """规范化一批内容"""
+        return [self.normalize(item) for item in items]
+
+    def get_run_summary(self) -> Dict[str, Any]:
+        """获取本次运行的规范化统计"""
+        with self._lock:
+            return dict(self.stats)
+
+
+# 全局内容规范化器实例
+content_normalizer = ContentNormalizer()
@@ -0,0 +1,238 @@
+"""
+信源条件请求状态
+负责保存各信源的ETag、Last-Modified与内容哈希，使未变化的信源可以跳过解析
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Any
+
+from .task_scope import current_scope
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+
+class FetchStateCheck:
+    """一次条件请求的检查结果，响应体成功处理后由调用方确认"""
+
+    def __init__(self, store: 'FetchStateStore', source_url: str, unchanged: bool, updates: Dict[str, Any]):
+        self.store = store
+        self.source_url = source_url
+        self.unchanged = unchanged
+        self.updates = updates
+        self._confirmed = False
+
+    def confirm(self):
+        """记录本次响应的ETag、Last-Modified与内容哈希，下次运行据此跳过未变化的内容"""
+        if self._confirmed:
+            return
+        self._confirmed = True
+        self.store._confirm(self.source_url, self.updates)
+
+
+class FetchStateStore:
+    """信源条件请求状态存储"""
+
+    def __init__(self):
+        self._states = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.reset_run_stats()
+
+    def _ensure_loaded(self):
+        """首次使用时从数据库加载全部状态"""
+        if self._states is not None:
+            return
+
+        # 延迟导入，避免仅导入fetcher包时就连接数据库
+        from models import SessionLocal, SourceFetchState, get_engine
+
+        states = {}
+        try:
+            SourceFetchState.__table__.create(bind=get_engine(), checkfirst=True)
+
+            session = SessionLocal()
+            try:
+                for row in session.query(SourceFetchState).all():
+                    states[row.source_url] = {
+                        'etag': row.etag,
+                        'last_modified': row.last_modified,
+                        'content_hash': row.content_hash,
+                        'content_length': row.content_length,
+                        'last_checked_at': row.last_checked_at
+                    }
+            finally:
+                session.close()
+
+            logger.info(f"加载 {len(states)} 个信源的条件请求状态")
+
+        except Exception as e:
+            logger.error(f"加载信源条件请求状态失败: {e}")
+
+        self._states = states
+
+    def get_conditional_headers(self, source_url: str) -> Dict[str, str]:
+        """
+        获取条件请求头
+
+        Args:
+            source_url: 信源URL
+
+        Returns:
+            If-None-Match / If-Modified-Since 请求头
+        """
+        with self._lock:
+            self._ensure_loaded()
+            state = self._states.get(source_url) or {}
+
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def check(self, source_url: str, response) -> 'FetchStateCheck':
+        """
+        根据响应判断信源内容是否未变化
+
+        304响应或响应体哈希与上次相同均视为未变化。内容变化时新的ETag与哈希不会立即生效，
+        调用方成功解析响应体后调用 confirm() 才记录，解析失败的内容下次运行会重新解析
+
+        Args:
+            source_url: 信源URL
+            response: 使用条件请求头获取的HTTP响应
+
+        Returns:
+            FetchStateCheck；unchanged为真表示内容未变化，可以跳过解析
+        """
+        updates = {'last_checked_at': datetime.now()}
+
+        with self._lock:
+            self._ensure_loaded()
+            state = self._states.get(source_url) or {}
+
+            if response.status_code == 304:
+                unchanged = True
+                self._record_skip(source_url, 'not_modified', state.get('content_length') or 0)
+            else:
+                body = response.content
+                content_hash = hashlib.sha256(body).hexdigest()
+                unchanged = content_hash == state.get('content_hash')
+
+                updates.update({
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'content_hash': content_hash,
+                    'content_length': len(body)
+                })
+
+                if unchanged:
+                    # 服务器不支持条件请求，但内容未变，仍可跳过解析
+                    self._record_skip(source_url, 'hash_match', 0)
+                else:
+                    self.run_stats['changed_sources'] += 1
+
+        check = FetchStateCheck(self, source_url, unchanged, updates)
+        if unchanged:
+            # 内容未变化时只更新检查时间等，无需等待解析
+            check.confirm()
+        return check
+
+    def _confirm(self, source_url: str, updates: Dict[str, Any]):
+        """记录已成功处理的响应状态"""
+        # 在抓取任务中执行时，待任务结果被采纳后再更新状态
+        scope = current_scope()
+        if scope is not None:
+            scope.defer(self._apply_updates, source_url, updates)
+        else:
+            self._apply_updates(source_url, updates)
+
+    def _apply_updates(self, source_url: str, updates: Dict[str, Any]):
+        """更新内存中的信源状态并标记待保存"""
+        with self._lock:
+            self._ensure_loaded()
+            self._states.setdefault(source_url, {}).update(updates)
+            self._dirty.add(source_url)
+
+    def _record_skip(self, source_url: str, reason: str, bytes_saved: int):
+        """记录被跳过的信源（调用方需持有锁）"""
+        self.run_stats['skipped_sources'].append(source_url)
+        self.run_stats[reason] += 1
+        self.run_stats['bytes_saved'] += bytes_saved
+
+    def save(self) -> int:
+        """
+        将本次运行中更新的状态写入数据库
+
+        应在抓取内容成功入库后调用，避免内容丢失时状态已被推进
+
+        Returns:
+            写入的状态数量
+        """
+        with self._lock:
+            if not self._dirty or self._states is None:
+                return 0
+            dirty = {url: dict(self._states[url]) for url in self._dirty}
+            self._dirty = set()
+
+        from models import SessionLocal, SourceFetchState
+
+        session = SessionLocal()
+        try:
+            existing = {
+                row.source_url: row
+                for row in session.query(SourceFetchState).filter(
+                    SourceFetchState.source_url.in_(list(dirty.keys()))
+                ).all()
+            }
+
+            for source_url, state in dirty.items():
+                row = existing.get(source_url)
+                if row is None:
+                    row = SourceFetchState(source_url=source_url)
+                    session.add(row)
+                row.etag = state.get('etag')
+                row.last_modified = state.get('last_modified')
+                row.content_hash = state.get('content_hash')
+                row.content_length = state.get('content_length')
+                row.last_checked_at = state.get('last_checked_at')
+
+            session.commit()
+            logger.info(f"保存 {len(dirty)} 个信源的条件请求状态")
+            return len(dirty)
+
+        except Exception as e:
+            logger.error(f"保存信源条件请求状态失败: {e}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
+    def reset_run_stats(self):
+        """重置本次运行的统计"""
+        self.run_stats = {
+            'skipped_sources': [],
+            'not_modified': 0,
+            'hash_match': 0,
+            'changed_sources': 0,
+            'bytes_saved': 0
+        }
+
+    def get_run_summary(self) -> Dict[str, Any]:
+        """获取本次运行的条件请求统计"""
+        with self._lock:
+            summary = dict(self.run_stats)
+            summary['skipped_sources'] = list(self.run_stats['skipped_sources'])
+            return summary
+
+
+# 全局信源条件请求状态实例
+fetch_state_store = FetchStateStore()
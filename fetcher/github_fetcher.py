@@ -3,32 +3,122 @@ GitHub Trending数据抓取器
 负责抓取GitHub上的热门AI/ML项目
 """
 
-import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
+import json
 import logging
-import time
-import random
+import os
 import re
+import threading
+import time
+
+import lxml.html
+from lxml import etree
+
+from .config_manager import config_manager
+from .content_item import ContentItem
+from .http_transport import http_transport
+from .keyword_matcher import keyword_engine
+from .task_scope import current_scope, use_scope
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 默认Trending抓取配置
+DEFAULT_GITHUB_CONFIG = {
+    'languages': [
+        "python",           # Python是AI/ML的主要语言
+        "jupyter-notebook", # Jupyter notebooks
+        "javascript",       # 前端AI应用
+        "typescript",       # TypeScript AI项目
+        "rust",             # Rust AI项目
+        "go",               # Go AI项目
+        "java",             # Java AI项目
+        "c++",              # C++ AI项目
+    ],
+    'since': 'daily',
+    'concurrency': 4,                             # 同时抓取的语言数
+    'cache_directory': '.cache/github_trending'  # 按 (语言, 时间范围) 缓存当天解析结果
+}
+
+# Trending页面的预编译XPath（替代逐行的BeautifulSoup find）
+_ROW_XPATH = etree.XPath("//article[contains(concat(' ', normalize-space(@class), ' '), ' Box-row ')]")
+_REPO_HREF_XPATH = etree.XPath("string((.//h2//a/@href)[1])")
+_DESCRIPTION_XPATH = etree.XPath("string((.//p)[1])")
+_LANGUAGE_XPATH = etree.XPath("string((.//span[@itemprop='programmingLanguage'])[1])")
+_STARS_XPATH = etree.XPath("string((.//a[contains(@href, '/stargazers')])[1])")
+_FORKS_XPATH = etree.XPath("string((.//a[contains(@href, '/forks')])[1])")
+_TODAY_STARS_XPATH = etree.XPath("string((.//span[contains(@class, 'float-sm-right')])[1])")
+
+
+class TrendingCache:
+    """Trending解析结果的按日缓存，每个 (语言, 时间范围) 一天只请求和解析一次"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+    
+    def _path(self, language: str, since: str, day: str) -> str:
+        safe_language = re.sub(r'[^a-z0-9_.-]', lambda m: f"%{ord(m.group()):02x}", language.lower()) or 'all'
+        return os.path.join(self.directory, f"{day}_{since}_{safe_language}.json")
+    
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    
+    def get(self, language: str, since: str) -> Optional[List[Dict]]:
+        """读取当天的缓存，未命中返回None"""
+        try:
+            with open(self._path(language, since, self._today()), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取Trending缓存失败 {language}/{since}: {e}")
+            return None
+    
+    def set(self, language: str, since: str, rows: List[Dict]):
+        """写入当天的缓存，并清理之前日期的缓存文件"""
+        today = self._today()
+        path = self._path(language, since, today)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            
+            with self._lock:
+                for name in os.listdir(self.directory):
+                    if name.endswith('.json') and not name.startswith(today):
+                        os.remove(os.path.join(self.directory, name))
+        except Exception as e:
+            logger.warning(f"写入Trending缓存失败 {language}/{since}: {e}")
+
+
 class GitHubFetcher:
     """GitHub Trending数据抓取器"""
     
-    def __init__(self):
-        """初始化GitHub抓取器"""
+    def __init__(self, github_config: Optional[Dict] = None):
+        """
+        初始化GitHub抓取器
+        
+        Args:
+            github_config: Trending抓取配置，默认读取 performance.github
+        """
         self.base_url = "https://github.com/trending"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.transport = http_transport
+        
+        self.config = DEFAULT_GITHUB_CONFIG.copy()
+        self.config.update(github_config or config_manager.get_performance_config().get('github', {}) or {})
+        self.trending_cache = TrendingCache(self.config['cache_directory'])
+        self.last_run_stats = []
     
-    def fetch_trending_repos(self, language: str = "python", since: str = "daily", spoken_language: str = "") -> List[Dict]:
+    def fetch_trending_repos(self, language: str = "python", since: str = "daily", spoken_language: str = "") -> List[ContentItem]:
         """
         抓取GitHub Trending仓库
         
@@ -41,6 +131,14 @@ class GitHubFetcher:
             仓库信息列表
         """
         try:
+            # 同一天内复用已解析的结果（不缓存带spoken_language的请求）
+            if not spoken_language:
+                rows = self.trending_cache.get(language, since)
+                if rows is not None:
+                    logger.info(f"GitHub Trending命中当天缓存，语言: {language}, 时间: {since}")
+                    self._record_page_stats(language, since, len(rows), 0.0, cached=True)
+                    return [self._build_repo_info(row) for row in rows]
+            
             logger.info(f"开始抓取GitHub Trending仓库，语言: {language}, 时间: {since}")
             
             # 构建URL
@@ -58,23 +156,36 @@ class GitHubFetcher:
                 url += "?" + "&".join(params)
             
             # 发送请求
-            response = self.session.get(url)
+            response = self.transport.get(url)
             response.raise_for_status()
             
             # 解析HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            start = time.perf_counter()
+            rows = self._parse_trending_rows(response.content)
+            parse_seconds = time.perf_counter() - start
+            self._record_page_stats(language, since, len(rows), parse_seconds, cached=False)
             
-            # 查找仓库列表
-            repos = self._parse_trending_page(soup)
+            if not spoken_language:
+                self.trending_cache.set(language, since, rows)
             
-            logger.info(f"成功抓取 {len(repos)} 个热门仓库")
-            return repos
+            logger.info(f"成功抓取 {len(rows)} 个热门仓库（解析耗时 {parse_seconds * 1000:.1f} 毫秒）")
+            return [self._build_repo_info(row) for row in rows]
             
         except Exception as e:
             logger.error(f"抓取GitHub Trending失败: {e}")
             return []
     
-    def fetch_ai_ml_trending(self, limit: int = 30) -> List[Dict]:
+    def _record_page_stats(self, language: str, since: str, repos: int, parse_seconds: float, cached: bool):
+        """记录单个Trending页面的解析统计"""
+        self.last_run_stats.append({
+            'language': language,
+            'since': since,
+            'repos': repos,
+            'parse_ms': round(parse_seconds * 1000, 2),
+            'cached': cached
+        })
+    
+    def fetch_ai_ml_trending(self, limit: int = 30) -> List[ContentItem]:
         """
         抓取AI/ML相关的热门仓库
         
@@ -84,36 +195,29 @@ class GitHubFetcher:
         Returns:
             AI/ML仓库信息列表
         """
-        # AI/ML相关的编程语言
-        ai_languages = [
-            "python",           # Python是AI/ML的主要语言
-            "jupyter-notebook", # Jupyter notebooks
-            "javascript",       # 前端AI应用
-            "typescript",       # TypeScript AI项目
-            "rust",            # Rust AI项目
-            "go",              # Go AI项目
-            "java",            # Java AI项目
-            "c++",             # C++ AI项目
-        ]
+        languages = self.config['languages']
+        since = self.config['since']
+        scope = current_scope()
+        self.last_run_stats = []
         
-        all_repos = []
-        
-        for lang in ai_languages[:4]:  # 限制语言数量避免请求过多
-            try:
-                repos = self.fetch_trending_repos(language=lang, since="daily")
-                
+        def fetch_language(lang: str) -> List[ContentItem]:
+            # 工作线程沿用抓取任务的作用域
+            with use_scope(scope):
+                repos = self.fetch_trending_repos(language=lang, since=since)
                 # 过滤AI/ML相关项目
-                ai_repos = self._filter_ai_ml_repos(repos)
-                all_repos.extend(ai_repos)
-                
-                # 添加延迟避免请求过快
-                time.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                logger.error(f"抓取语言 {lang} 失败: {e}")
-                continue
+                return self._filter_ai_ml_repos(repos)
+        
+        all_repos = []
+        with ThreadPoolExecutor(max_workers=max(1, self.config['concurrency']), thread_name_prefix='github-trending') as executor:
+            futures = [(lang, executor.submit(fetch_language, lang)) for lang in languages]
+            for lang, future in futures:
+                try:
+                    all_repos.extend(future.result())
+                except Exception as e:
+                    logger.error(f"抓取语言 {lang} 失败: {e}")
+                    continue
         
-        # 去重（基于repo_name）
+        # 去重（基于repo_name），按语言配置顺序保留
         unique_repos = {}
         for repo in all_repos:
             repo_key = f"{repo['owner']}/{repo['name']}"
@@ -126,107 +230,78 @@ class GitHubFetcher:
         if len(unique_repos_list) > limit:
             unique_repos_list = unique_repos_list[:limit]
         
-        logger.info(f"总共抓取到 {len(unique_repos_list)} 个唯一AI/ML仓库")
+        parsed_pages = [page for page in self.last_run_stats if not page['cached']]
+        logger.info(
+            f"总共抓取到 {len(unique_repos_list)} 个唯一AI/ML仓库（{len(languages)} 种语言，"
+            f"缓存命中 {len(self.last_run_stats) - len(parsed_pages)} 页，"
+            f"解析 {len(parsed_pages)} 页共 {sum(page['parse_ms'] for page in parsed_pages):.1f} 毫秒）"
+        )
         return unique_repos_list
     
-    def _parse_trending_page(self, soup: BeautifulSoup) -> List[Dict]:
-        """解析Trending页面"""
-        repos = []
+    def _parse_trending_rows(self, html: bytes) -> List[Dict]:
+        """
+        用预编译XPath解析Trending页面
         
-        try:
-            # 查找仓库文章
-            repo_articles = soup.find_all('article', class_='Box-row')
-            
-            for article in repo_articles:
-                try:
-                    repo_info = self._parse_repo_article(article)
-                    if repo_info:
-                        repos.append(repo_info)
-                except Exception as e:
-                    logger.error(f"解析仓库文章时出错: {e}")
+        Returns:
+            仓库字段列表 [{'owner', 'name', 'description', 'language', 'stars', 'forks', 'today_stars'}]
+        """
+        root = lxml.html.fromstring(html)
+        rows = []
+        
+        for article in _ROW_XPATH(root):
+            try:
+                repo_path = _REPO_HREF_XPATH(article).strip().strip('/')
+                if '/' not in repo_path:
                     continue
-            
-        except Exception as e:
-            logger.error(f"解析Trending页面失败: {e}")
+                owner, name = repo_path.split('/', 1)
+                
+                rows.append({
+                    'owner': owner,
+                    'name': name,
+                    'description': ' '.join(_DESCRIPTION_XPATH(article).split()),
+                    'language': _LANGUAGE_XPATH(article).strip() or "未知",
+                    'stars': self._parse_number(_STARS_XPATH(article).strip()),
+                    'forks': self._parse_number(_FORKS_XPATH(article).strip()),
+                    'today_stars': self._parse_number(_TODAY_STARS_XPATH(article).strip())
+                })
+            except Exception as e:
+                logger.error(f"解析仓库文章时出错: {e}")
+                continue
         
-        return repos
+        return rows
     
-    def _parse_repo_article(self, article: BeautifulSoup) -> Optional[Dict]:
-        """解析单个仓库文章"""
-        try:
-            # 提取仓库名称和所有者
-            repo_link = article.find('h2', class_='h3').find('a')
-            if not repo_link:
-                return None
-            
-            repo_path = repo_link.get('href', '').strip('/')
-            if not repo_path:
-                return None
-            
-            owner, name = repo_path.split('/', 1)
-            
-            # 提取描述
-            description_elem = article.find('p')
-            description = description_elem.get_text().strip() if description_elem else ""
-            
-            # 提取编程语言
-            language_elem = article.find('span', {'itemprop': 'programmingLanguage'})
-            language = language_elem.get_text().strip() if language_elem else "未知"
-            
-            # 提取星标数
-            stars_elem = article.find('a', href=re.compile(r'/stargazers'))
-            stars = 0
-            if stars_elem:
-                stars_text = stars_elem.get_text().strip()
-                stars = self._parse_number(stars_text)
-            
-            # 提取fork数
-            forks_elem = article.find('a', href=re.compile(r'/forks'))
-            forks = 0
-            if forks_elem:
-                forks_text = forks_elem.get_text().strip()
-                forks = self._parse_number(forks_text)
-            
-            # 提取今日星标数
-            today_stars_elem = article.find('span', class_='d-inline-block float-sm-right')
-            today_stars = 0
-            if today_stars_elem:
-                today_stars_text = today_stars_elem.get_text().strip()
-                today_stars = self._parse_number(today_stars_text)
-            
-            # 构建内容摘要
-            content_summary = f"""
+    def _build_repo_info(self, row: Dict) -> ContentItem:
+        """由解析出的仓库字段构建仓库信息"""
+        owner, name = row['owner'], row['name']
+        
+        # 构建内容摘要
+        content_summary = f"""
 仓库: {owner}/{name}
-语言: {language}
-描述: {description}
-总星标: {stars:,}
-总Fork: {forks:,}
-今日新增星标: {today_stars:,}
-            """.strip()
-            
-            # 构建仓库信息
-            repo_info = {
-                'title': f"GitHub热门项目: {owner}/{name}",
-                'content': content_summary,
-                'url': f"https://github.com/{owner}/{name}",
-                'published_at': datetime.now(),  # GitHub不提供具体时间，使用当前时间
-                'source_name': f"GitHub Trending {language}",
-                'source_type': 'github',
+语言: {row['language']}
+描述: {row['description']}
+总星标: {row['stars']:,}
+总Fork: {row['forks']:,}
+今日新增星标: {row['today_stars']:,}
+        """.strip()
+        
+        return ContentItem(
+            title=f"GitHub热门项目: {owner}/{name}",
+            content=content_summary,
+            url=f"https://github.com/{owner}/{name}",
+            published_at=datetime.now(),  # GitHub不提供具体时间，使用当前时间
+            source_name=f"GitHub Trending {row['language']}",
+            source_type='github',
+            extras={
                 'owner': owner,
                 'name': name,
                 'full_name': f"{owner}/{name}",
-                'description': description,
-                'language': language,
-                'stars': stars,
-                'forks': forks,
-                'today_stars': today_stars
+                'description': row['description'],
+                'language': row['language'],
+                'stars': row['stars'],
+                'forks': row['forks'],
+                'today_stars': row['today_stars']
             }
-            
-            return repo_info
-            
-        except Exception as e:
-            logger.error(f"解析仓库文章失败: {e}")
-            return None
+        )
     
     def _parse_number(self, text: str) -> int:
         """解析数字文本"""
@@ -234,36 +309,31 @@ class GitHubFetcher:
             return 0
         
         try:
-            # 移除逗号和k/m等后缀
-            text = text.replace(',', '').replace('k', '000').replace('m', '000000')
-            return int(float(text))
-        except:
+            # 只取数字部分（如 "1,234 stars today"），支持k/m后缀
+            match = re.search(r'([\d,.]+)\s*([km]?)', text.lower())
+            if not match:
+                return 0
+            multiplier = {'k': 1000, 'm': 1000000}.get(match.group(2), 1)
+            return int(float(match.group(1).replace(',', '')) * multiplier)
+        except ValueError:
             return 0
     
-    def _filter_ai_ml_repos(self, repos: List[Dict]) -> List[Dict]:
+    def _filter_ai_ml_repos(self, repos: List[ContentItem]) -> List[ContentItem]:
         """过滤AI/ML相关的仓库"""
-        ai_keywords = [
-            'ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
-            'neural network', 'nlp', 'natural language processing', 'computer vision',
-            'cv', 'transformer', 'gpt', 'bert', 'llm', 'large language model',
-            'diffusion', 'stable diffusion', 'chatbot', 'recommendation',
-            'reinforcement learning', 'rl', 'data science', 'data mining',
-            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'opencv',
-            'huggingface', 'transformers', 'datasets', 'accelerate'
-        ]
+        matcher = keyword_engine.matcher('github_ai_repos')
         
         ai_repos = []
         
         for repo in repos:
             # 检查仓库名称、描述和标签
-            repo_text = f"{repo['full_name']} {repo['description']} {repo['language']}".lower()
+            repo_text = f"{repo['full_name']} {repo['description']} {repo['language']}"
             
-            if any(keyword in repo_text for keyword in ai_keywords):
+            if matcher.search(repo_text):
                 ai_repos.append(repo)
         
         return ai_repos
     
-    def search_ai_repos(self, query: str, limit: int = 20) -> List[Dict]:
+    def search_ai_repos(self, query: str, limit: int = 20) -> List[ContentItem]:
         """
         搜索AI相关的仓库
         
@@ -280,7 +350,7 @@ class GitHubFetcher:
             # 构建搜索URL
             search_url = f"https://github.com/search?q={query}&type=repositories&s=stars&o=desc"
             
-            response = self.session.get(search_url)
+            response = self.transport.get(search_url)
             response.raise_for_status()
             
             # 解析搜索结果页面
@@ -296,7 +366,7 @@ class GitHubFetcher:
             logger.error(f"搜索AI仓库失败 '{query}': {e}")
             return []
     
-    def _parse_search_results(self, soup: BeautifulSoup, limit: int) -> List[Dict]:
+    def _parse_search_results(self, soup: BeautifulSoup, limit: int) -> List[ContentItem]:
         """解析搜索结果页面"""
         repos = []
         
@@ -348,20 +418,22 @@ class GitHubFetcher:
                 stars = self._parse_number(stars_text)
             
             # 构建仓库信息
-            repo_info = {
-                'title': f"GitHub搜索结果: {owner}/{name}",
-                'content': f"仓库: {owner}/{name}\n语言: {language}\n描述: {description}\n星标: {stars:,}",
-                'url': f"https://github.com/{owner}/{name}",
-                'published_at': datetime.now(),
-                'source_name': f"GitHub搜索 {language}",
-                'source_type': 'github',
-                'owner': owner,
-                'name': name,
-                'full_name': f"{owner}/{name}",
-                'description': description,
-                'language': language,
-                'stars': stars
-            }
+            repo_info = ContentItem(
+                title=f"GitHub搜索结果: {owner}/{name}",
+                content=f"仓库: {owner}/{name}\n语言: {language}\n描述: {description}\n星标: {stars:,}",
+                url=f"https://github.com/{owner}/{name}",
+                published_at=datetime.now(),
+                source_name=f"GitHub搜索 {language}",
+                source_type='github',
+                extras={
+                    'owner': owner,
+                    'name': name,
+                    'full_name': f"{owner}/{name}",
+                    'description': description,
+                    'language': language,
+                    'stars': stars
+                }
+            )
             
             return repo_info
             
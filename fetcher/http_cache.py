@@ -0,0 +1,309 @@
+"""
+HTTP响应磁盘缓存
+以请求方法、URL、参数和影响响应内容的请求头的哈希为键缓存GET响应，遵循配置的TTL与Cache-Control，按总大小做LRU淘汰
+默认关闭，只用于开发调试（main.py --http-cache）；生产运行依赖条件请求与增量状态获取最新内容
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Any, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .config_manager import config_manager
+
+logger = logging.getLogger(__name__)
+
+# 默认缓存配置
+DEFAULT_HTTP_CACHE_CONFIG = {
+    'enabled': False,
+    'directory': '.cache/http',
+    'max_size_mb': 200
+}
+
+# 只缓存成功响应
+CACHEABLE_STATUS_CODES = {200, 203}
+
+# 缓存的响应体已解码，不再保留与传输编码相关的响应头
+STRIPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+# 影响响应内容的请求头，参与缓存键（不同凭据、不同内容协商的响应分开缓存）
+KEYED_REQUEST_HEADERS = ('authorization', 'cookie', 'accept', 'accept-language')
+
+# 条件请求头：携带时必须访问源站，由调用方根据304或响应体判断内容是否变化
+CONDITIONAL_REQUEST_HEADERS = ('if-none-match', 'if-modified-since')
+
+_MAX_AGE_PATTERN = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+def _parse_cache_control(value: Optional[str]) -> Tuple[set, Optional[int]]:
+    """解析Cache-Control，返回 (指令集合, max-age秒数)"""
+    if not value:
+        return set(), None
+
+    value = value.lower()
+    directives = {part.strip().split('=')[0] for part in value.split(',') if part.strip()}
+    match = _MAX_AGE_PATTERN.search(value)
+    return directives, int(match.group(1)) if match else None
+
+
+class HTTPCache:
+    """HTTP响应磁盘缓存"""
+
+    def __init__(self, cache_config: Optional[Dict[str, Any]] = None, ttl: Optional[float] = None):
+        """
+        初始化HTTP缓存
+
+        Args:
+            cache_config: 缓存配置，默认读取 performance.http_cache
+            ttl: 缓存有效期（秒），默认读取 performance.cache_duration
+        """
+        performance_config = config_manager.get_performance_config()
+
+        self.config = DEFAULT_HTTP_CACHE_CONFIG.copy()
+        self.config.update(cache_config or performance_config.get('http_cache', {}) or {})
+
+        self.enabled = self.config['enabled']
+        self.directory = self.config['directory']
+        self.max_size = int(self.config['max_size_mb'] * 1024 * 1024)
+        self.ttl = ttl if ttl is not None else performance_config.get('cache_duration', 3600)
+
+        self._lock = threading.Lock()
+        self._total_size = None
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def make_key(self, method: str, url: str, params: Any = None, headers: Optional[Dict[str, str]] = None) -> str:
+        """根据请求方法、URL、参数和 KEYED_REQUEST_HEADERS 中的请求头生成缓存键"""
+        prepared_url = requests.Request(method, url, params=params).prepare().url
+        keyed_headers = sorted(
+            (name.lower(), str(value)) for name, value in (headers or {}).items()
+            if name.lower() in KEYED_REQUEST_HEADERS
+        )
+        raw_key = f"{method.upper()} {prepared_url}"
+        if keyed_headers:
+            raw_key += '\n' + '\n'.join(f"{name}: {value}" for name, value in keyed_headers)
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        """缓存条目的元数据与响应体路径"""
+        directory = os.path.join(self.directory, key[:2])
+        return os.path.join(directory, f"{key}.json"), os.path.join(directory, f"{key}.body")
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        """
+        读取未过期的缓存响应
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的响应，未命中或已过期时返回None
+        """
+        meta_path, body_path = self._paths(key)
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            if meta['expires_at'] <= time.time():
+                self._remove(meta_path, body_path)
+                self._count('misses')
+                return None
+
+            with open(body_path, 'rb') as f:
+                body = f.read()
+
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except Exception as e:
+            logger.warning(f"读取HTTP缓存失败 {key}: {e}")
+            self._count('misses')
+            return None
+
+        # 更新访问时间，供LRU淘汰使用
+        try:
+            os.utime(meta_path, None)
+        except OSError:
+            pass
+
+        self._count('hits')
+        return self._build_response(meta, body)
+
+    def set(self, key: str, response: requests.Response, body: Optional[bytes] = None) -> bool:
+        """
+        缓存响应，遵循响应的Cache-Control
+
+        Args:
+            key: 缓存键
+            response: HTTP响应
+            body: 已解码的响应体，默认读取 response.content；流式响应由调用方读完后传入
+
+        Returns:
+            是否写入缓存
+        """
+        if response.status_code not in CACHEABLE_STATUS_CODES:
+            return False
+
+        directives, max_age = _parse_cache_control(response.headers.get('Cache-Control'))
+        if 'no-store' in directives or 'no-cache' in directives:
+            return False
+
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        if ttl <= 0:
+            return False
+
+        if body is None:
+            body = response.content
+        meta = {
+            'url': response.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in STRIPPED_HEADERS},
+            'stored_at': time.time(),
+            'expires_at': time.time() + ttl,
+            'size': len(body)
+        }
+
+        meta_path, body_path = self._paths(key)
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            previous_size = self._entry_size(meta_path, body_path)
+
+            # 先写临时文件再原子替换，避免并发读取到不完整的条目
+            self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+        except Exception as e:
+            logger.warning(f"写入HTTP缓存失败 {response.url}: {e}")
+            return False
+
+        self._count('stores')
+        self._add_size(self._entry_size(meta_path, body_path) - previous_size)
+        return True
+
+    def _build_response(self, meta: Dict[str, Any], body: bytes) -> requests.Response:
+        """由缓存条目还原响应对象"""
+        response = requests.Response()
+        response.status_code = meta['status_code']
+        response.reason = meta.get('reason') or ''
+        response.url = meta['url']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(0)
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+    def _atomic_write(self, path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _entry_size(self, meta_path: str, body_path: str) -> int:
+        size = 0
+        for path in (meta_path, body_path):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _remove(self, meta_path: str, body_path: str):
+        size = self._entry_size(meta_path, body_path)
+        for path in (meta_path, body_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._add_size(-size)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _scan(self):
+        """扫描缓存目录，返回 [(访问时间, 元数据路径, 响应体路径)] 与总大小"""
+        entries = []
+        total = 0
+        if not os.path.isdir(self.directory):
+            return entries, total
+
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                meta_path = os.path.join(root, name)
+                body_path = meta_path[:-len('.json')] + '.body'
+                try:
+                    accessed_at = os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+                total += self._entry_size(meta_path, body_path)
+                entries.append((accessed_at, meta_path, body_path))
+        return entries, total
+
+    def _add_size(self, delta: int):
+        """更新缓存总大小，超出上限时淘汰最久未访问的条目"""
+        with self._lock:
+            if self._total_size is None:
+                self._total_size = self._scan()[1]
+            else:
+                self._total_size += delta
+            over_limit = self._total_size > self.max_size
+
+        if over_limit:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        按最近访问时间淘汰条目，直到总大小降到上限的90%以下
+
+        Returns:
+            淘汰的条目数量
+        """
+        entries, total = self._scan()
+        target = self.max_size * 0.9
+        evicted = 0
+
+        for _, meta_path, body_path in sorted(entries):
+            if total <= target:
+                break
+            size = self._entry_size(meta_path, body_path)
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._total_size = total
+            self.stats['evictions'] += evicted
+
+        if evicted:
+            logger.info(f"HTTP缓存超出上限，淘汰 {evicted} 个最久未访问的条目")
+        return evicted
+
+    def clear(self):
+        """清空缓存"""
+        entries, _ = self._scan()
+        for _, meta_path, body_path in entries:
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        with self._lock:
+            self._total_size = 0
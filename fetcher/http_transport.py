@@ -0,0 +1,335 @@
+"""
+共享HTTP传输层
+为所有抓取器和AI客户端提供统一的连接池、超时、压缩协商和请求统计
+"""
+
+import logging
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config_manager import config_manager
+from .rate_limiter import rate_limiter
+from .task_scope import current_scope
+from .http_cache import HTTPCache, CONDITIONAL_REQUEST_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# brotli为可选依赖，安装后urllib3才能解码br响应
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# 默认连接池与超时配置
+DEFAULT_HTTP_CONFIG = {
+    'connect_timeout': 5,
+    'read_timeout': 30,
+    'pool_connections': 20,   # 缓存的主机连接池数量
+    'pool_maxsize': 10,       # 每个主机的最大keep-alive连接数
+    'host_pool_sizes': {},    # 按主机单独设置连接池大小
+    'host_timeouts': {}       # 按主机单独设置 [连接超时, 读取超时]
+}
+
+
+class TaskDeadlineExceeded(requests.exceptions.Timeout):
+    """抓取任务已到时限，请求未发出"""
+
+
+class _CachingRawStream:
+    """
+    流式响应体的读取代理
+
+    调用方通过 read() 按 decode_content=True 读完整个响应体后，把读到的内容写入缓存；
+    中途出错、未读完或读取未解码的原始字节时不写入缓存
+    """
+
+    def __init__(self, raw, on_complete):
+        """
+        Args:
+            raw: 响应的底层连接（urllib3响应）
+            on_complete: 读完响应体后调用，参数为完整响应体
+        """
+        self._raw = raw
+        self._on_complete = on_complete
+        self._chunks = []
+        self._cacheable = True
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    @property
+    def decode_content(self):
+        return self._raw.decode_content
+
+    @decode_content.setter
+    def decode_content(self, value):
+        self._raw.decode_content = value
+
+    def read(self, amt=None, *args, **kwargs):
+        data = self._raw.read(amt, *args, **kwargs)
+        if not self._cacheable:
+            return data
+
+        # 缓存的响应体已解码，读取原始压缩字节时不缓存
+        decode_content = args[0] if args else kwargs.get('decode_content')
+        if decode_content is None:
+            decode_content = self._raw.decode_content
+        if not decode_content:
+            self._cacheable = False
+            self._chunks = []
+            return data
+
+        if data:
+            self._chunks.append(data)
+        if not data or amt is None:
+            self._cacheable = False
+            body, self._chunks = b''.join(self._chunks), []
+            self._on_complete(body)
+        return data
+
+
+class HTTPTransport:
+    """共享HTTP传输层"""
+
+    def __init__(self, http_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化HTTP传输层
+
+        Args:
+            http_config: 传输配置，默认读取 performance.http
+        """
+        self.config = DEFAULT_HTTP_CONFIG.copy()
+        self.config.update(http_config or config_manager.get_performance_config().get('http', {}) or {})
+
+        self.default_timeout = (self.config['connect_timeout'], self.config['read_timeout'])
+        self.host_timeouts = {
+            host.lower(): tuple(timeout) if isinstance(timeout, (list, tuple)) else timeout
+            for host, timeout in (self.config.get('host_timeouts') or {}).items()
+        }
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+        })
+
+        # 默认连接池
+        default_adapter = HTTPAdapter(
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize']
+        )
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+
+        # 按主机单独设置连接池大小
+        for host, pool_size in (self.config.get('host_pool_sizes') or {}).items():
+            host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.session.mount(f'http://{host}', host_adapter)
+            self.session.mount(f'https://{host}', host_adapter)
+
+        # GET响应磁盘缓存（performance.http_cache，TTL取 performance.cache_duration）
+        self.cache = HTTPCache()
+
+        self._stats_lock = threading.Lock()
+        self._host_stats = {}
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        发送HTTP请求
+
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            **kwargs: 透传给 requests.Session.request 的参数
+
+        Returns:
+            HTTP响应
+        """
+        host = urlparse(url).netloc
+        kwargs.setdefault('timeout', self.get_timeout(host))
+
+        # 在抓取任务中执行时，超时不超过任务剩余时间；已到时限的任务不再发起请求
+        scope = current_scope()
+        remaining = scope.remaining() if scope is not None else None
+        if remaining is not None:
+            if remaining <= 0:
+                self._record(url, None, failed=True, error='任务已到时限')
+                raise TaskDeadlineExceeded(f"抓取任务 {scope.name} 已到时限，跳过请求: {url}")
+            kwargs['timeout'] = self._clamp_timeout(kwargs['timeout'], remaining)
+
+        # 命中缓存时不占用限流令牌，也不产生网络请求
+        cache_key = None
+        if self._is_cacheable(method, kwargs):
+            cache_key = self.cache.make_key(method, url, kwargs.get('params'), self._merged_headers(kwargs))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_cache_hit(url)
+                return cached
+
+        # 按目标主机限流，替代各抓取器中的固定延迟；等待时间同样不超过任务剩余时间
+        if not self.rate_limiter.acquire(host, timeout=remaining):
+            self._record(url, None, failed=True, error='限流等待超过任务剩余时间')
+            raise TaskDeadlineExceeded(f"抓取任务 {scope.name} 剩余时间不足以等待限流令牌: {url}")
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            self._record(url, None, failed=True, error=str(e))
+            raise
+
+        self._record(url, response, stream=kwargs.get('stream', False))
+
+        if cache_key is not None:
+            if kwargs.get('stream') and response.raw is not None:
+                # 流式响应在调用方读完响应体后再写入缓存（通过 iter_content 读取的响应体不缓存）
+                response.raw = _CachingRawStream(
+                    response.raw, lambda body: self.cache.set(cache_key, response, body)
+                )
+            elif not kwargs.get('stream'):
+                self.cache.set(cache_key, response)
+        return response
+
+    def _merged_headers(self, kwargs: Dict[str, Any]) -> Dict[str, str]:
+        """会话默认请求头与本次请求头合并后的结果（本次请求头优先）"""
+        headers = {k.lower(): v for k, v in self.session.headers.items()}
+        headers.update({k.lower(): v for k, v in (kwargs.get('headers') or {}).items() if v is not None})
+        return headers
+
+    def _is_cacheable(self, method: str, kwargs: Dict[str, Any]) -> bool:
+        """只缓存未声明no-cache、不带条件请求头的GET请求"""
+        if not self.cache.enabled or method.upper() != 'GET':
+            return False
+
+        headers = {k.lower(): v for k, v in (kwargs.get('headers') or {}).items()}
+        if any(headers.get(name) for name in CONDITIONAL_REQUEST_HEADERS):
+            return False
+
+        cache_control = (headers.get('cache-control') or '').lower()
+        return 'no-cache' not in cache_control and 'no-store' not in cache_control
+
+    @staticmethod
+    def _clamp_timeout(timeout, remaining: float):
+        """把 (连接超时, 读取超时) 或单个超时限制在剩余时间内"""
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, (list, tuple)):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+    def get_timeout(self, host: str):
+        """获取主机对应的超时设置，支持按父域名匹配"""
+        parts = host.lower().split(':')[0].split('.')
+        for i in range(len(parts) - 1):
+            timeout = self.host_timeouts.get('.'.join(parts[i:]))
+            if timeout is not None:
+                return timeout
+        return self.default_timeout
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """发送GET请求"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """发送POST请求"""
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """发送HEAD请求"""
+        return self.request('HEAD', url, **kwargs)
+
+    def _new_host_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': 0,
+            'failures': 0,
+            'cache_hits': 0,
+            'bytes_received': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0
+        }
+
+    def _record(self, url: str, response: Optional[requests.Response], stream: bool = False,
+                failed: bool = False, error: Optional[str] = None):
+        """记录单次请求的字节数与耗时"""
+        host = urlparse(url).netloc
+
+        # 向当前抓取任务报告请求结果，服务端错误与限流响应同样视为失败，供熔断器判断信源健康
+        scope = current_scope()
+        if scope is not None:
+            if response is not None and (response.status_code >= 500 or response.status_code == 429):
+                scope.record_request(True, f"HTTP {response.status_code} {url}")
+            else:
+                scope.record_request(failed or response is None, error)
+
+        with self._stats_lock:
+            stats = self._host_stats.setdefault(host, self._new_host_stats())
+            stats['requests'] += 1
+
+            if failed or response is None:
+                stats['failures'] += 1
+                return
+
+            # 优先使用Content-Length（压缩后的实际传输字节），否则使用解码后的内容长度
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit():
+                stats['bytes_received'] += int(content_length)
+            elif not stream:
+                stats['bytes_received'] += len(response.content)
+
+            latency = response.elapsed.total_seconds()
+            stats['total_latency'] += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+
+    def _record_cache_hit(self, url: str):
+        """记录一次缓存命中"""
+        host = urlparse(url).netloc
+        with self._stats_lock:
+            stats = self._host_stats.setdefault(host, self._new_host_stats())
+            stats['cache_hits'] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取按主机统计的请求数据"""
+        with self._stats_lock:
+            stats = {}
+            for host, host_stats in self._host_stats.items():
+                stats[host] = dict(host_stats)
+                stats[host]['avg_latency'] = (
+                    host_stats['total_latency'] / host_stats['requests'] if host_stats['requests'] else 0.0
+                )
+            return stats
+
+    def get_stats_summary(self) -> Dict[str, Any]:
+        """获取请求统计汇总"""
+        stats = self.get_stats()
+        return {
+            'total_requests': sum(s['requests'] for s in stats.values()),
+            'total_failures': sum(s['failures'] for s in stats.values()),
+            'total_cache_hits': sum(s['cache_hits'] for s in stats.values()),
+            'total_bytes': sum(s['bytes_received'] for s in stats.values()),
+            'total_latency': sum(s['total_latency'] for s in stats.values()),
+            'hosts': stats
+        }
+
+    def reset_stats(self):
+        """清空请求统计"""
+        with self._stats_lock:
+            self._host_stats = {}
+
+    def close(self):
+        """关闭所有连接"""
+        self.session.close()
+
+
+# 全局HTTP传输实例
+http_transport = HTTPTransport()
@@ -3,31 +3,68 @@ Hugging Face数据抓取器
 负责抓取Hugging Face上的热门AI模型和趋势信息
 """
 
-import requests
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Dict, Optional
 import logging
-import time
-import random
+
+from .cassette import now_timestamp
+from .config_manager import config_manager
+from .content_item import ContentItem
+from .http_transport import http_transport
+from .watermark_store import watermark_store
+from .task_scope import current_scope, use_scope
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 默认模型收割配置
+DEFAULT_HUGGINGFACE_CONFIG = {
+    'pipelines': [
+        'text-generation',
+        'text2text-generation',
+        'image-generation',
+        'image-to-text',
+        'text-to-image',
+        'translation',
+        'summarization',
+        'question-answering',
+        'sentiment-analysis',
+        'zero-shot-classification'
+    ],
+    'sort': 'lastModified',   # 按最近更新排序，翻页遇到水位线即停止
+    'page_size': 500,         # 每页模型数（API单页上限1000）
+    'lookback_days': 1,       # 没有水位线时回溯的天数
+    'max_pages': 20,          # 每个pipeline最多跟随的游标页数
+    'concurrency': 4          # 同时收割的pipeline数
+}
+
+# 只请求处理模型时用到的字段（expand[]投影），避免 full=true 返回文件列表等大字段
+EXPAND_FIELDS = ['author', 'downloads', 'likes', 'lastModified', 'pipeline_tag', 'tags']
+
+
 class HuggingFaceFetcher:
     """Hugging Face数据抓取器"""
     
-    def __init__(self):
-        """初始化Hugging Face抓取器"""
+    def __init__(self, huggingface_config: Optional[Dict] = None):
+        """
+        初始化Hugging Face抓取器
+        
+        Args:
+            huggingface_config: 收割配置，默认读取 performance.huggingface
+        """
         self.base_url = "https://huggingface.co/api"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.transport = http_transport
+        self.watermarks = watermark_store
+        
+        self.config = DEFAULT_HUGGINGFACE_CONFIG.copy()
+        self.config.update(huggingface_config or config_manager.get_performance_config().get('huggingface', {}) or {})
     
-    def fetch_trending_models(self, limit: int = 50) -> List[Dict]:
+    def fetch_trending_models(self, limit: int = 50) -> List[ContentItem]:
         """
         抓取热门模型
         
@@ -44,10 +81,10 @@ class HuggingFaceFetcher:
             params = {
                 'sort': 'trending',
                 'limit': limit,
-                'full': 'true'  # 获取完整信息
+                'expand[]': EXPAND_FIELDS
             }
             
-            response = self.session.get(f"{self.base_url}/models", params=params)
+            response = self.transport.get(f"{self.base_url}/models", params=params)
             response.raise_for_status()
             
             models_data = response.json()
@@ -67,6 +104,8 @@ class HuggingFaceFetcher:
                     logger.error(f"处理模型数据时出错: {e}")
                     continue
             
+            processed_models = self._filter_new_models("huggingface:trending", processed_models)
+            
             logger.info(f"成功抓取 {len(processed_models)} 个热门模型")
             return processed_models
             
@@ -74,7 +113,7 @@ class HuggingFaceFetcher:
             logger.error(f"抓取Hugging Face热门模型失败: {e}")
             return []
     
-    def fetch_models_by_pipeline(self, pipeline_tag: str, limit: int = 30) -> List[Dict]:
+    def fetch_models_by_pipeline(self, pipeline_tag: str, limit: int = 30) -> List[ContentItem]:
         """
         根据pipeline标签抓取模型
         
@@ -92,10 +131,10 @@ class HuggingFaceFetcher:
                 'pipeline_tag': pipeline_tag,
                 'sort': 'downloads',
                 'limit': limit,
-                'full': 'true'
+                'expand[]': EXPAND_FIELDS
             }
             
-            response = self.session.get(f"{self.base_url}/models", params=params)
+            response = self.transport.get(f"{self.base_url}/models", params=params)
             response.raise_for_status()
             
             models_data = response.json()
@@ -115,6 +154,8 @@ class HuggingFaceFetcher:
                     logger.error(f"处理模型数据时出错: {e}")
                     continue
             
+            processed_models = self._filter_new_models(self._watermark_key(pipeline_tag, 'downloads'), processed_models)
+            
             logger.info(f"成功抓取 {len(processed_models)} 个 {pipeline_tag} 模型")
             return processed_models
             
@@ -153,21 +194,23 @@ class HuggingFaceFetcher:
             """.strip()
             
             # 构建模型信息
-            processed_model = {
-                'title': f"Hugging Face模型: {model_id}",
-                'content': content_summary,
-                'url': f"https://huggingface.co/{model_id}",
-                'published_at': self._parse_timestamp(last_modified),
-                'source_name': f"Hugging Face {pipeline_tag if pipeline_tag else 'AI模型'}",
-                'source_type': 'huggingface',
-                'model_id': model_id,
-                'author': author,
-                'pipeline_tag': pipeline_tag,
-                'tags': tags,
-                'downloads': downloads,
-                'likes': likes,
-                'last_modified': last_modified
-            }
+            processed_model = ContentItem(
+                title=f"Hugging Face模型: {model_id}",
+                content=content_summary,
+                url=f"https://huggingface.co/{model_id}",
+                published_at=self._parse_timestamp(last_modified),
+                source_name=f"Hugging Face {pipeline_tag if pipeline_tag else 'AI模型'}",
+                source_type='huggingface',
+                extras={
+                    'model_id': model_id,
+                    'author': author,
+                    'pipeline_tag': pipeline_tag,
+                    'tags': tags,
+                    'downloads': downloads,
+                    'likes': likes,
+                    'last_modified': last_modified
+                }
+            )
             
             return processed_model
             
@@ -175,6 +218,45 @@ class HuggingFaceFetcher:
             logger.error(f"处理模型数据失败: {e}")
             return None
     
+    def _watermark_key(self, pipeline_tag: str, sort: str) -> str:
+        """
+        pipeline水位线标识
+        
+        不同排序的列表各用一条水位线：按下载量排序的列表推进的水位线会让按更新时间收割的翻页提前停止
+        """
+        if sort == 'lastModified':
+            return f"huggingface:{pipeline_tag}"
+        return f"huggingface:{sort}:{pipeline_tag}"
+    
+    def _filter_new_models(self, watermark_key: str, models: List[ContentItem]) -> List[ContentItem]:
+        """
+        按lastModified水位线过滤模型，只保留上次运行后有更新的模型
+        
+        Args:
+            watermark_key: 水位线标识
+            models: 处理后的模型列表
+            
+        Returns:
+            有更新的模型列表
+        """
+        new_models = []
+        newest = None
+        
+        for model in models:
+            modified_at = self._parse_timestamp(model['last_modified']) if model['last_modified'] else None
+            if modified_at and (newest is None or modified_at > newest[0]):
+                newest = (modified_at, model['model_id'])
+            
+            if modified_at and not self.watermarks.is_new(watermark_key, modified_at, model['model_id']):
+                continue
+            new_models.append(model)
+        
+        self.watermarks.record_skipped(watermark_key, len(models) - len(new_models))
+        if newest:
+            self.watermarks.advance(watermark_key, *newest)
+        
+        return new_models
+    
     def _parse_timestamp(self, timestamp: str) -> Optional[datetime]:
         """解析时间戳"""
         if not timestamp:
@@ -187,56 +269,181 @@ class HuggingFaceFetcher:
             logger.error(f"解析时间戳失败: {timestamp}, 错误: {e}")
             return datetime.now()
     
-    def fetch_ai_related_models(self, limit: int = 50) -> List[Dict]:
+    def fetch_ai_related_models(self, limit: int = 50) -> List[ContentItem]:
         """
         抓取AI相关的热门模型
         
+        并发收割全部配置的pipeline中上次运行后有更新的模型，按下载量和点赞数排序后
+        为前limit个模型构建内容。排序截断是筛选结果：收割完整的pipeline水位线推进到
+        本次收割的最新模型，未入选的模型只有再次更新后才会重新出现
+        
         Args:
-            limit: 获取模型数量
+            limit: 返回的模型数量
             
         Returns:
             AI模型信息列表
         """
-        # AI相关的pipeline标签
-        ai_pipelines = [
-            'text-generation',
-            'text2text-generation',
-            'image-generation',
-            'image-to-text',
-            'text-to-image',
-            'translation',
-            'summarization',
-            'question-answering',
-            'sentiment-analysis',
-            'zero-shot-classification'
-        ]
+        harvest_info = {}
+        candidates = list(self.harvest_models(self.config['pipelines'], harvest_info))
+        candidates.sort(key=lambda model: (model.get('downloads') or 0, model.get('likes') or 0), reverse=True)
+        candidates = candidates[:limit]
         
-        all_models = []
+        for pipeline_tag, info in harvest_info.items():
+            self._advance_pipeline_watermark(pipeline_tag, info)
         
-        for pipeline in ai_pipelines[:5]:  # 限制pipeline数量避免请求过多
+        processed_models = []
+        for model in candidates:
             try:
-                models = self.fetch_models_by_pipeline(pipeline, limit // len(ai_pipelines))
-                all_models.extend(models)
-                
-                # 添加延迟避免请求过快
-                time.sleep(random.uniform(1, 3))
-                
+                processed_model = self._process_model_data(model)
+                if processed_model:
+                    processed_models.append(processed_model)
             except Exception as e:
-                logger.error(f"抓取pipeline {pipeline} 失败: {e}")
+                logger.error(f"处理模型数据时出错: {e}")
                 continue
         
-        # 去重（基于model_id）
-        unique_models = {}
-        for model in all_models:
-            if model['model_id'] not in unique_models:
-                unique_models[model['model_id']] = model
+        logger.info(f"总共抓取到 {len(processed_models)} 个唯一AI模型")
+        return processed_models
+    
+    def harvest_models(self, pipelines: List[str], harvest_info: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+        """
+        并发收割多个pipeline的模型，按model_id流式去重
         
-        unique_models_list = list(unique_models.values())
-        logger.info(f"总共抓取到 {len(unique_models_list)} 个唯一AI模型")
+        Args:
+            pipelines: pipeline标签列表
+            harvest_info: 可选字典，按pipeline写入 iter_pipeline_models 的收割结果（供推进水位线）
+            
+        Yields:
+            未见过的原始模型数据（只含投影字段）
+        """
+        seen = set()
+        seen_lock = threading.Lock()
+        scope = current_scope()
+        
+        def harvest(pipeline_tag: str) -> List[ContentItem]:
+            # 工作线程沿用抓取任务的作用域，请求统计与水位线推进仍归属本任务
+            with use_scope(scope):
+                unique_models = []
+                info = harvest_info[pipeline_tag] if harvest_info is not None else None
+                for model in self.iter_pipeline_models(pipeline_tag, info):
+                    with seen_lock:
+                        if model['id'] in seen:
+                            continue
+                        seen.add(model['id'])
+                    unique_models.append(model)
+                return unique_models
+        
+        if harvest_info is not None:
+            for pipeline_tag in pipelines:
+                harvest_info[pipeline_tag] = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.config['concurrency']), thread_name_prefix='hf-harvest') as executor:
+            futures = {executor.submit(harvest, pipeline_tag): pipeline_tag for pipeline_tag in pipelines}
+            for future, pipeline_tag in futures.items():
+                try:
+                    models = future.result()
+                except Exception as e:
+                    logger.error(f"收割pipeline {pipeline_tag} 失败: {e}")
+                    continue
+                logger.info(f"pipeline {pipeline_tag} 收割完成，新模型 {len(models)} 个")
+                yield from models
+    
+    def iter_pipeline_models(self, pipeline_tag: str, harvest_info: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        按Link响应头中的游标逐页获取pipeline的模型，遇到水位线（或回溯时限）即停止
+        
+        不推进水位线：收割结果写入harvest_info，由调用方在筛选完成后调用 _advance_pipeline_watermark
+        
+        Args:
+            pipeline_tag: 模型类型标签
+            harvest_info: 可选字典，写入 complete（是否收割到水位线或列表末尾）与
+                harvested（产出模型的 (更新时间, model_id) 列表）
+            
+        Yields:
+            上次运行后有更新的原始模型数据
+        """
+        watermark_key = self._watermark_key(pipeline_tag, self.config['sort'])
+        sort_by_modified = self.config['sort'] == 'lastModified'
+        cutoff = None
+        if sort_by_modified and not self.watermarks.get_published_at(watermark_key):
+            cutoff = datetime.fromtimestamp(now_timestamp(), timezone.utc) - timedelta(days=self.config['lookback_days'])
+        
+        url = f"{self.base_url}/models"
+        params = {
+            'pipeline_tag': pipeline_tag,
+            'sort': self.config['sort'],
+            'direction': -1,
+            'limit': self.config['page_size'],
+            'expand[]': EXPAND_FIELDS
+        }
+        
+        skipped_count = 0
+        harvested = []
+        reached_end = False
+        if harvest_info is not None:
+            harvest_info.update(complete=False, harvested=harvested)
+        
+        for _ in range(self.config['max_pages']):
+            response = self.transport.get(url, params=params)
+            response.raise_for_status()
+            page = response.json()
+            
+            for model in page:
+                model_id = model.get('id') or model.get('modelId')
+                if not model_id:
+                    continue
+                model['id'] = model_id
+                
+                modified_at = self._parse_timestamp(model.get('lastModified', ''))
+                
+                if modified_at and not self.watermarks.is_new(watermark_key, modified_at, model_id):
+                    skipped_count += 1
+                    # 按更新时间倒序时，之后的模型都已见过
+                    if sort_by_modified:
+                        reached_end = True
+                        break
+                    continue
+                
+                if cutoff and modified_at and modified_at < cutoff:
+                    reached_end = True
+                    break
+                
+                if modified_at:
+                    harvested.append((modified_at, model_id))
+                yield model
+            
+            # 下一页的完整URL（含游标）在Link响应头中
+            next_url = response.links.get('next', {}).get('url')
+            if not page or not next_url:
+                reached_end = True
+            if reached_end:
+                break
+            url, params = next_url, None
+        
+        if not reached_end:
+            logger.warning(f"pipeline {pipeline_tag} 达到 {self.config['max_pages']} 页上限，未收割到水位线，本次不推进水位线"
+                           f"（更新量持续超过上限时请调大max_pages）")
+        
+        self.watermarks.record_skipped(watermark_key, skipped_count)
+        if harvest_info is not None:
+            harvest_info['complete'] = reached_end
+    
+    def _advance_pipeline_watermark(self, pipeline_tag: str, harvest_info: Dict):
+        """
+        收割完整时推进pipeline水位线
+        
+        只有收割到水位线或列表末尾时才推进到本次收割的最新模型；达到max_pages上限时
+        水位线与已收割部分之间还有未收割的模型，不推进
+        
+        Args:
+            pipeline_tag: 模型类型标签
+            harvest_info: iter_pipeline_models 写入的收割结果
+        """
+        if not harvest_info.get('complete') or not harvest_info['harvested']:
+            return
         
-        return unique_models_list
+        self.watermarks.advance(self._watermark_key(pipeline_tag, self.config['sort']), *max(harvest_info['harvested']))
     
-    def search_models(self, query: str, limit: int = 30) -> List[Dict]:
+    def search_models(self, query: str, limit: int = 30) -> List[ContentItem]:
         """
         搜索模型
         
@@ -254,10 +461,10 @@ class HuggingFaceFetcher:
                 'search': query,
                 'sort': 'downloads',
                 'limit': limit,
-                'full': 'true'
+                'expand[]': EXPAND_FIELDS
             }
             
-            response = self.session.get(f"{self.base_url}/models", params=params)
+            response = self.transport.get(f"{self.base_url}/models", params=params)
             response.raise_for_status()
             
             models_data = response.json()
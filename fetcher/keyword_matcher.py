@@ -0,0 +1,366 @@
+"""
+关键词匹配引擎
+关键词集合从配置构建一次并编译为 Aho-Corasick 自动机缓存，扫描文本一次返回全部命中及权重，
+供规则筛选、仓库过滤、分类检测与日报分组共用
+
+匹配规则：
+- 默认不区分大小写；集合配置 case_sensitive: true 时区分（"AI" 不命中 "said"）
+- 默认按子串匹配，与原有的 `keyword in text` 一致（"gpt" 命中 "chatgpt"，"release" 命中 "released"）
+- 集合配置 word_boundary: true 时英文关键词按词边界匹配（前后不能紧接字母或数字），
+  允许复数后缀 s/es，避免 "ai" 命中 "said"、"gan" 命中 "organ"；
+  含中日韩字符的关键词没有分词边界，始终在任意位置匹配
+"""
+
+import logging
+import re
+import threading
+from collections import deque
+from typing import Dict, Any, List, Iterable, Iterator, Tuple, Union
+
+from .config_manager import config_manager
+
+logger = logging.getLogger(__name__)
+
+# 默认关键词集合，配置文件 keyword_sets 中的同名集合会覆盖对应项
+DEFAULT_KEYWORD_SETS = {
+    # GitHub仓库AI/ML相关性过滤
+    'github_ai_repos': {
+        'keywords': [
+            'ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
+            'neural network', 'nlp', 'natural language processing', 'computer vision',
+            'cv', 'transformer', 'gpt', 'bert', 'llm', 'large language model',
+            'diffusion', 'stable diffusion', 'chatbot', 'recommendation',
+            'reinforcement learning', 'rl', 'data science', 'data mining',
+            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'opencv',
+            'huggingface', 'transformers', 'datasets', 'accelerate'
+        ]
+    },
+    # arXiv规则筛选的标题加分关键词
+    'arxiv_boost': {
+        'weight': 0.5,
+        'keywords': ['gpt', 'llm', 'transformer', 'attention', 'diffusion', 'gan', 'bert']
+    },
+    # 洞察分析失败时的简单分类（按顺序取第一个命中的类别）
+    'insight_categories': {
+        'default': 'AI技术动态',
+        'categories': {
+            '研究进展': ['paper', 'research', 'study', 'method'],
+            '产品发布': ['release', 'launch', 'announce', 'product'],
+            '技术突破': ['breakthrough', 'innovation', 'advance'],
+            '行业动态': ['industry', 'market', 'business']
+        }
+    },
+    # 日报按洞察类别分组（按顺序取第一个命中的分组）
+    'digest_sections': {
+        'default': 'other_news',
+        'categories': {
+            'tech_breakthroughs': ['突破', '创新', '技术', '研究', '论文', '学术'],
+            'product_releases': ['发布', '产品', 'launch'],
+            'industry_news': ['行业', '市场', '投资']
+        }
+    },
+    # 日报趋势、启示与展望统计的热门话题（区分大小写，"AI" 不命中 "said"）
+    'digest_topics': {
+        'case_sensitive': True,
+        'keywords': ['AI', 'GPT', 'LLM', '机器学习', '深度学习', '神经网络', '大模型', '生成式AI']
+    },
+    # 日报趋势分析统计的热门话题（区分大小写）
+    'digest_trend_topics': {
+        'case_sensitive': True,
+        'keywords': ['AI', 'GPT', 'LLM', '机器学习', '深度学习', '神经网络']
+    }
+}
+
+# RSS规则筛选的标题关键词加分（关键词取自 fallback_rules.keyword_boost）
+RSS_BOOST_WEIGHT = 0.3
+
+_CJK_PATTERN = re.compile(r'[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]')
+
+
+def _is_word_char(char: str) -> bool:
+    """词边界判断使用的字母数字（与原正则的 [0-9A-Za-z] 一致）"""
+    return char.isascii() and char.isalnum()
+
+
+class _Automaton:
+    """
+    Aho-Corasick 自动机
+
+    关键词构建为前缀树，失配指针指向当前路径的最长可匹配后缀，每个状态的输出合并失配链上的全部关键词，
+    扫描文本一次即可得到所有关键词的全部出现位置（包括重叠与互相包含的关键词，如 "gpt" 与 "chatgpt"）。
+    构建时把失配跳转展开为确定转移表，扫描每个字符只查一次字典
+    """
+
+    def __init__(self, keys: List[str]):
+        """
+        Args:
+            keys: 匹配形式的关键词，输出中的编号即列表下标
+        """
+        goto = [{}]
+        # 状态 -> ((关键词编号, 关键词长度), ...)
+        self.output = [()]
+
+        for index, key in enumerate(keys):
+            state = 0
+            for char in key:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    self.output.append(())
+                state = next_state
+            self.output[state] += ((index, len(key)),)
+
+        # 按广度优先计算失配指针与转移表：失配状态更浅，总是先于当前状态完成；
+        # 转移表只记录非根状态的目标，查不到即回到根状态
+        fail = [0] * len(goto)
+        self.delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.delta[state] = {**self.delta[fail[state]], **goto[state]}
+            for char, child in goto[state].items():
+                queue.append(child)
+                fail[child] = self.delta[fail[state]].get(char, 0)
+                self.output[child] += self.output[fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        逐个产出命中
+
+        Yields:
+            (关键词编号, 起始位置, 结束位置)
+        """
+        delta, output = self.delta, self.output
+        state = 0
+        for position, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for index, length in output[state]:
+                    yield index, end - length, end
+
+
+class KeywordMatcher:
+    """
+    编译后的关键词集合
+
+    关键词构建为一个 Aho-Corasick 自动机，无论关键词多少都只扫描文本一次；
+    子串语义与原有的 `keyword in text` 一致，互相包含的关键词各自命中（"chatgpt" 同时命中 "gpt"）。
+    词边界匹配在同一次扫描中检查命中前后的字符
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Dict[str, float]], default_weight: float = 1.0,
+                 word_boundary: bool = False, case_sensitive: bool = False):
+        """
+        编译关键词集合
+
+        Args:
+            keywords: 关键词列表，或 {关键词: 权重}
+            default_weight: 关键词列表未指定权重时使用的权重
+            word_boundary: 英文关键词是否按词边界匹配，默认按子串匹配
+            case_sensitive: 是否区分大小写
+        """
+        if not isinstance(keywords, dict):
+            keywords = {keyword: default_weight for keyword in keywords}
+
+        self.word_boundary = word_boundary
+        self.case_sensitive = case_sensitive
+
+        # 匹配形式（不区分大小写时为小写）-> 配置中的原始写法，命中结果使用原始写法
+        self.canonical = {}
+        self.weights = {}
+        for keyword, weight in keywords.items():
+            keyword = str(keyword).strip()
+            key = self._prepare(keyword)
+            if not keyword or key in self.canonical:
+                continue
+            self.canonical[key] = keyword
+            self.weights[keyword] = float(weight)
+
+        # 按关键词编号索引，编号顺序即配置顺序
+        self.keywords = list(self.canonical.values())
+        self._index_weights = [self.weights[keyword] for keyword in self.keywords]
+        # 需要检查词边界的关键词编号（含中日韩字符的关键词没有分词边界）
+        self._bounded = {
+            index for index, key in enumerate(self.canonical)
+            if word_boundary and not _CJK_PATTERN.search(key)
+        }
+        self.automaton = _Automaton(list(self.canonical))
+
+    def __len__(self) -> int:
+        return len(self.canonical)
+
+    def _prepare(self, text: str) -> str:
+        """转换为匹配形式"""
+        return text if self.case_sensitive else text.lower()
+
+    def _at_boundary(self, text: str, start: int, end: int) -> bool:
+        """命中前后是否为词边界，允许复数后缀 s/es"""
+        if start and _is_word_char(text[start - 1]):
+            return False
+        for suffix in ('', 's', 'es'):
+            if text.startswith(suffix, end):
+                after = end + len(suffix)
+                if after >= len(text) or not _is_word_char(text[after]):
+                    return True
+        return False
+
+    def _iter_prepared(self, text: str) -> Iterator[int]:
+        """在已转换为匹配形式的文本中逐个产出命中的关键词编号"""
+        bounded = self._bounded
+        for index, start, end in self.automaton.iter_matches(text):
+            if index in bounded and not self._at_boundary(text, start, end):
+                continue
+            yield index
+
+    def match(self, text: str) -> Dict[str, int]:
+        """
+        返回文本中的全部命中
+
+        Returns:
+            {关键词: 命中次数}，重叠出现分别计数
+        """
+        if not text or not self.canonical:
+            return {}
+        counts = {}
+        for index in self._iter_prepared(self._prepare(text)):
+            counts[index] = counts.get(index, 0) + 1
+        return {self.keywords[index]: counts[index] for index in sorted(counts)}
+
+    def found(self, text: str) -> List[str]:
+        """返回文本中命中的关键词，按配置顺序"""
+        if not text or not self.canonical:
+            return []
+        return [self.keywords[index] for index in sorted(set(self._iter_prepared(self._prepare(text))))]
+
+    def search(self, text: str) -> bool:
+        """文本是否命中任一关键词"""
+        if not text or not self.canonical:
+            return False
+        return self._search_prepared(self._prepare(text))
+
+    def _search_prepared(self, text: str) -> bool:
+        """在已转换为匹配形式的文本中查找任一关键词，遇到第一个命中即停止扫描"""
+        for _ in self._iter_prepared(text):
+            return True
+        return False
+
+    def score(self, text: str) -> float:
+        """命中关键词的权重之和（每个关键词只计一次）"""
+        if not text or not self.canonical:
+            return 0.0
+        weights = self._index_weights
+        return sum(weights[index] for index in set(self._iter_prepared(self._prepare(text))))
+
+
+class KeywordClassifier:
+    """
+    按关键词把文本归入有优先级的类别，按顺序返回第一个命中的类别
+
+    全部类别的关键词合并为一个自动机扫描一次，命中最高优先级类别时提前停止
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], default: str, word_boundary: bool = False,
+                 case_sensitive: bool = False):
+        """
+        Args:
+            categories: {类别: 关键词列表}，顺序即优先级
+            default: 没有命中任何类别时返回的类别
+            word_boundary: 英文关键词是否按词边界匹配
+            case_sensitive: 是否区分大小写
+        """
+        self.default = default
+        self.categories = list(categories)
+
+        # 同一关键词出现在多个类别时归入优先级最高的类别
+        keyword_category = {}
+        for rank, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                keyword_category.setdefault(str(keyword), rank)
+        self.matcher = KeywordMatcher(list(keyword_category), word_boundary=word_boundary,
+                                      case_sensitive=case_sensitive)
+        self._index_rank = [keyword_category[keyword] for keyword in self.matcher.keywords]
+
+    def classify(self, text: str) -> str:
+        """返回文本所属的类别"""
+        if not text or not self.matcher.canonical:
+            return self.default
+        best = None
+        for index in self.matcher._iter_prepared(self.matcher._prepare(text)):
+            rank = self._index_rank[index]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return self.default if best is None else self.categories[best]
+
+
+class KeywordEngine:
+    """按名称提供编译好的关键词集合，首次使用时从配置构建并缓存"""
+
+    def __init__(self):
+        self._matchers = {}
+        self._classifiers = {}
+        self._lock = threading.Lock()
+
+    def _get_definition(self, name: str) -> Dict[str, Any]:
+        """合并默认集合与配置中的同名集合"""
+        definition = dict(DEFAULT_KEYWORD_SETS.get(name, {}))
+        definition.update(config_manager.get_keyword_sets().get(name, {}) or {})
+        return definition
+
+    def matcher(self, name: str) -> KeywordMatcher:
+        """获取关键词集合对应的匹配器"""
+        with self._lock:
+            matcher = self._matchers.get(name)
+            if matcher is None:
+                definition = self._get_definition(name)
+                matcher = KeywordMatcher(definition.get('keywords', []), definition.get('weight', 1.0),
+                                         definition.get('word_boundary', False), definition.get('case_sensitive', False))
+                self._matchers[name] = matcher
+                logger.debug(f"已编译关键词集合 {name}，关键词 {len(matcher)} 个")
+            return matcher
+
+    def classifier(self, name: str) -> KeywordClassifier:
+        """获取关键词集合对应的分类器"""
+        with self._lock:
+            classifier = self._classifiers.get(name)
+            if classifier is None:
+                definition = self._get_definition(name)
+                classifier = KeywordClassifier(definition.get('categories', {}), definition.get('default', ''),
+                                               definition.get('word_boundary', False),
+                                               definition.get('case_sensitive', False))
+                self._classifiers[name] = classifier
+            return classifier
+
+    def rss_boost_matcher(self) -> KeywordMatcher:
+        """RSS规则筛选的标题加分关键词（来自 fallback_rules.keyword_boost）"""
+        with self._lock:
+            matcher = self._matchers.get('rss_boost')
+            if matcher is None:
+                keywords = config_manager.get_fallback_rules().get('keyword_boost', [])
+                matcher = KeywordMatcher(keywords, RSS_BOOST_WEIGHT)
+                self._matchers['rss_boost'] = matcher
+            return matcher
+
+    def source_priority_classifier(self) -> KeywordClassifier:
+        """RSS规则筛选的信源优先级（来自 fallback_rules.source_priority）"""
+        with self._lock:
+            classifier = self._classifiers.get('source_priority')
+            if classifier is None:
+                source_priority = config_manager.get_fallback_rules().get('source_priority', {})
+                classifier = KeywordClassifier(source_priority, '')
+                self._classifiers['source_priority'] = classifier
+            return classifier
+
+    def reset(self):
+        """清空已编译的集合，配置重新加载后调用"""
+        with self._lock:
+            self._matchers.clear()
+            self._classifiers.clear()
+
+
+# 全局关键词引擎实例
+keyword_engine = KeywordEngine()
@@ -0,0 +1,257 @@
+"""
+Web爬虫列表页指纹
+列表页的响应体常因脚本、随机数、推荐位等变化而无法命中条件请求的内容哈希，
+这里只对解析出的文章列表（URL与标题）做指纹：列表未变化时整个信源直接跳过，
+列表变化时只有未处理过、且不在 raw_content 中的文章才需要抓取详情页
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Iterable
+
+from .content_normalizer import collapse_whitespace
+from .task_scope import current_scope
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_listing(entries: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """规范化文章列表：合并标题空白，按URL去重并保留顺序"""
+    listing = {}
+    for url, title in entries:
+        if url and url not in listing:
+            listing[url] = collapse_whitespace(title or '')
+    return list(listing.items())
+
+
+def listing_hash(listing: List[Tuple[str, str]]) -> str:
+    """规范化文章列表的SHA-256"""
+    digest = hashlib.sha256()
+    for url, title in listing:
+        digest.update(f"{url}\t{title}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ListingDiff:
+    """一次列表页检查的结果"""
+
+    def __init__(self, source_url: str, listing: List[Tuple[str, str]], listing_hash: str,
+                 known_urls: set, new_urls: List[str]):
+        self.source_url = source_url
+        self.listing = listing
+        self.listing_hash = listing_hash
+        self.known_urls = known_urls  # 列表中已处理或已入库的文章
+        self.new_urls = new_urls      # 需要处理的文章，保持列表顺序
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.new_urls and self.listing_hash is None
+
+
+class ListingFingerprintStore:
+    """Web爬虫列表页指纹存储"""
+
+    def __init__(self):
+        self._fingerprints = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.reset_run_stats()
+
+    def _ensure_loaded(self):
+        """首次使用时从数据库加载全部指纹"""
+        if self._fingerprints is not None:
+            return
+
+        # 延迟导入，避免仅导入fetcher包时就连接数据库
+        from models import SessionLocal, SourceListingFingerprint, get_engine
+
+        fingerprints = {}
+        try:
+            SourceListingFingerprint.__table__.create(bind=get_engine(), checkfirst=True)
+
+            session = SessionLocal()
+            try:
+                for row in session.query(SourceListingFingerprint).all():
+                    fingerprints[row.source_url] = {
+                        'listing_hash': row.listing_hash,
+                        'article_urls': set(json.loads(row.article_urls or '[]')),
+                        'last_checked_at': row.last_checked_at
+                    }
+            finally:
+                session.close()
+
+            logger.info(f"加载 {len(fingerprints)} 个列表页指纹")
+
+        except Exception as e:
+            logger.error(f"加载列表页指纹失败: {e}")
+
+        self._fingerprints = fingerprints
+
+    def diff(self, source_url: str, entries: Iterable[Tuple[str, str]]) -> ListingDiff:
+        """
+        对比列表页与上次的指纹
+
+        Args:
+            source_url: 列表页URL
+            entries: 列表页解析出的 [(文章URL, 标题), ...]
+
+        Returns:
+            ListingDiff；列表未变化时 unchanged 为真，否则 new_urls 为需要处理的文章
+        """
+        listing = normalize_listing(entries)
+        current_hash = listing_hash(listing)
+
+        with self._lock:
+            self._ensure_loaded()
+            fingerprint = self._fingerprints.get(source_url) or {}
+            previous_urls = set(fingerprint.get('article_urls') or ())
+
+            if listing and fingerprint.get('listing_hash') == current_hash:
+                self.run_stats['unchanged_listings'] += 1
+                self.run_stats['skipped_sources'].append(source_url)
+                return ListingDiff(source_url, listing, None, {url for url, _ in listing}, [])
+
+        urls = [url for url, _ in listing]
+        known_urls = {url for url in urls if url in previous_urls}
+        candidates = [url for url in urls if url not in known_urls]
+
+        # 上次未处理的文章可能已由其他途径入库（如首次启用指纹前），只对候选URL查一次库
+        if candidates:
+            stored_urls = self._find_stored_urls(candidates)
+            known_urls.update(stored_urls)
+            candidates = [url for url in candidates if url not in stored_urls]
+
+        with self._lock:
+            self.run_stats['changed_listings'] += 1
+            self.run_stats['known_articles'] += len(known_urls)
+            self.run_stats['new_articles'] += len(candidates)
+
+        return ListingDiff(source_url, listing, current_hash, known_urls, candidates)
+
+    def _find_stored_urls(self, urls: List[str]) -> set:
+        """查询已存入 raw_content 的文章URL"""
+        from models import SessionLocal, RawContent
+
+        session = SessionLocal()
+        try:
+            rows = session.query(RawContent.url).filter(RawContent.url.in_(urls)).all()
+            return {row.url for row in rows}
+        except Exception as e:
+            logger.warning(f"查询已入库文章失败: {e}")
+            return set()
+        finally:
+            session.close()
+
+    def record(self, diff: ListingDiff, processed_urls: Iterable[str]) -> bool:
+        """
+        记录列表页指纹
+
+        列表中仍有未处理的文章（如详情页抓取失败）时不记录列表哈希，下次运行会重新检查这些文章
+
+        Args:
+            diff: diff() 的结果
+            processed_urls: 本次成功处理的文章URL
+
+        Returns:
+            列表中的文章是否都已处理（列表未变化时为真）
+        """
+        if diff.unchanged:
+            return True
+
+        known_urls = diff.known_urls | set(processed_urls)
+        complete = all(url in known_urls for url, _ in diff.listing)
+        updates = {
+            'listing_hash': diff.listing_hash if complete else None,
+            'article_urls': {url for url, _ in diff.listing if url in known_urls},
+            'last_checked_at': datetime.now()
+        }
+
+        # 在抓取任务中执行时，待任务结果被采纳后再更新指纹
+        scope = current_scope()
+        if scope is not None:
+            scope.defer(self._apply_updates, diff.source_url, updates)
+        else:
+            self._apply_updates(diff.source_url, updates)
+        return complete
+
+    def _apply_updates(self, source_url: str, updates: Dict[str, Any]):
+        """更新内存中的指纹并标记待保存"""
+        with self._lock:
+            self._ensure_loaded()
+            self._fingerprints.setdefault(source_url, {}).update(updates)
+            self._dirty.add(source_url)
+
+    def save(self) -> int:
+        """
+        将本次运行中更新的指纹写入数据库
+
+        应在抓取内容成功入库后调用，避免内容丢失时文章已被记为处理过
+
+        Returns:
+            写入的指纹数量
+        """
+        with self._lock:
+            if not self._dirty or self._fingerprints is None:
+                return 0
+            dirty = {url: dict(self._fingerprints[url]) for url in self._dirty}
+            self._dirty = set()
+
+        from models import SessionLocal, SourceListingFingerprint
+
+        session = SessionLocal()
+        try:
+            existing = {
+                row.source_url: row
+                for row in session.query(SourceListingFingerprint).filter(
+                    SourceListingFingerprint.source_url.in_(list(dirty.keys()))
+                ).all()
+            }
+
+            for source_url, fingerprint in dirty.items():
+                row = existing.get(source_url)
+                if row is None:
+                    row = SourceListingFingerprint(source_url=source_url)
+                    session.add(row)
+                row.listing_hash = fingerprint.get('listing_hash')
+                row.article_urls = json.dumps(sorted(fingerprint.get('article_urls') or ()), ensure_ascii=False)
+                row.last_checked_at = fingerprint.get('last_checked_at')
+
+            session.commit()
+            logger.info(f"保存 {len(dirty)} 个列表页指纹")
+            return len(dirty)
+
+        except Exception as e:
+            logger.error(f"保存列表页指纹失败: {e}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
+    def reset_run_stats(self):
+        """重置本次运行的统计"""
+        self.run_stats = {
+            'skipped_sources': [],
+            'unchanged_listings': 0,
+            'changed_listings': 0,
+            'known_articles': 0,
+            'new_articles': 0
+        }
+
+    def get_run_summary(self) -> Dict[str, Any]:
+        """获取本次运行的列表页指纹统计"""
+        with self._lock:
+            summary = dict(self.run_stats)
+            summary['skipped_sources'] = list(self.run_stats['skipped_sources'])
+            return summary
+
+
+# 全局列表页指纹实例
+listing_fingerprint_store = ListingFingerprintStore()
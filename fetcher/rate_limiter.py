@@ -0,0 +1,141 @@
+"""
+按主机限流器
+基于令牌桶为每个目标主机提供可配置的速率与突发量，替代固定的随机延迟
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from .config_manager import config_manager
+
+logger = logging.getLogger(__name__)
+
+# 未单独配置的主机使用的默认速率（请求/秒）与突发量，可由 performance.rate_limits.default 覆盖
+DEFAULT_RATE_LIMIT = {'rate': 2.0, 'burst': 4}
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: 令牌补充速率（请求/秒）
+            burst: 桶容量，即允许的最大突发请求数
+        """
+        if rate <= 0:
+            raise ValueError(f"无效的限流速率: {rate}")
+
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """预定一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+            # 令牌允许透支：透支部分即排在前面的请求，按顺序等待补充
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def _cancel(self):
+        """归还一个已预定但未使用的令牌"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        获取一个令牌，必要时阻塞等待
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            是否成功获取令牌
+        """
+        wait = self._reserve()
+        if timeout is not None and wait > timeout:
+            self._cancel()
+            return False
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class HostRateLimiter:
+    """按主机限流器"""
+
+    def __init__(self, rate_limit_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化限流器
+
+        Args:
+            rate_limit_config: 限流配置，默认读取 performance.rate_limits
+        """
+        config = rate_limit_config or config_manager.get_performance_config().get('rate_limits', {}) or {}
+
+        self.default_limit = dict(DEFAULT_RATE_LIMIT)
+        self.default_limit.update(config.get('default', {}) or {})
+        self.host_limits = {host.lower(): limit for host, limit in (config.get('hosts', {}) or {}).items()}
+
+        self.enabled = True
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._wait_stats = {}
+
+    def _resolve_limit(self, host: str) -> Dict[str, Any]:
+        """查找主机的限流配置，支持按父域名匹配"""
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            candidate = '.'.join(parts[i:])
+            if candidate in self.host_limits:
+                limit = dict(self.default_limit)
+                limit.update(self.host_limits[candidate])
+                return limit
+        return self.default_limit
+
+    def get_bucket(self, host: str) -> TokenBucket:
+        """获取主机对应的令牌桶"""
+        host = (host or '').lower().split(':')[0]
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limit = self._resolve_limit(host)
+                bucket = TokenBucket(limit['rate'], limit['burst'])
+                self._buckets[host] = bucket
+                logger.debug(f"创建主机限流器 {host}: {limit['rate']} 请求/秒，突发 {limit['burst']}")
+            return bucket
+
+    def acquire(self, host: str, timeout: Optional[float] = None) -> bool:
+        """为目标主机获取一个请求令牌"""
+        if not self.enabled:
+            return True
+        start = time.monotonic()
+        acquired = self.get_bucket(host).acquire(timeout)
+        self._record_wait(host, time.monotonic() - start)
+        return acquired
+
+    def _record_wait(self, host: str, waited: float):
+        """记录限流等待时间"""
+        with self._lock:
+            self._wait_stats[host] = self._wait_stats.get(host, 0.0) + waited
+
+    def get_wait_stats(self) -> Dict[str, float]:
+        """获取各主机累计的限流等待秒数"""
+        with self._lock:
+            return dict(self._wait_stats)
+
+
+# 全局限流器实例
+rate_limiter = HostRateLimiter()
@@ -3,14 +3,16 @@ RSS源数据抓取器
 负责抓取各种RSS源的最新AI相关内容
 """
 
-import feedparser
-import requests
 from datetime import datetime
 from typing import List, Dict, Optional
 import logging
 from bs4 import BeautifulSoup
-import time
-import random
+
+from .content_item import ContentItem
+from .http_transport import http_transport
+from .fetch_state import fetch_state_store
+from .watermark_store import watermark_store, normalize_datetime
+from .feed_parser import feed_parse_pool
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -21,12 +23,12 @@ class RSSFetcher:
     """RSS源数据抓取器"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.transport = http_transport
+        self.fetch_state = fetch_state_store
+        self.watermarks = watermark_store
+        self.parse_pool = feed_parse_pool
     
-    def fetch_rss_feed(self, feed_url: str, source_name: str) -> List[Dict]:
+    def fetch_rss_feed(self, feed_url: str, source_name: str) -> List[ContentItem]:
         """
         抓取单个RSS源
         
@@ -40,59 +42,101 @@ class RSSFetcher:
         try:
             logger.info(f"开始抓取RSS源: {source_name} ({feed_url})")
             
-            # 添加随机延迟避免被反爬
-            time.sleep(random.uniform(1, 3))
-            
-            # 解析RSS源
-            feed = feedparser.parse(feed_url)
-            
-            if feed.bozo:
+            # 第一阶段：通过共享连接池下载原始字节（携带ETag/Last-Modified条件请求头）
+            response = self.transport.get(
+                feed_url,
+                headers=self.fetch_state.get_conditional_headers(feed_url)
+            )
+            response.raise_for_status()
+            
+            state_check = self.fetch_state.check(feed_url, response)
+            if state_check.unchanged:
+                logger.info(f"RSS源未变化，跳过解析: {source_name}")
+                return []
+            
+            # 第二阶段：在解析进程池中解析，返回紧凑的条目记录
+            feed = self.parse_pool.parse(
+                response.content,
+                content_location=response.url,
+                content_type=response.headers.get('Content-Type', ''),
+                max_entries=20  # 限制最新20篇文章
+            )
+            
+            if feed['bozo']:
                 logger.warning(f"RSS源解析异常: {source_name}")
             
             articles = []
+            skipped_count = 0
+            watermark_key = f"rss:{feed_url}"
+            newest = None  # 本次见到的最新 (发布时间, 链接)，全部处理完后再推进水位线
             
-            for entry in feed.entries[:20]:  # 限制最新20篇文章
+            for entry in feed['entries']:
                 try:
+                    # 只有成功解析的发布时间才参与水位线比较，无法解析时交给入库去重
+                    exact_published_at = self._try_parse_date(entry['published'])
+                    if exact_published_at and (newest is None or normalize_datetime(exact_published_at) > newest[0]):
+                        newest = (normalize_datetime(exact_published_at), entry['link'])
+                    
+                    if exact_published_at and not self.watermarks.is_new(watermark_key, exact_published_at, entry['link']):
+                        skipped_count += 1
+                        continue
+                    
+                    published_at = exact_published_at or self._parse_date(entry['published'])
+                    
                     # 提取文章信息
-                    article = {
-                        'title': entry.get('title', ''),
-                        'content': self._extract_content(entry),
-                        'url': entry.get('link', ''),
-                        'published_at': self._parse_date(entry.get('published', '')),
-                        'source_name': source_name,
-                        'source_type': 'rss'
-                    }
+                    article = ContentItem(
+                        title=entry['title'],
+                        content=entry['content'],
+                        url=entry['link'],
+                        published_at=published_at,
+                        source_name=source_name,
+                        source_type='rss'
+                    )
                     
                     # 过滤掉标题或内容为空的文章
-                    if article['title'] and article['content']:
+                    if article.title and article.content:
                         articles.append(article)
                         
                 except Exception as e:
                     logger.error(f"处理文章时出错: {e}")
                     continue
             
-            logger.info(f"成功抓取 {len(articles)} 篇文章来自 {source_name}")
+            if newest:
+                self.watermarks.advance(watermark_key, *newest)
+            self.watermarks.record_skipped(watermark_key, skipped_count)
+            
+            # 解析成功后才记录内容哈希，解析失败的响应下次运行会重新解析
+            if feed['entries'] or not feed['bozo']:
+                state_check.confirm()
+            
+            logger.info(f"成功抓取 {len(articles)} 篇文章来自 {source_name}（水位线跳过 {skipped_count} 篇）")
             return articles
             
         except Exception as e:
             logger.error(f"抓取RSS源失败 {source_name}: {e}")
             return []
     
-    def _extract_content(self, entry) -> str:
-        """提取文章内容"""
-        # 优先使用content字段
-        if hasattr(entry, 'content') and entry.content:
-            return entry.content[0].value
-        
-        # 使用summary字段
-        if hasattr(entry, 'summary'):
-            return entry.summary
-        
-        # 使用description字段
-        if hasattr(entry, 'description'):
-            return entry.description
+    # 支持的日期格式
+    DATE_FORMATS = [
+        '%a, %d %b %Y %H:%M:%S %z',  # RFC 822
+        '%a, %d %b %Y %H:%M:%S %Z',  # RFC 822 with timezone name
+        '%Y-%m-%dT%H:%M:%S%z',       # ISO 8601
+        '%Y-%m-%dT%H:%M:%S',         # ISO 8601 without timezone
+        '%Y-%m-%d %H:%M:%S',         # Common format
+        '%Y-%m-%d'                    # Date only
+    ]
+    
+    def _try_parse_date(self, date_str: str) -> Optional[datetime]:
+        """按支持的格式解析日期字符串，失败返回None"""
+        if not date_str:
+            return None
         
-        return ""
+        for fmt in self.DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
+        return None
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """解析日期字符串"""
@@ -100,21 +144,9 @@ class RSSFetcher:
             return None
         
         try:
-            # 尝试多种日期格式
-            date_formats = [
-                '%a, %d %b %Y %H:%M:%S %z',  # RFC 822
-                '%a, %d %b %Y %H:%M:%S %Z',  # RFC 822 with timezone name
-                '%Y-%m-%dT%H:%M:%S%z',       # ISO 8601
-                '%Y-%m-%dT%H:%M:%S',         # ISO 8601 without timezone
-                '%Y-%m-%d %H:%M:%S',         # Common format
-                '%Y-%m-%d'                    # Date only
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
+            parsed = self._try_parse_date(date_str)
+            if parsed:
+                return parsed
             
             # 如果都失败了，使用当前时间
             logger.warning(f"无法解析日期: {date_str}，使用当前时间")
@@ -124,7 +156,7 @@ class RSSFetcher:
             logger.error(f"日期解析失败: {date_str}, 错误: {e}")
             return datetime.now()
     
-    def fetch_multiple_feeds(self, feed_configs: List[Dict]) -> List[Dict]:
+    def fetch_multiple_feeds(self, feed_configs: List[Dict]) -> List[ContentItem]:
         """
         批量抓取多个RSS源
         
@@ -0,0 +1,254 @@
+"""
+Web爬虫抓取规则
+每个列表页一条规则（条目容器、标题、链接、内容、日期的XPath），保存在 scrape_rule 表中，
+编译为 lxml XPath 对象后缓存，规则未修改时跨运行复用；新增网站只需添加规则，无需改代码
+"""
+
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from .content_normalizer import collapse_whitespace
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+# 默认抓取规则（列表页URL -> 规则），数据库中同一URL的规则优先。
+# 容器XPath在列表页上求值，其余XPath相对于每个容器求值
+DEFAULT_SCRAPE_RULES = {
+    'https://www.anthropic.com/index': {
+        'container_xpath': "//a[contains(@href, '/news') or contains(@href, '/blog') or contains(@href, '/research')]",
+        'title_xpath': ".",
+        'link_xpath': "@href",
+        'follow_links': True,
+        'title_prefix': 'Anthropic',
+        'max_items': 10
+    },
+    'https://mistral.ai/news/': {
+        'container_xpath': "//*[self::article or self::div]"
+                           "[contains(@class, 'news') or contains(@class, 'article') or contains(@class, 'post')]",
+        'title_xpath': "(.//h1 | .//h2 | .//h3 | .//h4)[1]",
+        'link_xpath': "(.//a/@href)[1]",
+        'content_xpath': "(.//*[self::p or self::div]"
+                         "[contains(@class, 'summary') or contains(@class, 'excerpt') or contains(@class, 'description')])[1]",
+        'title_prefix': 'Mistral AI',
+        'max_items': 10
+    },
+    'https://www.producthunt.com/topics/artificial-intelligence': {
+        'container_xpath': "//*[self::div or self::article]"
+                           "[contains(@class, 'product') or contains(@class, 'item') or contains(@class, 'card')]",
+        'title_xpath': "(.//h3 | .//h4 | .//h5)[1]",
+        'link_xpath': "(.//a/@href)[1]",
+        'content_xpath': "(.//*[self::p or self::div][contains(@class, 'description') or contains(@class, 'tagline')])[1]",
+        'title_prefix': 'Product Hunt AI产品',
+        'max_items': 15
+    },
+    'https://a16z.com/category/ai/': {
+        'container_xpath': "//*[self::article or self::div]"
+                           "[contains(@class, 'post') or contains(@class, 'article') or contains(@class, 'entry')]",
+        'title_xpath': "(.//h1 | .//h2 | .//h3 | .//h4)[1]",
+        'link_xpath': "(.//a/@href)[1]",
+        'content_xpath': "(.//*[self::p or self::div]"
+                         "[contains(@class, 'excerpt') or contains(@class, 'summary') or contains(@class, 'description')])[1]",
+        'date_xpath': "(.//time/@datetime)[1]",
+        'title_prefix': 'A16Z AI',
+        'max_items': 10
+    }
+}
+
+# 规则字段默认值
+RULE_DEFAULTS = {
+    'title_xpath': "(.//h1 | .//h2 | .//h3)[1]",
+    'link_xpath': "(.//a/@href)[1]",
+    'content_xpath': None,
+    'date_xpath': None,
+    'detail_content_xpath': None,
+    'follow_links': False,
+    'title_prefix': None,
+    'max_items': 20
+}
+
+_XPATH_FIELDS = ('container_xpath', 'title_xpath', 'link_xpath', 'content_xpath', 'date_xpath', 'detail_content_xpath')
+
+
+def parse_datetime(text: str) -> Optional[datetime]:
+    """解析页面中的日期（ISO 8601 或 RFC 2822），无法解析时返回None"""
+    text = (text or '').strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _xpath_text(xpath: etree.XPath, node) -> str:
+    """求值相对XPath并转为文本：节点取全部文字，属性与字符串结果直接使用"""
+    result = xpath(node)
+    if isinstance(result, list):
+        if not result:
+            return ''
+        result = result[0]
+    if isinstance(result, etree._Element):
+        return collapse_whitespace(result.text_content())
+    return collapse_whitespace(str(result))
+
+
+class CompiledScrapeRule:
+    """编译后的抓取规则"""
+
+    def __init__(self, source_url: str, rule: Dict[str, Any]):
+        """
+        Args:
+            source_url: 列表页URL
+            rule: 规则字段，缺少的字段使用 RULE_DEFAULTS
+
+        Raises:
+            etree.XPathSyntaxError: XPath无法编译
+        """
+        rule = {**RULE_DEFAULTS, **{key: value for key, value in rule.items() if value is not None}}
+        self.source_url = source_url
+        self.follow_links = bool(rule['follow_links'])
+        self.title_prefix = rule['title_prefix']
+        self.max_items = int(rule['max_items'])
+
+        for field in _XPATH_FIELDS:
+            expression = rule.get(field)
+            setattr(self, field[:-len('_xpath')], etree.XPath(expression) if expression else None)
+
+        if self.container is None:
+            raise ValueError("缺少条目容器XPath")
+
+    def extract(self, root, base_url: str) -> List[Dict[str, Any]]:
+        """
+        从列表页中提取条目
+
+        Args:
+            root: lxml解析后的列表页
+            base_url: 用于解析相对链接的页面URL
+
+        Returns:
+            [{'title', 'url', 'content', 'published_at'}, ...]，按URL去重，最多 max_items 条
+        """
+        entries = {}
+        for node in self.container(root):
+            if len(entries) >= self.max_items:
+                break
+            try:
+                title = _xpath_text(self.title, node)
+                href = _xpath_text(self.link, node)
+                if not title or not href:
+                    continue
+
+                url = urljoin(base_url, href)
+                if url in entries:
+                    continue
+
+                entries[url] = {
+                    'title': title,
+                    'url': url,
+                    'content': _xpath_text(self.content, node) if self.content is not None else '',
+                    'published_at': parse_datetime(_xpath_text(self.date, node)) if self.date is not None else None
+                }
+            except Exception as e:
+                logger.error(f"处理列表条目失败 {self.source_url}: {e}")
+                continue
+
+        return list(entries.values())
+
+
+class ScrapeRuleRegistry:
+    """按列表页URL提供编译好的抓取规则"""
+
+    def __init__(self):
+        self._rules = None
+        # 列表页URL -> (规则版本, 编译后的规则)，规则未修改时跨运行复用
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """首次使用时从数据库加载全部规则，数据库中的规则覆盖默认规则"""
+        if self._rules is not None:
+            return
+
+        rules = {url: (None, dict(rule)) for url, rule in DEFAULT_SCRAPE_RULES.items()}
+
+        # 延迟导入，避免仅导入fetcher包时就连接数据库
+        from models import SessionLocal, ScrapeRule, get_engine
+
+        try:
+            ScrapeRule.__table__.create(bind=get_engine(), checkfirst=True)
+
+            session = SessionLocal()
+            try:
+                for row in session.query(ScrapeRule).all():
+                    if not row.is_active:
+                        # 停用的规则同时屏蔽同一URL的默认规则
+                        rules[row.source_url] = (row.updated_at, None)
+                        continue
+                    rules[row.source_url] = (row.updated_at, {
+                        'container_xpath': row.container_xpath,
+                        'title_xpath': row.title_xpath,
+                        'link_xpath': row.link_xpath,
+                        'content_xpath': row.content_xpath,
+                        'date_xpath': row.date_xpath,
+                        'detail_content_xpath': row.detail_content_xpath,
+                        'follow_links': row.follow_links,
+                        'title_prefix': row.title_prefix,
+                        'max_items': row.max_items
+                    })
+            finally:
+                session.close()
+
+        except Exception as e:
+            logger.error(f"加载抓取规则失败: {e}")
+
+        self._rules = rules
+
+    def get(self, source_url: str) -> Optional[CompiledScrapeRule]:
+        """
+        获取列表页的抓取规则
+
+        Returns:
+            编译后的规则；没有规则、规则已停用或无法编译时返回None
+        """
+        with self._lock:
+            self._ensure_loaded()
+            version, rule = self._rules.get(source_url, (None, None))
+            if rule is None:
+                return None
+
+            cached = self._compiled.get(source_url)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            try:
+                compiled = CompiledScrapeRule(source_url, rule)
+            except (etree.XPathSyntaxError, KeyError, TypeError, ValueError) as e:
+                logger.error(f"抓取规则无法编译 {source_url}: {e}")
+                compiled = None
+
+            self._compiled[source_url] = (version, compiled)
+            return compiled
+
+    def reset(self):
+        """下次使用时重新加载规则，只有修改过的规则会重新编译"""
+        with self._lock:
+            self._rules = None
+
+
+# 全局抓取规则实例
+scrape_rule_registry = ScrapeRuleRegistry()
@@ -0,0 +1,89 @@
+"""
+抓取任务作用域
+在执行抓取任务的线程上记录请求结果，并暂存任务对增量状态的修改，
+只有任务结果被采纳后才提交，超时被放弃的任务不会推进水位线或条件请求状态
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+_local = threading.local()
+
+
+class TaskScope:
+    """单个抓取任务的作用域"""
+
+    def __init__(self, name: str = '', deadline: Optional[float] = None):
+        """
+        Args:
+            name: 任务名称
+            deadline: 任务必须结束的时间戳，共享传输层据此限制每次请求的超时
+        """
+        self.name = name
+        self.deadline = deadline
+        self.requests = 0
+        self.failures = 0
+        self.last_error = None
+        self._deferred = []
+        self._lock = threading.Lock()
+
+    def record_request(self, failed: bool, error: Optional[str] = None):
+        """记录一次HTTP请求的结果"""
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.failures += 1
+                self.last_error = error
+
+    def remaining(self) -> Optional[float]:
+        """距离任务时限的剩余秒数，没有时限时返回None"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
+
+    @property
+    def all_requests_failed(self) -> bool:
+        """任务发出了请求且全部失败"""
+        return self.requests > 0 and self.failures == self.requests
+
+    def defer(self, func: Callable, *args, **kwargs):
+        """暂存一个状态修改，待任务结果被采纳后执行"""
+        with self._lock:
+            self._deferred.append((func, args, kwargs))
+
+    def commit(self):
+        """执行暂存的状态修改"""
+        with self._lock:
+            deferred, self._deferred = self._deferred, []
+        for func, args, kwargs in deferred:
+            func(*args, **kwargs)
+
+    def discard(self):
+        """丢弃暂存的状态修改"""
+        with self._lock:
+            self._deferred = []
+
+
+def current_scope() -> Optional[TaskScope]:
+    """获取当前线程的任务作用域，不在任务中执行时返回None"""
+    return getattr(_local, 'scope', None)
+
+
+@contextmanager
+def task_scope(name: str = '', deadline: Optional[float] = None):
+    """在当前线程上开启任务作用域"""
+    with use_scope(TaskScope(name, deadline)) as scope:
+        yield scope
+
+
+@contextmanager
+def use_scope(scope: Optional[TaskScope]):
+    """在当前线程上使用已有的任务作用域，任务内部再并发执行时用于把作用域带到工作线程"""
+    previous = current_scope()
+    _local.scope = scope
+    try:
+        yield scope
+    finally:
+        _local.scope = previous
@@ -4,13 +4,23 @@ Twitter数据抓取器
 """
 
 import tweepy
+import functools
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
-import time
-import random
+
+from .config_manager import config_manager
+from .content_item import ContentItem
+from .rate_limiter import rate_limiter
+from .watermark_store import watermark_store
+from .cassette import attach_session
+from .task_scope import current_scope, use_scope
+from .twitter_scheduler import twitter_scheduler, RateLimitDeferred
 
 # 加载环境变量
 load_dotenv()
@@ -19,10 +29,92 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 等待限流窗口重置后，留给剩余账号请求的秒数
+RATE_LIMIT_RESUME_RESERVE = 15
+
+# 默认Twitter抓取配置
+DEFAULT_TWITTER_CONFIG = {
+    # 关注的AI影响者账号
+    'accounts': [
+        'karpathy',      # Andrej Karpathy
+        'ylecun',        # Yann LeCun
+        'AndrewYNg',     # Andrew Ng
+        'sama',          # Sam Altman
+        'gdb',           # Geoffrey Hinton
+        'jasonwei',      # Jason Wei
+        'JimFan',        # Jim Fan
+        '_akhaliq',      # Aran Komatsuzaki
+        'rowancheung',   # Rowan Cheung
+        'alexandra_amos', # Alexandra Amos
+        'mckaywrigley',  # McKay Wrigley
+        'lennysan'       # Lenny Rachitsky
+    ],
+    'tweets_per_account': 10,                       # 每个账号每次最多获取的推文数（5-100）
+    'list_max_tweets': 300,                         # 每个List每次最多获取的推文数（按每页100条翻页）
+    'search_max_tweets': 100,                       # 热门话题搜索每次最多获取的推文数
+    'concurrency': 4,                               # 同时请求的账号数，实际速率仍受 api.twitter.com 限流约束
+    'user_id_cache': '.cache/twitter_user_ids.json'  # 用户名 -> 用户ID 的持久化缓存
+}
+
+# get_users 单次最多解析的用户名数
+USERS_LOOKUP_BATCH_SIZE = 100
+
+
+class UserIdCache:
+    """用户名到用户ID的磁盘缓存，用户ID不会变化，解析一次后长期有效"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._ids = None
+        self._lock = threading.Lock()
+    
+    def _ensure_loaded(self):
+        if self._ids is not None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._ids = json.load(f)
+        except FileNotFoundError:
+            self._ids = {}
+        except Exception as e:
+            logger.warning(f"读取Twitter用户ID缓存失败: {e}")
+            self._ids = {}
+    
+    def get_many(self, usernames: List[str]) -> Dict[str, str]:
+        """返回已缓存的 {用户名(小写): 用户ID}"""
+        with self._lock:
+            self._ensure_loaded()
+            return {name.lower(): self._ids[name.lower()] for name in usernames if name.lower() in self._ids}
+    
+    def update(self, ids: Dict[str, str]):
+        """写入新解析的用户ID"""
+        if not ids:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._ids.update({name.lower(): str(user_id) for name, user_id in ids.items()})
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._ids, f, ensure_ascii=False, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"写入Twitter用户ID缓存失败: {e}")
+
 
 class TwitterFetcher:
     """Twitter数据抓取器"""
     
+    # tweepy使用独立的HTTP会话，调用前需手动向限流器申请令牌
+    API_HOST = "api.twitter.com"
+    
+    # 各接口的限流窗口标识（见 twitter_scheduler.endpoint_key）
+    USERS_LOOKUP_ENDPOINT = "GET /2/users/by"
+    USER_TWEETS_ENDPOINT = "GET /2/users/:id/tweets"
+    SEARCH_ENDPOINT = "GET /2/tweets/search/recent"
+    LIST_TWEETS_ENDPOINT = "GET /2/lists/:id/tweets"
+    
     def __init__(self):
         """初始化Twitter抓取器"""
         # 加载Twitter API配置
@@ -31,6 +123,12 @@ class TwitterFetcher:
         self.api_secret = os.getenv('TWITTER_API_SECRET')
         self.access_token = os.getenv('TWITTER_ACCESS_TOKEN')
         self.access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+        self.watermarks = watermark_store
+        
+        self.config = DEFAULT_TWITTER_CONFIG.copy()
+        self.config.update(config_manager.get_performance_config().get('twitter', {}) or {})
+        self.user_ids = UserIdCache(self.config['user_id_cache'])
+        self.scheduler = twitter_scheduler
         
         # 检查配置完整性
         if not all([self.bearer_token, self.api_key, self.api_secret, 
@@ -41,19 +139,27 @@ class TwitterFetcher:
         else:
             try:
                 # 初始化Twitter API v2客户端
+                # 不在客户端内部等待限流窗口（会让抓取线程睡眠最长15分钟），由调度器决定等待或推迟
                 self.client = tweepy.Client(
                     bearer_token=self.bearer_token,
                     consumer_key=self.api_key,
                     consumer_secret=self.api_secret,
                     access_token=self.access_token,
                     access_token_secret=self.access_token_secret,
-                    wait_on_rate_limit=True
+                    wait_on_rate_limit=False
                 )
                 
                 # 初始化Twitter API v1.1（用于某些高级功能）
                 auth = tweepy.OAuthHandler(self.api_key, self.api_secret)
                 auth.set_access_token(self.access_token, self.access_token_secret)
-                self.api = tweepy.API(auth, wait_on_rate_limit=True)
+                self.api = tweepy.API(auth, wait_on_rate_limit=False)
+                
+                # tweepy使用独立的HTTP会话，录制/回放模式下同样需要接管
+                attach_session(self.client.session)
+                attach_session(self.api.session)
+                
+                # 从每个响应的限流响应头记录窗口状态
+                self.client.session.hooks['response'].append(self.scheduler.observe)
                 
                 logger.info("Twitter API客户端初始化成功")
                 
@@ -66,13 +172,55 @@ class TwitterFetcher:
         """检查Twitter API是否可用"""
         return self.client is not None and self.api is not None
     
-    def fetch_user_tweets(self, username: str, count: int = 20) -> List[Dict]:
+    def resolve_user_ids(self, usernames: List[str]) -> Dict[str, str]:
+        """
+        批量解析用户名对应的用户ID，优先使用磁盘缓存，未缓存的每100个调用一次 get_users
+        
+        Args:
+            usernames: Twitter用户名列表（不含@）
+            
+        Returns:
+            {用户名(小写): 用户ID}，未找到的用户不在结果中
+        """
+        resolved = self.user_ids.get_many(usernames)
+        missing = list(dict.fromkeys(name for name in usernames if name.lower() not in resolved))
+        if not missing or not self.is_available():
+            return resolved
+        
+        logger.info(f"批量解析 {len(missing)} 个Twitter用户ID（已缓存 {len(resolved)} 个）")
+        
+        new_ids = {}
+        for start in range(0, len(missing), USERS_LOOKUP_BATCH_SIZE):
+            batch = missing[start:start + USERS_LOOKUP_BATCH_SIZE]
+            try:
+                rate_limiter.acquire(self.API_HOST)
+                response = self.scheduler.call(self.USERS_LOOKUP_ENDPOINT, self.client.get_users, usernames=batch)
+                
+                for user in response.data or []:
+                    new_ids[user.username.lower()] = str(user.id)
+                
+                for error in response.errors or []:
+                    logger.warning(f"未找到Twitter用户: {error.get('value', '')} ({error.get('detail', '')})")
+                    
+            except RateLimitDeferred as e:
+                logger.warning(f"批量解析Twitter用户ID暂停，{len(missing) - start} 个用户留待之后解析: {e}")
+                break
+            except Exception as e:
+                logger.error(f"批量解析Twitter用户ID失败: {e}")
+                continue
+        
+        self.user_ids.update(new_ids)
+        resolved.update(new_ids)
+        return resolved
+    
+    def fetch_user_tweets(self, username: str, count: int = 20, user_id: Optional[str] = None) -> List[ContentItem]:
         """
         获取指定用户的推文
         
         Args:
             username: Twitter用户名（不含@）
             count: 获取推文数量
+            user_id: 已解析的用户ID，为None时先查询用户ID缓存
             
         Returns:
             推文列表
@@ -85,24 +233,29 @@ class TwitterFetcher:
             logger.info(f"开始获取用户 @{username} 的推文")
             
             # 获取用户ID
-            user = self.client.get_user(username=username)
-            if not user.data:
-                logger.error(f"未找到用户: {username}")
-                return []
-            
-            user_id = user.data.id
+            if user_id is None:
+                user_id = self.resolve_user_ids([username]).get(username.lower())
+                if user_id is None:
+                    logger.error(f"未找到用户: {username}")
+                    return []
             
-            # 获取用户推文
-            tweets = self.client.get_users_tweets(
+            # 获取用户推文，只请求上次见过的最新推文之后的内容
+            watermark_key = f"twitter:user:{username.lower()}"
+            rate_limiter.acquire(self.API_HOST)
+            tweets = self.scheduler.call(
+                self.USER_TWEETS_ENDPOINT, self.client.get_users_tweets,
                 id=user_id,
-                max_results=count,
+                max_results=max(5, min(count, 100)),
+                since_id=self.watermarks.get_item_id(watermark_key),
                 tweet_fields=['created_at', 'public_metrics', 'context_annotations']
             )
             
             if not tweets.data:
-                logger.info(f"用户 @{username} 没有推文")
+                logger.info(f"用户 @{username} 没有新推文")
                 return []
             
+            self.watermarks.advance(watermark_key, item_id=max(tweet.id for tweet in tweets.data))
+            
             # 处理推文数据
             processed_tweets = []
             for tweet in tweets.data:
@@ -117,62 +270,125 @@ class TwitterFetcher:
             logger.info(f"成功获取 @{username} 的 {len(processed_tweets)} 条推文")
             return processed_tweets
             
+        except RateLimitDeferred:
+            # 交给调用方决定等待窗口重置还是推迟到下次运行
+            raise
         except Exception as e:
             logger.error(f"获取用户推文失败 @{username}: {e}")
             return []
     
-    def fetch_ai_influencers_tweets(self, usernames: List[str] = None) -> List[Dict]:
+    def fetch_ai_influencers_tweets(self, usernames: List[str] = None) -> List[ContentItem]:
         """
         获取AI影响者的推文
         
         Args:
-            usernames: 用户名列表，如果为None则使用默认列表
+            usernames: 用户名列表，如果为None则使用配置中的 performance.twitter.accounts
             
         Returns:
             推文列表
         """
         if not usernames:
-            # 默认的AI影响者列表
-            usernames = [
-                'karpathy',      # Andrej Karpathy
-                'ylecun',        # Yann LeCun
-                'AndrewYNg',     # Andrew Ng
-                'sama',          # Sam Altman
-                'gdb',           # Geoffrey Hinton
-                'jasonwei',      # Jason Wei
-                'JimFan',        # Jim Fan
-                '_akhaliq',      # Aran Komatsuzaki
-                'rowancheung',   # Rowan Cheung
-                'alexandra_amos', # Alexandra Amos
-                'mckaywrigley',  # McKay Wrigley
-                'lennysan'       # Lenny Rachitsky
-            ]
+            usernames = self.config['accounts']
         
-        all_tweets = []
+        if not self.is_available():
+            logger.error("Twitter API不可用")
+            return []
         
-        for username in usernames[:8]:  # 限制用户数量避免请求过多
-            try:
+        # 上次因限流推迟的账号排在最前面
+        deferred = [name for name in self.scheduler.get_deferred('user_timelines') if name in usernames]
+        usernames = list(dict.fromkeys(deferred + list(usernames)))
+        if deferred:
+            logger.info(f"优先抓取上次因限流推迟的 {len(deferred)} 个账号")
+        
+        count = self.config['tweets_per_account']
+        scope = current_scope()
+        # 限流等待以抓取任务的时限为准，窗口重置后还要留出请求剩余账号的时间；
+        # 没有任务时限时由调度器按 max_rate_limit_wait 限制
+        deadline = None
+        if scope is not None and scope.deadline is not None:
+            deadline = scope.deadline - RATE_LIMIT_RESUME_RESERVE
+        
+        def fetch_account(account):
+            # 工作线程沿用抓取任务的作用域；限流时返回重置时间，由下面统一等待或推迟
+            with use_scope(scope):
+                username, user_id = account
                 logger.info(f"获取AI影响者 @{username} 的推文")
-                
-                tweets = self.fetch_user_tweets(username, count=10)
-                all_tweets.extend(tweets)
-                
-                # 添加延迟避免请求过快
-                time.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                logger.error(f"获取用户 @{username} 推文失败: {e}")
-                continue
+                try:
+                    return self.fetch_user_tweets(username, count=count, user_id=user_id), None
+                except RateLimitDeferred as e:
+                    return [], e.reset_at
         
-        logger.info(f"总共获取到 {len(all_tweets)} 条AI影响者推文")
+        all_tweets = []
+        pending = usernames
+        while pending:
+            # 一次性解析全部用户ID，之后每个账号只需请求一次时间线
+            user_ids = self.resolve_user_ids(pending)
+            accounts = [(name, user_ids[name.lower()]) for name in pending if name.lower() in user_ids]
+            unresolved = [name for name in pending if name.lower() not in user_ids]
+            
+            rate_limited = []
+            reset_at = self.scheduler.blocked_until(self.USERS_LOOKUP_ENDPOINT) if unresolved else None
+            if reset_at is not None:
+                rate_limited.extend(unresolved)
+            
+            with ThreadPoolExecutor(max_workers=max(1, self.config['concurrency']), thread_name_prefix='twitter-user') as executor:
+                futures = [(account[0], executor.submit(fetch_account, account)) for account in accounts]
+                for username, future in futures:
+                    try:
+                        tweets, account_reset_at = future.result()
+                    except Exception as e:
+                        logger.error(f"获取用户 @{username} 推文失败: {e}")
+                        continue
+                    
+                    all_tweets.extend(tweets)
+                    if account_reset_at is not None:
+                        rate_limited.append(username)
+                        reset_at = max(reset_at or 0, account_reset_at)
+            
+            pending = rate_limited
+            
+            # 窗口很快重置时在本任务内等待后继续，否则推迟到下次运行
+            if pending and not self.scheduler.wait_for_reset(reset_at, deadline):
+                break
+        
+        self.scheduler.set_deferred('user_timelines', pending)
+        if pending:
+            logger.warning(f"Twitter限流窗口未重置，{len(pending)} 个账号推迟到下次运行")
+        
+        logger.info(f"总共获取到 {len(all_tweets)} 条AI影响者推文（{len(usernames) - len(pending)}/{len(usernames)} 个账号）")
         return all_tweets
     
-    def fetch_trending_ai_topics(self, count: int = 20) -> List[Dict]:
+    def _paginate(self, endpoint: str, method, max_tweets: int, **kwargs) -> tweepy.Paginator:
+        """
+        按页请求推文，每页经过限流器与限流窗口调度器
+        
+        Args:
+            endpoint: 接口标识（见 twitter_scheduler.endpoint_key）
+            method: tweepy客户端方法
+            max_tweets: 最多获取的推文数，决定每页条数与页数
+        """
+        page_size = max(10, min(max_tweets, 100))
+        
+        # Paginator按方法名选择翻页参数（next_token 或 pagination_token），包装时保留方法名
+        @functools.wraps(method)
+        def request_page(*args, **page_kwargs):
+            rate_limiter.acquire(self.API_HOST)
+            return self.scheduler.call(endpoint, method, *args, **page_kwargs)
+        
+        return tweepy.Paginator(request_page, max_results=page_size,
+                                limit=max(1, -(-max_tweets // page_size)), **kwargs)
+    
+    @staticmethod
+    def _index_authors(page) -> Dict:
+        """本页展开的作者 {用户ID: 用户名}"""
+        return {user.id: user.username for user in (page.includes or {}).get('users', [])}
+    
+    def fetch_trending_ai_topics(self, count: Optional[int] = None) -> List[ContentItem]:
         """
         获取AI相关热门话题
         
         Args:
-            count: 获取话题数量
+            count: 最多获取的推文数，默认读取 performance.twitter.search_max_tweets
             
         Returns:
             热门话题列表
@@ -181,58 +397,67 @@ class TwitterFetcher:
             logger.error("Twitter API不可用")
             return []
         
+        max_tweets = count or self.config['search_max_tweets']
+        processed_tweets = []
+        
         try:
             logger.info("开始获取AI相关热门话题")
             
             # 搜索AI相关推文
             query = "(AI OR artificial intelligence OR machine learning OR deep learning OR GPT OR LLM) -is:retweet lang:en"
             
-            tweets = self.client.search_recent_tweets(
+            watermark_key = "twitter:search:ai_topics"
+            newest_id = None
+            pages = self._paginate(
+                self.SEARCH_ENDPOINT, self.client.search_recent_tweets, max_tweets,
                 query=query,
-                max_results=count,
+                since_id=self.watermarks.get_item_id(watermark_key),
                 tweet_fields=['created_at', 'public_metrics', 'author_id'],
                 user_fields=['username', 'name'],
                 expansions=['author_id']
             )
             
-            if not tweets.data:
+            for page in pages:
+                if not page.data:
+                    break
+                
+                authors = self._index_authors(page)
+                newest_id = max(newest_id or 0, max(tweet.id for tweet in page.data))
+                
+                # 处理推文数据
+                for tweet in page.data:
+                    try:
+                        processed_tweet = self._process_tweet(tweet, authors.get(tweet.author_id, 'unknown'))
+                        if processed_tweet:
+                            processed_tweets.append(processed_tweet)
+                    except Exception as e:
+                        logger.error(f"处理热门话题推文失败: {e}")
+                        continue
+            
+            if newest_id is None:
                 logger.info("未找到AI相关热门话题")
                 return []
             
-            # 处理推文数据
-            processed_tweets = []
-            for tweet in tweets.data:
-                try:
-                    # 获取作者信息
-                    author = None
-                    if tweets.includes and 'users' in tweets.includes:
-                        for user in tweets.includes['users']:
-                            if user.id == tweet.author_id:
-                                author = user
-                                break
-                    
-                    processed_tweet = self._process_tweet(tweet, author.username if author else 'unknown')
-                    if processed_tweet:
-                        processed_tweets.append(processed_tweet)
-                        
-                except Exception as e:
-                    logger.error(f"处理热门话题推文失败: {e}")
-                    continue
+            self.watermarks.advance(watermark_key, item_id=newest_id)
             
             logger.info(f"成功获取 {len(processed_tweets)} 条AI相关热门话题")
             return processed_tweets
             
+        except RateLimitDeferred as e:
+            # 未推进水位线，下次运行从同一位置继续搜索
+            logger.warning(f"AI热门话题搜索中断，已获取 {len(processed_tweets)} 条，其余留待下次运行: {e}")
+            return processed_tweets
         except Exception as e:
             logger.error(f"获取AI热门话题失败: {e}")
             return []
     
-    def fetch_list_tweets(self, list_id: str, count: int = 20) -> List[Dict]:
+    def fetch_list_tweets(self, list_id: str, count: Optional[int] = None) -> List[ContentItem]:
         """
         获取Twitter List中的推文
         
         Args:
             list_id: List ID
-            count: 获取推文数量
+            count: 最多获取的推文数，默认读取 performance.twitter.list_max_tweets
             
         Returns:
             推文列表
@@ -241,50 +466,69 @@ class TwitterFetcher:
             logger.error("Twitter API不可用")
             return []
         
+        max_tweets = count or self.config['list_max_tweets']
+        processed_tweets = []
+        
         try:
             logger.info(f"开始获取List {list_id} 中的推文")
             
-            # 获取List中的推文
-            tweets = self.client.get_list_tweets(
+            # List推文接口不支持since_id，按推文ID在本地截断已见过的部分；
+            # 推文按时间倒序返回，某页出现已见过的推文后不再翻页
+            watermark_key = f"twitter:list:{list_id}"
+            newest_id = None
+            skipped = 0
+            pages = self._paginate(
+                self.LIST_TWEETS_ENDPOINT, self.client.get_list_tweets, max_tweets,
                 id=list_id,
-                max_results=count,
                 tweet_fields=['created_at', 'public_metrics', 'author_id'],
                 user_fields=['username', 'name'],
                 expansions=['author_id']
             )
             
-            if not tweets.data:
+            for page in pages:
+                if not page.data:
+                    break
+                
+                authors = self._index_authors(page)
+                newest_id = max(newest_id or 0, max(tweet.id for tweet in page.data))
+                new_tweets = [
+                    tweet for tweet in page.data
+                    if self.watermarks.is_new(watermark_key, item_id=tweet.id)
+                ]
+                skipped += len(page.data) - len(new_tweets)
+                
+                # 处理推文数据
+                for tweet in new_tweets:
+                    try:
+                        processed_tweet = self._process_tweet(tweet, authors.get(tweet.author_id, 'unknown'))
+                        if processed_tweet:
+                            processed_tweets.append(processed_tweet)
+                    except Exception as e:
+                        logger.error(f"处理List推文失败: {e}")
+                        continue
+                
+                if len(new_tweets) < len(page.data):
+                    break
+            
+            if newest_id is None:
                 logger.info(f"List {list_id} 中没有推文")
                 return []
             
-            # 处理推文数据
-            processed_tweets = []
-            for tweet in tweets.data:
-                try:
-                    # 获取作者信息
-                    author = None
-                    if tweets.includes and 'users' in tweets.includes:
-                        for user in tweets.includes['users']:
-                            if user.id == tweet.author_id:
-                                author = user
-                                break
-                    
-                    processed_tweet = self._process_tweet(tweet, author.username if author else 'unknown')
-                    if processed_tweet:
-                        processed_tweets.append(processed_tweet)
-                        
-                except Exception as e:
-                    logger.error(f"处理List推文失败: {e}")
-                    continue
+            self.watermarks.record_skipped(watermark_key, skipped)
+            self.watermarks.advance(watermark_key, item_id=newest_id)
             
             logger.info(f"成功获取List {list_id} 中的 {len(processed_tweets)} 条推文")
             return processed_tweets
             
+        except RateLimitDeferred as e:
+            # 未推进水位线，下次运行会重新翻到本次未取完的推文（重复内容在入库前去重）
+            logger.warning(f"List {list_id} 翻页中断，已获取 {len(processed_tweets)} 条，其余留待下次运行: {e}")
+            return processed_tweets
         except Exception as e:
             logger.error(f"获取List推文失败 {list_id}: {e}")
             return []
     
-    def _process_tweet(self, tweet, username: str) -> Optional[Dict]:
+    def _process_tweet(self, tweet, username: str) -> Optional[ContentItem]:
         """处理单条推文数据"""
         try:
             # 提取推文内容
@@ -303,19 +547,19 @@ class TwitterFetcher:
             """.strip()
             
             # 构建推文信息
-            tweet_info = {
-                'title': f"Twitter: @{username} 的推文",
-                'content': content_summary,
-                'url': f"https://twitter.com/{username}/status/{tweet.id}",
-                'published_at': tweet.created_at,
-                'source_name': f"Twitter @{username}",
-                'source_type': 'twitter',
-                'tweet_id': tweet.id,
-                'author': username,
-                'text': text,
-                'metrics': tweet.public_metrics,
-                'created_at': tweet.created_at
-            }
+            tweet_info = ContentItem(
+                title=f"Twitter: @{username} 的推文",
+                content=content_summary,
+                url=f"https://twitter.com/{username}/status/{tweet.id}",
+                published_at=tweet.created_at,
+                source_name=f"Twitter @{username}",
+                source_type='twitter',
+                extras={
+                    'tweet_id': tweet.id,
+                    'author': username,
+                    'metrics': tweet.public_metrics
+                }
+            )
             
             return tweet_info
             
@@ -366,7 +610,7 @@ if __name__ == "__main__":
             
             for tweet in tweets[:2]:
                 print(f"作者: {tweet['author']}")
-                print(f"内容: {tweet['text'][:100]}...")
+                print(f"内容: {tweet.content[:100]}...")
                 print("---")
         else:
             print("❌ Twitter API连接失败")
@@ -0,0 +1,192 @@
+"""
+Twitter限流调度
+根据响应头 x-rate-limit-remaining / x-rate-limit-reset 记录各接口的15分钟窗口，
+窗口耗尽时不再发起请求、也不阻塞整个抓取阶段：等待时间在任务时限内就只让Twitter任务等到窗口重置，
+否则把剩余工作记录下来，下次运行优先处理
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+
+from .config_manager import config_manager
+
+logger = logging.getLogger(__name__)
+
+# 默认调度配置（与 performance.twitter 中的其他抓取配置放在一起）
+DEFAULT_TWITTER_SCHEDULING_CONFIG = {
+    'max_rate_limit_wait': 60,                        # 不在有时限的任务中时，窗口在这么多秒内重置才等待，否则推迟到下次运行
+    'deferred_path': '.cache/twitter_deferred.json'   # 推迟到下次运行的工作
+}
+
+# 资源名之后的数字路径段（/2/users/123 中的 123，不含版本号）
+_ID_SEGMENT_PATTERN = re.compile(r'(?<=[A-Za-z_])/\d+(?=/|$)')
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """接口标识，路径中的数字ID替换为 :id，如 GET /2/users/:id/tweets"""
+    path = urlparse(url).path or url
+    return f"{method.upper()} {_ID_SEGMENT_PATTERN.sub('/:id', path)}"
+
+
+class RateLimitDeferred(Exception):
+    """接口窗口已耗尽，请求未发出"""
+
+    def __init__(self, endpoint: str, reset_at: float):
+        super().__init__(f"{endpoint} 限流窗口已耗尽，{max(0, reset_at - time.time()):.0f} 秒后重置")
+        self.endpoint = endpoint
+        self.reset_at = reset_at
+
+
+class TwitterRateLimitScheduler:
+    """Twitter接口限流窗口调度器"""
+
+    def __init__(self, scheduling_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化调度器
+
+        Args:
+            scheduling_config: 调度配置，默认读取 performance.twitter
+        """
+        self.config = DEFAULT_TWITTER_SCHEDULING_CONFIG.copy()
+        self.config.update(scheduling_config or config_manager.get_performance_config().get('twitter', {}) or {})
+
+        self.max_wait = float(self.config['max_rate_limit_wait'])
+        self.deferred_path = self.config['deferred_path']
+
+        # 接口 -> {'remaining': 剩余次数, 'reset_at': 窗口重置时间戳}
+        self._windows = {}
+        self._deferred = None
+        self._lock = threading.Lock()
+        self.stats = {'deferred_calls': 0, 'waits': 0, 'wait_seconds': 0.0}
+
+    def observe(self, response, *args, **kwargs):
+        """
+        记录响应中的限流窗口，作为requests会话的response钩子安装
+        """
+        try:
+            remaining = response.headers.get('x-rate-limit-remaining')
+            reset = response.headers.get('x-rate-limit-reset')
+            if remaining is None or reset is None:
+                return response
+
+            endpoint = endpoint_key(response.request.method, response.request.url)
+            with self._lock:
+                self._windows[endpoint] = {'remaining': int(remaining), 'reset_at': float(reset)}
+
+            if response.status_code == 429 or int(remaining) == 0:
+                logger.warning(f"Twitter接口 {endpoint} 限流窗口已耗尽，{float(reset) - time.time():.0f} 秒后重置")
+        except Exception as e:
+            logger.debug(f"解析Twitter限流响应头失败: {e}")
+        return response
+
+    def blocked_until(self, endpoint: str) -> Optional[float]:
+        """接口窗口已耗尽时返回重置时间戳，否则返回None"""
+        with self._lock:
+            window = self._windows.get(endpoint)
+            if window is None or window['remaining'] > 0:
+                return None
+            if window['reset_at'] <= time.time():
+                del self._windows[endpoint]
+                return None
+            return window['reset_at']
+
+    def call(self, endpoint: str, func, *args, **kwargs):
+        """
+        发起请求，窗口已耗尽或返回429时抛出 RateLimitDeferred，不在请求内部等待
+
+        Args:
+            endpoint: 接口标识（见 endpoint_key）
+            func: tweepy客户端方法
+        """
+        import tweepy  # 延迟导入，与tweepy客户端同时加载
+
+        reset_at = self.blocked_until(endpoint)
+        if reset_at is None:
+            try:
+                return func(*args, **kwargs)
+            except tweepy.TooManyRequests as e:
+                # observe钩子已记录窗口；缺少响应头时按15分钟窗口估计
+                reset_at = self.blocked_until(endpoint)
+                if reset_at is None:
+                    reset_at = float(e.response.headers.get('x-rate-limit-reset', time.time() + 15 * 60))
+                    with self._lock:
+                        self._windows[endpoint] = {'remaining': 0, 'reset_at': reset_at}
+
+        with self._lock:
+            self.stats['deferred_calls'] += 1
+        raise RateLimitDeferred(endpoint, reset_at)
+
+    def wait_for_reset(self, reset_at: float, deadline: Optional[float] = None) -> bool:
+        """
+        窗口在允许的等待时间内重置时，在当前线程等待到重置（只阻塞Twitter任务自身）
+
+        Args:
+            reset_at: 窗口重置时间戳
+            deadline: 任务必须结束的时间戳，窗口在此之前重置才等待；
+                为None时（不在有时限的任务中）最多等待 max_rate_limit_wait 秒
+
+        Returns:
+            是否已等待到窗口重置；False表示应推迟到下次运行
+        """
+        now = time.time()
+        wait = reset_at - now + 1
+        if deadline is None:
+            deadline = now + self.max_wait
+        if now + wait > deadline:
+            return False
+
+        if wait > 0:
+            logger.info(f"Twitter限流窗口 {wait:.0f} 秒后重置，Twitter任务等待后继续，其他信源不受影响")
+            time.sleep(wait)
+            with self._lock:
+                self.stats['waits'] += 1
+                self.stats['wait_seconds'] += wait
+        return True
+
+    def _ensure_deferred_loaded(self):
+        if self._deferred is not None:
+            return
+        try:
+            with open(self.deferred_path, 'r', encoding='utf-8') as f:
+                self._deferred = json.load(f)
+        except FileNotFoundError:
+            self._deferred = {}
+        except Exception as e:
+            logger.warning(f"读取Twitter推迟任务失败: {e}")
+            self._deferred = {}
+
+    def get_deferred(self, kind: str) -> List[str]:
+        """上次运行因限流推迟的工作（如未抓取的账号）"""
+        with self._lock:
+            self._ensure_deferred_loaded()
+            return list(self._deferred.get(kind, []))
+
+    def set_deferred(self, kind: str, items: List[str]):
+        """记录推迟到下次运行的工作，传入空列表表示已全部完成"""
+        with self._lock:
+            self._ensure_deferred_loaded()
+            if items:
+                self._deferred[kind] = list(items)
+            elif kind in self._deferred:
+                del self._deferred[kind]
+            else:
+                return
+
+            try:
+                os.makedirs(os.path.dirname(self.deferred_path) or '.', exist_ok=True)
+                tmp_path = f"{self.deferred_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._deferred, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.deferred_path)
+            except Exception as e:
+                logger.warning(f"写入Twitter推迟任务失败: {e}")
+
+
+# 全局Twitter限流调度器实例
+twitter_scheduler = TwitterRateLimitScheduler()
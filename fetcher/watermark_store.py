@@ -0,0 +1,233 @@
+"""
+信源水位线存储
+记录各信源已见过的最新发布时间与条目ID，使抓取器只返回新内容并尽早停止
+"""
+
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+from .task_scope import current_scope
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """统一为不带时区的UTC时间，避免带时区与不带时区的时间无法比较"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _is_newer_id(candidate: str, current: Optional[str]) -> bool:
+    """比较条目ID，纯数字ID（如推文ID）按数值比较"""
+    if not current:
+        return True
+    if candidate.isdigit() and current.isdigit():
+        return int(candidate) > int(current)
+    return candidate > current
+
+
+class WatermarkStore:
+    """信源水位线存储"""
+
+    def __init__(self):
+        self._watermarks = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.reset_run_stats()
+
+    def _ensure_loaded(self):
+        """首次使用时从数据库加载全部水位线"""
+        if self._watermarks is not None:
+            return
+
+        # 延迟导入，避免仅导入fetcher包时就连接数据库
+        from models import SessionLocal, SourceWatermark, get_engine
+
+        watermarks = {}
+        try:
+            SourceWatermark.__table__.create(bind=get_engine(), checkfirst=True)
+
+            session = SessionLocal()
+            try:
+                for row in session.query(SourceWatermark).all():
+                    watermarks[row.source_key] = {
+                        'published_at': row.last_published_at,
+                        'item_id': row.last_item_id
+                    }
+            finally:
+                session.close()
+
+            logger.info(f"加载 {len(watermarks)} 个信源的水位线")
+
+        except Exception as e:
+            logger.error(f"加载信源水位线失败: {e}")
+
+        self._watermarks = watermarks
+
+    def get_published_at(self, source_key: str) -> Optional[datetime]:
+        """获取信源已见过的最新发布时间（UTC）"""
+        with self._lock:
+            self._ensure_loaded()
+            return (self._watermarks.get(source_key) or {}).get('published_at')
+
+    def get_item_id(self, source_key: str) -> Optional[str]:
+        """获取信源已见过的最新条目ID"""
+        with self._lock:
+            self._ensure_loaded()
+            return (self._watermarks.get(source_key) or {}).get('item_id')
+
+    def is_new(self, source_key: str, published_at: Optional[datetime] = None, item_id: Optional[str] = None) -> bool:
+        """
+        判断条目是否比水位线更新
+
+        有发布时间时按发布时间比较，时间相同再比较条目ID；
+        没有发布时间时按条目ID比较；两者都没有则视为新条目
+
+        Args:
+            source_key: 信源标识
+            published_at: 条目发布时间
+            item_id: 条目ID
+
+        Returns:
+            True表示条目未见过
+        """
+        with self._lock:
+            self._ensure_loaded()
+            watermark = self._watermarks.get(source_key)
+
+        if not watermark:
+            return True
+
+        published_at = normalize_datetime(published_at)
+        if published_at is not None and watermark.get('published_at') is not None:
+            if published_at != watermark['published_at']:
+                return published_at > watermark['published_at']
+            return bool(item_id) and str(item_id) != watermark.get('item_id')
+
+        if item_id and watermark.get('item_id'):
+            return _is_newer_id(str(item_id), watermark['item_id'])
+
+        return True
+
+    def advance(self, source_key: str, published_at: Optional[datetime] = None, item_id: Optional[str] = None):
+        """
+        推进信源水位线，只会向前移动
+
+        Args:
+            source_key: 信源标识
+            published_at: 本次见到的最新发布时间
+            item_id: 本次见到的最新条目ID
+        """
+        published_at = normalize_datetime(published_at)
+        item_id = str(item_id) if item_id else None
+
+        # 在抓取任务中执行时，待任务结果被采纳后再推进
+        scope = current_scope()
+        if scope is not None:
+            scope.defer(self._advance, source_key, published_at, item_id)
+        else:
+            self._advance(source_key, published_at, item_id)
+
+    def _advance(self, source_key: str, published_at: Optional[datetime], item_id: Optional[str]):
+        """推进内存中的水位线并标记待保存"""
+        with self._lock:
+            self._ensure_loaded()
+            watermark = self._watermarks.setdefault(source_key, {'published_at': None, 'item_id': None})
+            current = watermark.get('published_at')
+
+            if published_at is not None:
+                if current is None or published_at > current:
+                    watermark['published_at'] = published_at
+                    watermark['item_id'] = item_id
+                elif published_at == current and item_id:
+                    watermark['item_id'] = item_id
+                else:
+                    return
+            elif item_id and _is_newer_id(item_id, watermark.get('item_id')):
+                watermark['item_id'] = item_id
+            else:
+                return
+
+            self._dirty.add(source_key)
+
+    def record_skipped(self, source_key: str, count: int):
+        """记录因水位线被跳过的条目数"""
+        if count <= 0:
+            return
+        with self._lock:
+            self.run_stats['skipped_items'] += count
+            self.run_stats['sources'][source_key] = self.run_stats['sources'].get(source_key, 0) + count
+
+    def save(self) -> int:
+        """
+        将本次运行中推进的水位线写入数据库
+
+        应在抓取内容成功入库后调用，避免内容丢失时水位线已被推进
+
+        Returns:
+            写入的水位线数量
+        """
+        with self._lock:
+            if not self._dirty or self._watermarks is None:
+                return 0
+            dirty = {key: dict(self._watermarks[key]) for key in self._dirty}
+            self._dirty = set()
+
+        from models import SessionLocal, SourceWatermark
+
+        session = SessionLocal()
+        try:
+            existing = {
+                row.source_key: row
+                for row in session.query(SourceWatermark).filter(
+                    SourceWatermark.source_key.in_(list(dirty.keys()))
+                ).all()
+            }
+
+            for source_key, watermark in dirty.items():
+                row = existing.get(source_key)
+                if row is None:
+                    row = SourceWatermark(source_key=source_key)
+                    session.add(row)
+                row.last_published_at = watermark.get('published_at')
+                row.last_item_id = watermark.get('item_id')
+
+            session.commit()
+            logger.info(f"保存 {len(dirty)} 个信源的水位线")
+            return len(dirty)
+
+        except Exception as e:
+            logger.error(f"保存信源水位线失败: {e}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
+    def reset_run_stats(self):
+        """重置本次运行的统计"""
+        self.run_stats = {
+            'skipped_items': 0,
+            'sources': {}
+        }
+
+    def get_run_summary(self) -> Dict[str, Any]:
+        """获取本次运行的水位线统计"""
+        with self._lock:
+            return {
+                'skipped_items': self.run_stats['skipped_items'],
+                'sources': dict(self.run_stats['sources'])
+            }
+
+
+# 全局信源水位线实例
+watermark_store = WatermarkStore()
@@ -3,355 +3,267 @@
 负责抓取没有RSS或API的信源网页内容
 """
 
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
-import time
-import random
-import re
-from urllib.parse import urljoin, urlparse
+
+import lxml.html
+from lxml import etree
+
+from .config_manager import config_manager
+from .content_item import ContentItem
+from .content_normalizer import REMOVED_TAGS, collapse_whitespace
+from .http_transport import http_transport
+from .fetch_state import fetch_state_store, FetchStateCheck
+from .listing_fingerprint import listing_fingerprint_store
+from .scrape_rules import scrape_rule_registry, parse_datetime
+from .task_scope import current_scope, use_scope
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 默认Web爬虫配置
+DEFAULT_WEB_SCRAPE_CONFIG = {
+    'detail_concurrency': 4,  # 同时抓取的文章详情页数，实际速率仍受按主机限流约束
+    'max_detail_pages': 10    # 每个信源最多抓取的文章详情页数
+}
+
+# 文章详情页的正文节点与发布时间（预编译XPath）
+_CONTENT_XPATH = etree.XPath(
+    "(//*[self::article or self::div or self::main]"
+    "[contains(@class, 'content') or contains(@class, 'post') or contains(@class, 'article')])[1]"
+)
+_BODY_XPATH = etree.XPath("(//body)[1]")
+_DATETIME_XPATH = etree.XPath("string((//*[self::time or self::span][@datetime])[1]/@datetime)")
+
 
 class WebScraper:
     """通用Web爬虫抓取器"""
     
-    def __init__(self):
-        """初始化Web爬虫"""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, web_scrape_config: Optional[Dict] = None):
+        """
+        初始化Web爬虫
+        
+        Args:
+            web_scrape_config: 爬虫配置，默认读取 performance.web_scrape
+        """
+        self.transport = http_transport
+        self.fetch_state = fetch_state_store
+        self.listings = listing_fingerprint_store
+        self.rules = scrape_rule_registry
+        
+        self.config = DEFAULT_WEB_SCRAPE_CONFIG.copy()
+        self.config.update(web_scrape_config or config_manager.get_performance_config().get('web_scrape', {}) or {})
     
-    def scrape_anthropic_blog(self) -> List[Dict]:
-        """抓取Anthropic博客"""
-        try:
-            logger.info("开始抓取Anthropic博客")
-            
-            url = "https://www.anthropic.com/index"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            articles = []
-            
-            # 查找博客文章链接
-            # 注意：Anthropic的网站结构可能会变化，需要根据实际情况调整
-            article_links = soup.find_all('a', href=re.compile(r'/news|/blog|/research'))
-            
-            for link in article_links[:10]:  # 限制数量
-                try:
-                    article_url = urljoin(url, link.get('href', ''))
-                    article_title = link.get_text().strip()
-                    
-                    if article_title and article_url:
-                        # 获取文章详情
-                        article_detail = self._scrape_article_detail(article_url, article_title)
-                        if article_detail:
-                            articles.append(article_detail)
-                        
-                        # 添加延迟
-                        time.sleep(random.uniform(1, 3))
-                        
-                except Exception as e:
-                    logger.error(f"处理Anthropic文章链接失败: {e}")
-                    continue
-            
-            logger.info(f"成功抓取 {len(articles)} 篇Anthropic博客文章")
-            return articles
+    def _fetch_listing_page(self, url: str, source_name: str) -> Tuple[Optional[bytes], FetchStateCheck]:
+        """
+        使用条件请求获取列表页
+        
+        Args:
+            url: 列表页URL
+            source_name: 信源名称
             
-        except Exception as e:
-            logger.error(f"抓取Anthropic博客失败: {e}")
-            return []
+        Returns:
+            (页面HTML字节, 条件请求检查结果)，列表页未变化时页面为None；
+            列表中的文章都处理完成后才调用检查结果的 confirm()，否则下次运行会因页面字节未变而跳过失败的文章
+        """
+        response = self.transport.get(url, headers=self.fetch_state.get_conditional_headers(url))
+        response.raise_for_status()
+        
+        state_check = self.fetch_state.check(url, response)
+        if state_check.unchanged:
+            logger.info(f"列表页未变化，跳过解析: {source_name}")
+            return None, state_check
+        
+        return response.content, state_check
     
-    def scrape_mistral_news(self) -> List[Dict]:
-        """抓取Mistral AI新闻"""
-        try:
-            logger.info("开始抓取Mistral AI新闻")
-            
-            url = "https://mistral.ai/news/"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            articles = []
-            
-            # 查找新闻文章
-            # 根据Mistral网站的实际结构调整选择器
-            news_items = soup.find_all(['article', 'div'], class_=re.compile(r'news|article|post'))
-            
-            for item in news_items[:10]:
-                try:
-                    # 提取标题
-                    title_elem = item.find(['h1', 'h2', 'h3', 'h4'])
-                    title = title_elem.get_text().strip() if title_elem else ""
-                    
-                    # 提取链接
-                    link_elem = item.find('a')
-                    article_url = urljoin(url, link_elem.get('href', '')) if link_elem else ""
-                    
-                    # 提取摘要
-                    summary_elem = item.find(['p', 'div'], class_=re.compile(r'summary|excerpt|description'))
-                    summary = summary_elem.get_text().strip() if summary_elem else ""
-                    
-                    if title and article_url:
-                        article_info = {
-                            'title': f"Mistral AI: {title}",
-                            'content': f"标题: {title}\n\n摘要: {summary}",
-                            'url': article_url,
-                            'published_at': datetime.now(),  # Mistral可能不显示具体时间
-                            'source_name': 'Mistral AI News',
-                            'source_type': 'web_scrape',
-                            'summary': summary
-                        }
-                        articles.append(article_info)
-                        
-                except Exception as e:
-                    logger.error(f"处理Mistral新闻项失败: {e}")
-                    continue
-            
-            logger.info(f"成功抓取 {len(articles)} 条Mistral AI新闻")
-            return articles
+    def _filter_new_items(self, url: str, source_name: str,
+                          items: List[ContentItem]) -> Tuple[List[ContentItem], bool]:
+        """
+        按列表页指纹过滤直接由列表页构建的内容，只返回未处理过且未入库的条目
+        
+        Args:
+            url: 列表页URL
+            source_name: 信源名称
+            items: 列表页解析出的内容
             
-        except Exception as e:
-            logger.error(f"抓取Mistral AI新闻失败: {e}")
-            return []
+        Returns:
+            (新内容, 列表中的条目是否都已处理)
+        """
+        diff = self.listings.diff(url, [(item.url, item.title) for item in items])
+        if diff.unchanged:
+            logger.info(f"文章列表未变化，跳过: {source_name}")
+            return [], True
+        
+        new_urls = set(diff.new_urls)
+        new_items = [item for item in items if item.url in new_urls]
+        complete = self.listings.record(diff, new_urls)
+        
+        if len(new_items) < len(items):
+            logger.info(f"{source_name}: 列表中 {len(items) - len(new_items)} 条内容已处理过")
+        return new_items, complete
     
-    def scrape_product_hunt_ai(self) -> List[Dict]:
-        """抓取Product Hunt AI产品"""
-        try:
-            logger.info("开始抓取Product Hunt AI产品")
-            
-            url = "https://www.producthunt.com/topics/artificial-intelligence"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            products = []
-            
-            # 查找产品项
-            # Product Hunt的页面结构可能会变化
-            product_items = soup.find_all(['div', 'article'], class_=re.compile(r'product|item|card'))
-            
-            for item in product_items[:15]:
-                try:
-                    # 提取产品名称
-                    name_elem = item.find(['h3', 'h4', 'h5'])
-                    product_name = name_elem.get_text().strip() if name_elem else ""
-                    
-                    # 提取产品链接
-                    link_elem = item.find('a')
-                    product_url = urljoin(url, link_elem.get('href', '')) if link_elem else ""
-                    
-                    # 提取描述
-                    desc_elem = item.find(['p', 'div'], class_=re.compile(r'description|tagline'))
-                    description = desc_elem.get_text().strip() if desc_elem else ""
-                    
-                    # 提取标签
-                    tag_elements = item.find_all(['span', 'div'], class_=re.compile(r'tag|category'))
-                    tags = [tag.get_text().strip() for tag in tag_elements if tag.get_text().strip()]
-                    
-                    if product_name and product_url:
-                        product_info = {
-                            'title': f"Product Hunt AI产品: {product_name}",
-                            'content': f"产品名称: {product_name}\n\n描述: {description}\n\n标签: {', '.join(tags[:3])}",
-                            'url': product_url,
-                            'published_at': datetime.now(),
-                            'source_name': 'Product Hunt AI',
-                            'source_type': 'web_scrape',
-                            'product_name': product_name,
-                            'description': description,
-                            'tags': tags
-                        }
-                        products.append(product_info)
-                        
-                except Exception as e:
-                    logger.error(f"处理Product Hunt产品项失败: {e}")
-                    continue
-            
-            logger.info(f"成功抓取 {len(products)} 个Product Hunt AI产品")
-            return products
+    def _scrape_new_articles(self, url: str, links: List[Tuple[str, str]], source_name: str, title_prefix: str,
+                             content_xpath: Optional[etree.XPath] = None) -> Tuple[List[ContentItem], bool]:
+        """
+        按列表页指纹筛选文章链接，只为未处理过且未入库的文章抓取详情页
+        
+        Args:
+            url: 列表页URL
+            links: 列表页解析出的 [(文章URL, 标题), ...]
+            source_name: 信源名称
+            title_prefix: 标题前缀
+            content_xpath: 详情页正文节点，为空时自动识别
             
-        except Exception as e:
-            logger.error(f"抓取Product Hunt AI产品失败: {e}")
-            return []
+        Returns:
+            (新文章, 列表中的文章是否都已处理)
+        """
+        links = list(dict.fromkeys(links))[:self.config['max_detail_pages']]
+        diff = self.listings.diff(url, links)
+        if diff.unchanged:
+            logger.info(f"文章列表未变化，跳过: {source_name}")
+            return [], True
+        
+        new_urls = set(diff.new_urls)
+        articles = self._scrape_article_details(
+            [link for link in links if link[0] in new_urls], source_name, title_prefix, content_xpath
+        )
+        # 详情页抓取失败的文章不记为已处理，下次运行重试
+        complete = self.listings.record(diff, [article.url for article in articles])
+        
+        if len(new_urls) < len(links):
+            logger.info(f"{source_name}: 列表中 {len(links) - len(new_urls)} 篇文章已处理过，跳过详情页")
+        return articles, complete
     
-    def scrape_a16z_ai(self) -> List[Dict]:
-        """抓取A16Z AI相关内容"""
-        try:
-            logger.info("开始抓取A16Z AI内容")
-            
-            url = "https://a16z.com/category/ai/"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            articles = []
-            
-            # 查找AI相关文章
-            article_items = soup.find_all(['article', 'div'], class_=re.compile(r'post|article|entry'))
-            
-            for item in article_items[:10]:
-                try:
-                    # 提取标题
-                    title_elem = item.find(['h1', 'h2', 'h3', 'h4'])
-                    title = title_elem.get_text().strip() if title_elem else ""
-                    
-                    # 提取链接
-                    link_elem = item.find('a')
-                    article_url = urljoin(url, link_elem.get('href', '')) if link_elem else ""
-                    
-                    # 提取摘要
-                    summary_elem = item.find(['p', 'div'], class_=re.compile(r'excerpt|summary|description'))
-                    summary = summary_elem.get_text().strip() if summary_elem else ""
-                    
-                    # 提取作者
-                    author_elem = item.find(['span', 'div'], class_=re.compile(r'author|byline'))
-                    author = author_elem.get_text().strip() if author_elem else ""
-                    
-                    if title and article_url:
-                        article_info = {
-                            'title': f"A16Z AI: {title}",
-                            'content': f"标题: {title}\n\n作者: {author}\n\n摘要: {summary}",
-                            'url': article_url,
-                            'published_at': datetime.now(),
-                            'source_name': 'A16Z AI',
-                            'source_type': 'web_scrape',
-                            'author': author,
-                            'summary': summary
-                        }
-                        articles.append(article_info)
-                        
-                except Exception as e:
-                    logger.error(f"处理A16Z文章项失败: {e}")
-                    continue
-            
-            logger.info(f"成功抓取 {len(articles)} 篇A16Z AI文章")
-            return articles
+    def _scrape_article_details(self, links: List[Tuple[str, str]], source_name: str,
+                                title_prefix: str, content_xpath: Optional[etree.XPath] = None) -> List[ContentItem]:
+        """
+        在有界线程池中并发抓取文章详情页，按链接顺序返回
+        
+        Args:
+            links: [(文章URL, 标题), ...]，重复的URL只抓取一次
+            source_name: 信源名称
+            title_prefix: 标题前缀
+            content_xpath: 详情页正文节点，为空时自动识别
             
-        except Exception as e:
-            logger.error(f"抓取A16Z AI内容失败: {e}")
+        Returns:
+            文章信息列表
+        """
+        unique_links = list(dict.fromkeys(links))[:self.config['max_detail_pages']]
+        if not unique_links:
             return []
+        
+        scope = current_scope()
+        
+        def scrape(link):
+            # 工作线程沿用抓取任务的作用域
+            with use_scope(scope):
+                return self._scrape_article_detail(link[0], link[1], source_name, title_prefix, content_xpath)
+        
+        workers = max(1, min(self.config['detail_concurrency'], len(unique_links)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='web-detail') as executor:
+            details = list(executor.map(scrape, unique_links))
+        
+        return [detail for detail in details if detail]
     
-    def _scrape_article_detail(self, article_url: str, title: str) -> Optional[Dict]:
-        """抓取文章详情"""
+    def _scrape_article_detail(self, article_url: str, title: str, source_name: str, title_prefix: str,
+                               content_xpath: Optional[etree.XPath] = None) -> Optional[ContentItem]:
+        """抓取文章详情，只保留正文节点的文本"""
         try:
-            response = self.session.get(article_url)
+            response = self.transport.get(article_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 提取文章内容
-            content_elem = soup.find(['article', 'div', 'main'], class_=re.compile(r'content|post|article'))
-            if not content_elem:
-                content_elem = soup.find('body')
-            
-            content = content_elem.get_text().strip() if content_elem else ""
+            root = lxml.html.fromstring(response.content)
             
             # 提取发布时间
-            time_elem = soup.find(['time', 'span'], {'datetime': True})
-            published_time = None
-            if time_elem:
-                try:
-                    published_time = datetime.fromisoformat(time_elem['datetime'].replace('Z', '+00:00'))
-                except:
-                    published_time = datetime.now()
-            else:
-                published_time = datetime.now()
-            
-            # 构建文章信息
-            article_info = {
-                'title': f"Anthropic: {title}",
-                'content': f"标题: {title}\n\n内容: {content[:500]}{'...' if len(content) > 500 else ''}",
-                'url': article_url,
-                'published_at': published_time,
-                'source_name': 'Anthropic Blog',
-                'source_type': 'web_scrape',
-                'full_content': content
-            }
-            
-            return article_info
+            published_time = parse_datetime(_DATETIME_XPATH(root)) or datetime.now()
+            
+            # 提取文章内容：只保留正文节点，去掉其中的脚本与页面模板元素
+            content_elems = content_xpath(root) if content_xpath is not None else []
+            content_elems = content_elems or _CONTENT_XPATH(root) or _BODY_XPATH(root)
+            content = ""
+            if content_elems:
+                content_elem = content_elems[0]
+                etree.strip_elements(content_elem, *REMOVED_TAGS, with_tail=False)
+                etree.strip_elements(content_elem, etree.Comment, with_tail=False)
+                content = collapse_whitespace(content_elem.text_content())
+            
+            # 构建文章信息，正文长度在内容规范化后统一限制
+            return ContentItem(
+                title=f"{title_prefix}: {title}",
+                content=f"标题: {title}\n\n内容: {content}",
+                url=article_url,
+                published_at=published_time,
+                source_name=source_name,
+                source_type='web_scrape'
+            )
             
         except Exception as e:
             logger.error(f"抓取文章详情失败 {article_url}: {e}")
             return None
     
-    def scrape_generic_website(self, url: str, source_name: str, selectors: Dict) -> List[Dict]:
+    def scrape_source(self, url: str, source_name: str) -> List[ContentItem]:
         """
-        通用网站抓取方法
+        按列表页的抓取规则抓取信源
         
         Args:
-            url: 网站URL
+            url: 列表页URL
             source_name: 信源名称
-            selectors: 选择器配置
             
         Returns:
             抓取的内容列表
         """
         try:
-            logger.info(f"开始抓取通用网站: {source_name}")
-            
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            rule = self.rules.get(url)
+            if rule is None:
+                logger.warning(f"信源 {source_name} 没有可用的抓取规则，跳过: {url}")
+                return []
+            
+            logger.info(f"开始抓取Web爬虫信源: {source_name}")
+            
+            html, state_check = self._fetch_listing_page(url, source_name)
+            if html is None:
+                return []
+            
+            entries = rule.extract(lxml.html.fromstring(html), url)
+            title_prefix = rule.title_prefix or source_name
+            
+            # 列表页只提供链接的信源，并发抓取新文章的详情页
+            if rule.follow_links:
+                articles, complete = self._scrape_new_articles(
+                    url, [(entry['url'], entry['title']) for entry in entries],
+                    source_name, title_prefix, rule.detail_content
+                )
+                # 有详情页抓取失败时不记录条件请求状态，下次运行重新解析列表页并重试这些文章
+                if complete:
+                    state_check.confirm()
+                return articles
             
             items = []
-            
-            # 使用配置的选择器查找内容
-            container_selector = selectors.get('container', 'body')
-            title_selector = selectors.get('title', 'h1, h2, h3')
-            link_selector = selectors.get('link', 'a')
-            content_selector = selectors.get('content', 'p')
-            
-            containers = soup.select(container_selector)
-            
-            for container in containers[:20]:  # 限制数量
-                try:
-                    # 提取标题
-                    title_elem = container.select_one(title_selector)
-                    title = title_elem.get_text().strip() if title_elem else ""
-                    
-                    # 提取链接
-                    link_elem = container.select_one(link_selector)
-                    item_url = urljoin(url, link_elem.get('href', '')) if link_elem else ""
-                    
-                    # 提取内容
-                    content_elem = container.select_one(content_selector)
-                    content = content_elem.get_text().strip() if content_elem else ""
-                    
-                    if title and item_url:
-                        item_info = {
-                            'title': f"{source_name}: {title}",
-                            'content': f"标题: {title}\n\n内容: {content[:300]}{'...' if len(content) > 300 else ''}",
-                            'url': item_url,
-                            'published_at': datetime.now(),
-                            'source_name': source_name,
-                            'source_type': 'web_scrape'
-                        }
-                        items.append(item_info)
-                        
-                except Exception as e:
-                    logger.error(f"处理通用网站内容项失败: {e}")
-                    continue
-            
-            logger.info(f"成功抓取 {len(items)} 条{source_name}内容")
-            return items
+            for entry in entries:
+                title = entry['title']
+                content = entry['content']
+                items.append(ContentItem(
+                    title=f"{title_prefix}: {title}",
+                    content=f"标题: {title}\n\n内容: {content[:300]}{'...' if len(content) > 300 else ''}",
+                    url=entry['url'],
+                    published_at=entry['published_at'] or datetime.now(),
+                    source_name=source_name,
+                    source_type='web_scrape'
+                ))
+            
+            new_items, complete = self._filter_new_items(url, source_name, items)
+            if complete:
+                state_check.confirm()
+            return new_items
             
         except Exception as e:
-            logger.error(f"抓取通用网站失败 {source_name}: {e}")
+            logger.error(f"抓取Web爬虫信源失败 {source_name}: {e}")
             return []
     
-    def scrape_multiple_sources(self, source_configs: List[Dict]) -> List[Dict]:
+    def scrape_multiple_sources(self, source_configs: List[Dict]) -> List[ContentItem]:
         """
         批量抓取多个信源
         
@@ -369,21 +281,8 @@ class WebScraper:
                 source_name = config.get('source_name', 'Unknown')
                 source_url = config.get('source_url', '')
                 
-                logger.info(f"开始抓取Web爬虫信源: {source_name}")
-                
                 if source_type == 'web_scrape':
-                    if 'anthropic' in source_name.lower():
-                        content = self.scrape_anthropic_blog()
-                    elif 'mistral' in source_name.lower():
-                        content = self.scrape_mistral_news()
-                    elif 'product hunt' in source_name.lower():
-                        content = self.scrape_product_hunt_ai()
-                    elif 'a16z' in source_name.lower():
-                        content = self.scrape_a16z_ai()
-                    else:
-                        # 使用通用抓取方法
-                        selectors = config.get('selectors', {})
-                        content = self.scrape_generic_website(source_url, source_name, selectors)
+                    content = self.scrape_source(source_url, source_name)
                     
                     if content:
                         all_content.extend(content)
@@ -391,9 +290,6 @@ class WebScraper:
                     else:
                         logger.warning(f"信源 {source_name} 未抓取到内容")
                     
-                    # 添加延迟
-                    time.sleep(random.uniform(2, 5))
-                    
             except Exception as e:
                 logger.error(f"抓取信源失败 {config.get('source_name', 'Unknown')}: {e}")
                 continue
@@ -408,22 +304,13 @@ if __name__ == "__main__":
     
     print("开始测试Web爬虫抓取器...")
     
-    # 测试抓取Anthropic博客
-    print("\n测试抓取Anthropic博客...")
-    anthropic_articles = scraper.scrape_anthropic_blog()
-    print(f"抓取结果: {len(anthropic_articles)} 篇文章")
-    
-    for article in anthropic_articles[:2]:
-        print(f"标题: {article['title']}")
-        print(f"URL: {article['url']}")
-        print("---")
-    
-    # 测试抓取Mistral新闻
-    print("\n测试抓取Mistral新闻...")
-    mistral_news = scraper.scrape_mistral_news()
-    print(f"抓取结果: {len(mistral_news)} 条新闻")
-    
-    for news in mistral_news[:2]:
-        print(f"标题: {news['title']}")
-        print(f"URL: {news['url']}")
-        print("---")
+    for test_url, test_name in [("https://www.anthropic.com/index", "Anthropic Blog"),
+                                ("https://mistral.ai/news/", "Mistral AI News")]:
+        print(f"\n测试抓取{test_name}...")
+        items = scraper.scrape_source(test_url, test_name)
+        print(f"抓取结果: {len(items)} 条内容")
+        
+        for item in items[:2]:
+            print(f"标题: {item['title']}")
+            print(f"URL: {item['url']}")
+            print("---")
@@ -11,7 +11,7 @@ from dotenv import load_dotenv
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from models import init_db, SessionLocal, SourceConfig
+from models import init_db, SessionLocal, SourceConfig, ScrapeRule
 
 # 加载环境变量
 load_dotenv()
@@ -196,6 +196,35 @@ def insert_default_sources():
         session.close()
 
 
+def insert_default_scrape_rules():
+    """插入默认的Web爬虫抓取规则（已存在的列表页规则保持不变）"""
+    from fetcher.scrape_rules import DEFAULT_SCRAPE_RULES
+    
+    session = SessionLocal()
+    
+    try:
+        existing_urls = {row.source_url for row in session.query(ScrapeRule.source_url).all()}
+        rules = [
+            ScrapeRule(source_url=source_url, **rule)
+            for source_url, rule in DEFAULT_SCRAPE_RULES.items()
+            if source_url not in existing_urls
+        ]
+        
+        if not rules:
+            print("抓取规则已存在，跳过初始化")
+            return
+        
+        session.add_all(rules)
+        session.commit()
+        print(f"成功插入 {len(rules)} 条默认抓取规则")
+        
+    except Exception as e:
+        print(f"插入默认抓取规则时出错: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+
 def main():
     """主函数"""
     print("开始初始化AI洞察助手数据库...")
@@ -209,6 +238,10 @@ def main():
         insert_default_sources()
         print("✓ 默认信源配置插入成功")
         
+        # 插入默认抓取规则
+        insert_default_scrape_rules()
+        print("✓ 默认抓取规则插入成功")
+        
         print("\n🎉 数据库初始化完成！")
         print("现在可以运行 main.py 开始数据抓取和AI处理流程")
         print("\n⚠️  重要提醒:")
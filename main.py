@@ -32,14 +32,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_full_pipeline():
+def run_full_pipeline(pipeline_mode: str = 'batch'):
     """运行完整的AI处理流水线"""
     try:
-        logger.info("🚀 开始运行AI洞察助手完整流水线")
+        logger.info(f"🚀 开始运行AI洞察助手完整流水线（{pipeline_mode}模式）")
         
         # 1. 运行AI处理流水线
         orchestrator = AIOrchestrator()
-        pipeline_result = orchestrator.run_full_pipeline()
+        if pipeline_mode == 'streaming':
+            pipeline_result = orchestrator.run_streaming_pipeline()
+        else:
+            pipeline_result = orchestrator.run_full_pipeline()
         
         if not pipeline_result['success']:
             logger.error(f"❌ AI处理流水线失败: {pipeline_result.get('error', '未知错误')}")
@@ -50,6 +53,13 @@ def run_full_pipeline():
         logger.info(f"   存储内容: {pipeline_result['total_stored']}")
         logger.info(f"   处理内容: {pipeline_result['total_processed']}")
         logger.info(f"   耗时: {pipeline_result['processing_time_seconds']:.2f} 秒")
+        if pipeline_result.get('first_insight_latency_seconds') is not None:
+            logger.info(f"   首条洞察延迟: {pipeline_result['first_insight_latency_seconds']:.2f} 秒")
+        
+        conditional_stats = pipeline_result.get('conditional_fetch_stats', {})
+        logger.info(f"   跳过未变化信源: {len(conditional_stats.get('skipped_sources', []))}")
+        logger.info(f"   条件请求节省流量: {conditional_stats.get('bytes_saved', 0) / 1024:.1f} KB")
+        logger.info(f"   水位线跳过旧内容: {pipeline_result.get('watermark_stats', {}).get('skipped_items', 0)}")
         
         # 2. 生成日报
         logger.info("📰 开始生成AI日报")
@@ -93,12 +103,23 @@ def run_data_fetching_only():
         
         # 只运行数据获取和存储
         raw_contents = orchestrator._fetch_all_content()
-        stored_count = orchestrator._store_raw_content(raw_contents)
+        store_result = orchestrator._store_raw_content(raw_contents)
+        stored_count = store_result.stored
+        # 有内容入库失败时不推进抓取状态，下次重新抓取
+        if store_result.complete:
+            orchestrator.save_fetch_state()
+        else:
+            logger.warning(f"⚠️ {store_result.failed} 条内容入库失败，本次不保存抓取状态")
         
         logger.info(f"✅ 数据获取完成")
         logger.info(f"   获取内容: {len(raw_contents)}")
         logger.info(f"   存储内容: {stored_count}")
         
+        from fetcher.http_transport import http_transport
+        
+        http_stats = http_transport.get_stats_summary()
+        logger.info(f"   网络请求: {http_stats['total_requests']}，缓存命中: {http_stats['total_cache_hits']}")
+        
         return True
         
     except Exception as e:
@@ -178,6 +199,22 @@ def show_status():
         else:
             print("\n📰 暂无日报")
         
+        # 检查信源熔断状态
+        from fetcher.circuit_breaker import circuit_breaker
+        
+        open_circuits = circuit_breaker.get_open_circuits()
+        
+        if open_circuits:
+            print(f"\n🔌 熔断中的信源 ({len(open_circuits)}):")
+            for circuit in open_circuits:
+                retry_at = circuit['retry_at'].strftime('%Y-%m-%d %H:%M:%S') if circuit['retry_at'] else '-'
+                print(f"   {circuit['source_key']} [{circuit['state']}]")
+                print(f"      连续失败: {circuit['consecutive_failures']} 次，恢复试探时间: {retry_at}")
+                if circuit['last_error']:
+                    print(f"      最近错误: {circuit['last_error'][:120]}")
+        else:
+            print("\n🔌 所有信源熔断器均处于关闭状态")
+        
         print("="*50)
         
         return True
@@ -211,6 +248,21 @@ def main():
     parser.add_argument('--mode', choices=['full', 'fetch', 'process', 'digest', 'status', 'cleanup'], 
                        default='full', help='运行模式')
     parser.add_argument('--date', help='指定日期 (YYYY-MM-DD)')
+    parser.add_argument('--pipeline', choices=['batch', 'streaming'], default='batch',
+                       help='完整流水线的执行方式：batch按阶段批量执行，streaming各阶段流式衔接')
+    cache_flag_group = parser.add_mutually_exclusive_group()
+    cache_flag_group.add_argument('--http-cache', action='store_true',
+                                  help='开启HTTP响应磁盘缓存（开发调试用，重复运行时复用未过期的GET响应）')
+    cache_flag_group.add_argument('--no-cache', action='store_true',
+                                  help='关闭HTTP响应磁盘缓存，所有请求直接访问网络')
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument('--record', metavar='CASSETTE',
+                                help='录制本次运行的全部HTTP交互到录像文件（如 cassettes/run.jsonl.gz）')
+    cassette_group.add_argument('--replay', metavar='CASSETTE',
+                                help='从录像文件回放HTTP交互，不访问网络；建议配合全新的DATABASE_URL使用，'
+                                     '否则增量抓取状态会跳过已入库的内容')
+    parser.add_argument('--replay-latency', type=float, default=0.0, metavar='FACTOR',
+                       help='回放时按录制耗时乘以该系数模拟网络延迟，默认0不模拟')
     
     args = parser.parse_args()
     
@@ -222,9 +274,27 @@ def main():
     if args.date:
         logger.info(f"指定日期: {args.date}")
     
+    # 延迟导入，status、digest等模式不需要创建HTTP传输层
+    if args.http_cache or args.no_cache:
+        from fetcher.http_transport import http_transport
+        http_transport.cache.enabled = args.http_cache
+        logger.info(f"HTTP响应缓存已{'开启' if args.http_cache else '关闭'}")
+    
+    cassette_session = None
+    try:
+        if args.record or args.replay:
+            from fetcher import cassette
+        if args.record:
+            cassette_session = cassette.activate('record', args.record)
+        elif args.replay:
+            cassette_session = cassette.activate('replay', args.replay, args.replay_latency)
+    except Exception as e:
+        logger.error(f"❌ 开启HTTP录制/回放失败: {e}")
+        return 1
+    
     try:
         if args.mode == 'full':
-            success = run_full_pipeline()
+            success = run_full_pipeline(args.pipeline)
         elif args.mode == 'fetch':
             success = run_data_fetching_only()
         elif args.mode == 'process':
@@ -252,6 +322,10 @@ def main():
     except Exception as e:
         logger.error(f"❌ 程序执行异常: {e}")
         return 1
+    finally:
+        if cassette_session is not None:
+            cassette_session.save()
+            logger.info(f"HTTP录制/回放统计: {cassette_session.cassette.stats}")
 
 
 if __name__ == "__main__":
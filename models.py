@@ -9,20 +9,49 @@ from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 import os
+import threading
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
-# 创建数据库引擎
+# 数据库引擎在首次使用时创建（通过 get_engine() 或 models.engine 访问）
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./app.db')
-engine = create_engine(DATABASE_URL, echo=False)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """获取数据库引擎，首次调用时创建"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(DATABASE_URL, echo=False)
+    return _engine
+
+
+def __getattr__(name):
+    # 兼容 from models import engine
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionMaker(sessionmaker):
+    """首次创建会话时才绑定数据库引擎的会话工厂"""
+    
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
 
 # 创建基类
 Base = declarative_base()
 
 # 创建会话工厂
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
 
 
 class RawContent(Base):
@@ -42,6 +71,22 @@ class RawContent(Base):
     
     # 关联关系
     insights = relationship("Insight", back_populates="raw_content")
+    links = relationship("ContentLink", back_populates="raw_content", cascade="all, delete-orphan",
+                         order_by="ContentLink.position")
+
+
+class ContentLink(Base):
+    """正文链接表 - 存储内容规范化时从正文HTML中提取的链接"""
+    __tablename__ = "content_link"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    raw_content_id = Column(Integer, ForeignKey("raw_content.id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False, default=0)  # 链接在正文中的顺序
+    url = Column(String(1000), nullable=False)  # 链接地址（已解析为绝对URL）
+    text = Column(String(500), nullable=True)  # 链接文字
+    
+    # 关联关系
+    raw_content = relationship("RawContent", back_populates="links")
 
 
 class Insight(Base):
@@ -87,9 +132,80 @@ class SourceConfig(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
+class ScrapeRule(Base):
+    """抓取规则表 - 存储Web爬虫列表页的XPath规则，容器之外的XPath相对于每个条目容器求值"""
+    __tablename__ = "scrape_rule"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(String(1000), nullable=False, unique=True, index=True)  # 列表页URL（对应SourceConfig.source_url）
+    container_xpath = Column(Text, nullable=False)  # 条目容器
+    title_xpath = Column(Text, nullable=True)  # 标题，为空时取第一个 h1/h2/h3
+    link_xpath = Column(Text, nullable=True)  # 链接，为空时取第一个 a/@href
+    content_xpath = Column(Text, nullable=True)  # 摘要内容
+    date_xpath = Column(Text, nullable=True)  # 发布日期（ISO 8601 或 RFC 2822）
+    detail_content_xpath = Column(Text, nullable=True)  # 详情页正文节点，为空时自动识别
+    follow_links = Column(Boolean, default=False)  # 是否抓取详情页作为内容
+    title_prefix = Column(String(100), nullable=True)  # 标题前缀，为空时使用信源名称
+    max_items = Column(Integer, default=20)  # 每次最多处理的条目数
+    is_active = Column(Boolean, default=True)  # 是否启用
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class SourceFetchState(Base):
+    """信源抓取状态表 - 存储条件请求所需的ETag、Last-Modified与内容哈希"""
+    __tablename__ = "source_fetch_state"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(String(1000), nullable=False, unique=True, index=True)  # 信源URL（RSS或列表页）
+    etag = Column(String(500), nullable=True)  # 上次响应的ETag
+    last_modified = Column(String(100), nullable=True)  # 上次响应的Last-Modified
+    content_hash = Column(String(64), nullable=True)  # 上次响应体的SHA-256
+    content_length = Column(Integer, nullable=True)  # 上次响应体字节数
+    last_checked_at = Column(DateTime, nullable=True)  # 上次检查时间
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class SourceListingFingerprint(Base):
+    """列表页指纹表 - 存储Web爬虫列表页规范化后的哈希与已处理的文章URL"""
+    __tablename__ = "source_listing_fingerprint"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(String(1000), nullable=False, unique=True, index=True)  # 列表页URL
+    listing_hash = Column(String(64), nullable=True)  # 规范化列表（文章URL与标题）的SHA-256，列表中仍有未处理文章时为空
+    article_urls = Column(Text, nullable=True)  # 列表中已处理文章URL的JSON数组
+    last_checked_at = Column(DateTime, nullable=True)  # 上次检查时间
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class SourceWatermark(Base):
+    """信源水位线表 - 存储各信源已见过的最新发布时间与条目ID，用于增量抓取"""
+    __tablename__ = "source_watermark"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_key = Column(String(500), nullable=False, unique=True, index=True)  # 信源标识，如 rss:<url>、arxiv:cs.AI
+    last_published_at = Column(DateTime, nullable=True)  # 已见过的最新发布/修改时间（UTC）
+    last_item_id = Column(String(200), nullable=True)  # 已见过的最新条目ID（arXiv ID、推文since_id等）
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class SourceHealth(Base):
+    """信源健康状态表 - 存储各抓取任务的熔断器状态"""
+    __tablename__ = "source_health"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_key = Column(String(500), nullable=False, unique=True, index=True)  # 抓取任务名称
+    state = Column(String(20), default='closed')  # closed, open, half_open
+    consecutive_failures = Column(Integer, default=0)  # 连续失败次数
+    last_error = Column(Text, nullable=True)  # 最近一次失败原因
+    last_failure_at = Column(DateTime, nullable=True)  # 最近一次失败时间
+    last_success_at = Column(DateTime, nullable=True)  # 最近一次成功时间
+    opened_at = Column(DateTime, nullable=True)  # 熔断打开时间
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
 def init_db():
     """初始化数据库，创建所有表"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("数据库表创建完成")
 
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+测试窗口化LLM筛选
+只返回模型选中或评分达到 min_score 的条目，不按保留率补足；使用桩AI客户端，不访问网络
+"""
+
+import re
+
+from fetcher.content_filter import ContentFilter
+
+ITEMS = [{'title': f"item{i}", 'url': f"https://example.com/{i}"} for i in range(15)]
+
+
+class _StubAIClient:
+    """按窗口第一条的编号返回预设的筛选结果"""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def filter_content(self, lines, content_type):
+        start = int(re.match(r'\[item(\d+)\]', lines[0]).group(1))
+        response = self.responses.get(start, {'selected_indices': []})
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _filter(responses, target_count=10):
+    content_filter = ContentFilter()
+    content_filter.llm_filter_config.update(chunk_size=5, max_workers=2, min_score=7)
+    content_filter._get_ai_client = lambda: _StubAIClient(responses)
+    return content_filter._llm_filter_rss(ITEMS, target_count)
+
+
+def _titles(items):
+    return [item['title'] for item in items]
+
+
+def test_selected_only():
+    """只返回入选条目，不用未选中的条目补足目标数量"""
+    print("🔍 测试只返回入选条目...")
+    result = _filter({
+        0: {'selected_indices': [1]},
+        5: {'selected_indices': [0, 3], 'scores': [9, 2, 8, 6, 3]},
+        10: {'selected_indices': []}
+    })
+    # item7 未被选中但评分达到 min_score；评分优先，同分时选中的在前
+    assert _titles(result) == ['item5', 'item7', 'item8', 'item1']
+    print("  ✅ 4 条入选，未补足到 10 条")
+
+
+def test_target_count_cap():
+    """入选条目超过目标数量时按评分截取"""
+    print("🔍 测试目标数量上限...")
+    result = _filter({0: {'selected_indices': [0, 1, 2], 'scores': [5, 9, 8, 0, 0]}}, target_count=2)
+    assert _titles(result) == ['item1', 'item2']
+    print("  ✅ 按评分截取前 2 条")
+
+
+def test_failed_window():
+    """失败窗口中的条目不参与排名"""
+    print("🔍 测试部分窗口失败...")
+    result = _filter({
+        0: {'error': 'API错误'},
+        5: RuntimeError('连接失败'),
+        10: {'selected_indices': [4]}
+    })
+    assert _titles(result) == ['item14']
+    print("  ✅ 只返回成功窗口中的入选条目")
+
+
+def test_all_windows_failed():
+    """全部窗口失败时返回None，由调用方改用规则筛选"""
+    print("🔍 测试全部窗口失败...")
+    result = _filter({0: {'error': 'x'}, 5: {'error': 'x'}, 10: {'error': 'x'}})
+    assert result is None
+    print("  ✅ 返回None")
+
+
+def test_nothing_selected():
+    """模型认为都不重要时返回空列表"""
+    print("🔍 测试没有入选条目...")
+    assert _filter({}) == []
+    print("  ✅ 返回空列表")
+
+
+def main():
+    test_selected_only()
+    test_target_count_cap()
+    test_failed_window()
+    test_all_windows_failed()
+    test_nothing_selected()
+
+
+if __name__ == "__main__":
+    main()
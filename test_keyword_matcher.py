@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+测试关键词匹配引擎
+默认的子串匹配与原有的逐关键词 `keyword in text` 循环结果一致；词边界匹配排除词内命中
+"""
+
+import random
+
+from fetcher.keyword_matcher import DEFAULT_KEYWORD_SETS, KeywordMatcher, KeywordClassifier
+
+SAMPLES = [
+    "OpenAI released ChatGPT, a GPT-based chatbot",
+    "Said the organ player: nothing about machine learning here.",
+    "A diffusion-based GAN with attention for stable diffusion",
+    "研究团队发布了新的大模型，在多项基准测试中取得突破。",
+    "生成式AI正在改变内容产业，多家公司推出相关产品。",
+    "LLM 与 深度学习、神经网络 在行业 market 的应用",
+    "This web framework makes it easy to build REST APIs in Go.",
+    "",
+]
+
+
+def _random_samples(count: int) -> list:
+    """由关键词片段与普通字符拼接的随机文本，覆盖重叠与互相包含的关键词"""
+    rng = random.Random(17)
+    alphabet = list("aeignlmoprst -") + ['gpt', 'chat', 'LLM', 'AI', '大模型', '生成式', '神经网络', 'said']
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+def test_substring_parity():
+    """子串匹配的命中、得分与分类与原有循环一致"""
+    print("🔍 测试关键词匹配与原有循环一致...")
+    texts = SAMPLES + _random_samples(2000)
+
+    github = DEFAULT_KEYWORD_SETS['github_ai_repos']['keywords']
+    github_matcher = KeywordMatcher(github)
+    arxiv = DEFAULT_KEYWORD_SETS['arxiv_boost']
+    arxiv_matcher = KeywordMatcher(arxiv['keywords'], arxiv['weight'])
+    topics = DEFAULT_KEYWORD_SETS['digest_topics']['keywords']
+    topics_matcher = KeywordMatcher(topics, case_sensitive=True)
+    categories = DEFAULT_KEYWORD_SETS['insight_categories']
+    classifier = KeywordClassifier(categories['categories'], categories['default'])
+
+    for text in texts:
+        lower = text.lower()
+        assert github_matcher.search(text) == any(keyword in lower for keyword in github)
+        assert github_matcher.found(text) == [keyword for keyword in github if keyword in lower]
+        expected_score = sum(arxiv['weight'] for keyword in arxiv['keywords'] if keyword in lower)
+        assert abs(arxiv_matcher.score(text) - expected_score) < 1e-9
+        assert topics_matcher.found(text) == [keyword for keyword in topics if keyword in text]
+
+        expected_category = categories['default']
+        for category, keywords in categories['categories'].items():
+            if any(keyword in lower for keyword in keywords):
+                expected_category = category
+                break
+        assert classifier.classify(text) == expected_category
+    print(f"  ✅ {len(texts)} 条文本结果一致")
+
+
+def test_overlapping_matches():
+    """互相包含与重叠的关键词分别命中并计数"""
+    print("🔍 测试重叠关键词...")
+    matcher = KeywordMatcher(['gpt', 'chatgpt', 'aa'])
+    assert matcher.found("ChatGPT") == ['gpt', 'chatgpt']
+    assert matcher.match("chatgpt gpt aaa") == {'gpt': 2, 'chatgpt': 1, 'aa': 2}
+    print("  ✅ 重叠关键词全部命中")
+
+
+def test_word_boundary():
+    """词边界匹配排除词内命中，允许复数后缀，中文关键词在任意位置匹配"""
+    print("🔍 测试词边界匹配...")
+    matcher = KeywordMatcher(['ai', 'gan', 'diffusion', '大模型'], word_boundary=True)
+    assert matcher.found("said the organ") == []
+    assert matcher.found("AIs and GANs, diffusions") == ['ai', 'gan', 'diffusion']
+    assert matcher.found("新的大模型发布") == ['大模型']
+    print("  ✅ 词边界匹配正确")
+
+
+def main():
+    test_substring_parity()
+    test_overlapping_matches()
+    test_word_boundary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+测试Web爬虫列表页指纹
+列表中还有未处理的文章时不记录列表哈希，全部处理后才会在下次运行时整体跳过；不访问数据库
+"""
+
+from fetcher.listing_fingerprint import ListingFingerprintStore
+from fetcher.task_scope import task_scope
+
+SOURCE = 'https://example.com/news'
+LISTING = [
+    ('https://example.com/a', 'Article  A'),
+    ('https://example.com/b', 'Article B'),
+    ('https://example.com/a', 'Article A (duplicate)')
+]
+
+
+def _new_store() -> ListingFingerprintStore:
+    """不加载数据库中的指纹，也不查询已入库的文章"""
+    store = ListingFingerprintStore()
+    store._fingerprints = {}
+    store._find_stored_urls = lambda urls: set()
+    return store
+
+
+def test_incomplete_listing():
+    """部分文章处理失败时不记录列表哈希，下次只处理剩下的文章"""
+    print("🔍 测试未处理完的列表...")
+    store = _new_store()
+
+    diff = store.diff(SOURCE, LISTING)
+    assert diff.new_urls == ['https://example.com/a', 'https://example.com/b']
+    assert store.record(diff, ['https://example.com/a']) is False
+    assert store._fingerprints[SOURCE]['listing_hash'] is None
+
+    diff = store.diff(SOURCE, LISTING)
+    assert not diff.unchanged
+    assert diff.new_urls == ['https://example.com/b']
+    assert store.record(diff, ['https://example.com/b']) is True
+    assert store._fingerprints[SOURCE]['listing_hash'] == diff.listing_hash
+
+    diff = store.diff(SOURCE, LISTING)
+    assert diff.unchanged
+    assert store.record(diff, []) is True
+    print("  ✅ 列表处理完成后才整体跳过")
+
+
+def test_record_deferred_in_task():
+    """在抓取任务中记录的指纹要等任务结果被采纳后才生效"""
+    print("🔍 测试任务中的指纹记录...")
+    store = _new_store()
+
+    with task_scope('web') as scope:
+        diff = store.diff(SOURCE, LISTING)
+        assert store.record(diff, ['https://example.com/a', 'https://example.com/b']) is True
+    assert SOURCE not in store._fingerprints
+    scope.commit()
+    assert store._fingerprints[SOURCE]['listing_hash'] == diff.listing_hash
+    print("  ✅ 任务提交后指纹才更新")
+
+
+def main():
+    test_incomplete_listing()
+    test_record_deferred_in_task()
+
+
+if __name__ == "__main__":
+    main()
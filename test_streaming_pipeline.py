@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+测试流式流水线的阶段失败处理
+使用桩协调器，不访问网络和数据库
+"""
+
+import threading
+
+from ai_processor.orchestrator import StoreResult
+from ai_processor.streaming_pipeline import StreamingPipeline
+from fetcher.content_item import ContentItem
+
+
+class _StubTask:
+    group = 'rss'
+
+
+class _StubFetchEngine:
+    """逐批产出大量内容，足以填满有界队列"""
+
+    def __init__(self, batches: int, batch_size: int):
+        self.batches = batches
+        self.batch_size = batch_size
+
+    def iter_results(self, tasks):
+        for batch in range(self.batches):
+            yield _StubTask(), [
+                ContentItem(title=f"t{batch}-{i}", content='c', url=f"https://example.com/{batch}/{i}")
+                for i in range(self.batch_size)
+            ]
+
+
+class _StubOrchestrator:
+    """只实现流式流水线用到的方法"""
+
+    def __init__(self, fail_store: bool = False, fail_insight: bool = False, partial_store: bool = False):
+        self.fetch_engine = _StubFetchEngine(batches=20, batch_size=20)
+        self.fail_store = fail_store
+        self.partial_store = partial_store
+        self.fail_insight = fail_insight
+        self.saved = False
+        self.next_id = 0
+
+    def _build_fetch_tasks(self):
+        return []
+
+    def _normalize_group_content(self, items):
+        return items
+
+    def _filter_group_content(self, group, items):
+        return items
+
+    def _is_similar_content(self, content, existing):
+        return False
+
+    def _store_content_rows(self, batch):
+        if self.fail_store:
+            raise RuntimeError('数据库不可用')
+        result = StoreResult()
+        result.stored_ids = list(range(self.next_id, self.next_id + len(batch)))
+        self.next_id += len(batch)
+        if self.partial_store:
+            # 模拟事务回滚：最后一条未入库
+            result.stored_ids.pop()
+            result.failed = 1
+        return result
+
+    def _process_content_ids(self, content_ids):
+        if self.fail_insight:
+            raise RuntimeError('洞察生成失败')
+        return len(content_ids)
+
+    def save_fetch_state(self):
+        self.saved = True
+        return 0
+
+    def _log_normalization_stats(self):
+        pass
+
+    def _process_unprocessed_content(self):
+        return 0
+
+
+def _run_pipeline(orchestrator) -> dict:
+    """在线程中运行流水线，超时未返回视为阻塞"""
+    pipeline = StreamingPipeline(orchestrator, {'queue_size': 4, 'store_batch_size': 5, 'insight_workers': 2})
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(pipeline.run()), daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive(), "流式流水线阻塞未返回"
+    return result
+
+
+def test_store_stage_failure():
+    """存储阶段失败时流水线返回失败结果，且不保存抓取状态"""
+    print("🔍 测试存储阶段失败...")
+    orchestrator = _StubOrchestrator(fail_store=True)
+    result = _run_pipeline(orchestrator)
+    assert result['success'] is False
+    assert '_store_stage' in result['error']
+    assert not orchestrator.saved
+    print("  ✅ 存储阶段失败后流水线正常返回")
+
+
+def test_store_partial_failure():
+    """有内容入库失败（事务回滚）时流水线返回失败结果，且不保存抓取状态"""
+    print("🔍 测试部分内容入库失败...")
+    orchestrator = _StubOrchestrator(partial_store=True)
+    result = _run_pipeline(orchestrator)
+    assert result['success'] is False
+    assert not orchestrator.saved
+    print("  ✅ 部分内容入库失败时不保存抓取状态")
+
+
+def test_insight_stage_failure():
+    """洞察阶段失败时流水线返回失败结果"""
+    print("🔍 测试洞察阶段失败...")
+    orchestrator = _StubOrchestrator(fail_insight=True)
+    result = _run_pipeline(orchestrator)
+    assert result['success'] is False
+    assert '_insight_stage' in result['error']
+    assert not orchestrator.saved
+    print("  ✅ 洞察阶段失败后流水线正常返回")
+
+
+def test_pipeline_success():
+    """各阶段正常时全部内容入库并保存抓取状态"""
+    print("🔍 测试流式流水线正常运行...")
+    orchestrator = _StubOrchestrator()
+    result = _run_pipeline(orchestrator)
+    assert result['success'] is True
+    assert result['total_stored'] == 400
+    assert result['total_processed'] == 400
+    assert orchestrator.saved
+    print("  ✅ 400 条内容全部入库并生成洞察")
+
+
+def main():
+    test_store_stage_failure()
+    test_store_partial_failure()
+    test_insight_stage_failure()
+    test_pipeline_success()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+测试抓取任务作用域
+任务结果被采纳时提交暂存的状态修改，超时被放弃的任务丢弃修改；使用桩熔断器，不访问网络和数据库
+"""
+
+import threading
+import time
+
+from fetcher.concurrent_fetch import ConcurrentFetchEngine, FetchTask
+from fetcher.task_scope import current_scope, task_scope
+
+
+class _StubCircuitBreaker:
+    """只实现抓取引擎用到的方法"""
+
+    def allow(self, source_key):
+        return True
+
+    def record_success(self, source_key):
+        pass
+
+    def record_failure(self, source_key, error=None):
+        pass
+
+    def save(self):
+        return 0
+
+
+def test_commit_and_discard():
+    """commit 执行暂存的修改，discard 丢弃"""
+    print("🔍 测试作用域提交与丢弃...")
+    applied = []
+    with task_scope('commit') as scope:
+        current_scope().defer(applied.append, 'commit')
+    scope.commit()
+    with task_scope('discard') as scope:
+        current_scope().defer(applied.append, 'discard')
+    scope.discard()
+    scope.commit()
+    assert applied == ['commit']
+    assert current_scope() is None
+    print("  ✅ 只有被提交的修改生效")
+
+
+def test_timed_out_task_discarded():
+    """超时被放弃的任务即使之后正常结束，暂存的修改也不会生效"""
+    print("🔍 测试超时任务的状态修改...")
+    applied = []
+    slow_finished = threading.Event()
+
+    def fast():
+        current_scope().defer(applied.append, 'fast')
+        return [{'title': 'fast'}]
+
+    def slow():
+        current_scope().defer(applied.append, 'slow')
+        time.sleep(2.5)
+        slow_finished.set()
+        return [{'title': 'slow'}]
+
+    engine = ConcurrentFetchEngine(max_workers=2, stage_timeout=30)
+    engine.circuit_breaker = _StubCircuitBreaker()
+    engine.task_timeouts = {'slow': 1, 'default': 30}
+
+    results = engine.run([FetchTask('fast', 'fast', fast), FetchTask('slow', 'slow', slow)])
+    assert results == {'fast': [{'title': 'fast'}], 'slow': []}
+    assert engine.last_run_stats['timed_out_tasks'] == ['slow']
+
+    assert slow_finished.wait(timeout=10)
+    time.sleep(0.1)
+    assert applied == ['fast']
+    print("  ✅ 超时任务被放弃，其状态修改未提交")
+
+
+def test_deadline_remaining():
+    """任务时限在作用域内可见"""
+    print("🔍 测试任务剩余时间...")
+    with task_scope('deadline', time.time() + 5) as scope:
+        assert 0 < current_scope().remaining() <= 5
+    with task_scope('no-deadline') as scope:
+        assert scope.remaining() is None
+    print("  ✅ 剩余时间正确")
+
+
+def main():
+    test_commit_and_discard()
+    test_timed_out_task_discarded()
+    test_deadline_remaining()
+
+
+if __name__ == "__main__":
+    main()